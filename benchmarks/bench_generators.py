@@ -0,0 +1,19 @@
+"""Benchmarks of the null models."""
+
+from sod import configuration_model
+
+from .common import SCALES, SIZES, synthetic_hypergraph
+
+
+class ConfigurationModel:
+    params = (list(SCALES), list(SIZES))
+    param_names = ["scale", "sizes"]
+
+    def setup(self, scale, sizes):
+        self.H = synthetic_hypergraph(scale, sizes)
+
+    def time_configuration_model(self, scale, sizes):
+        configuration_model(self.H, seed=0)
+
+    def time_initialization(self, scale, sizes):
+        configuration_model(self.H, num_swaps=0, seed=0)
@@ -0,0 +1,21 @@
+"""Benchmarks of the local measures of simpliciality and the assortativity."""
+
+from sod import local_simpliciality, no_cache, simplicial_assortativity
+
+from .common import SIZES, synthetic_hypergraph
+
+
+class LocalMetrics:
+    # every node is measured on its own neighborhood, so only the small scale
+    params = (["small"], list(SIZES), ["sf", "es", "fes"])
+    param_names = ["scale", "sizes", "metric"]
+
+    def setup(self, scale, sizes, metric):
+        self.H = synthetic_hypergraph(scale, sizes)
+
+    def time_local_simpliciality(self, scale, sizes, metric):
+        local_simpliciality(self.H, metric)
+
+    def time_simplicial_assortativity(self, scale, sizes, metric):
+        with no_cache():
+            simplicial_assortativity(self.H, metric)
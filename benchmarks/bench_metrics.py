@@ -0,0 +1,55 @@
+"""Benchmarks of the global measures of simpliciality."""
+
+from sod import (
+    edit_simpliciality,
+    face_edit_simpliciality,
+    no_cache,
+    simplicial_fraction,
+    workload_like,
+)
+
+from .common import SCALES, SIZES, synthetic_hypergraph
+
+
+class GlobalMetrics:
+    params = (list(SCALES), list(SIZES))
+    param_names = ["scale", "sizes"]
+
+    def setup(self, scale, sizes):
+        self.H = synthetic_hypergraph(scale, sizes)
+
+    def time_simplicial_fraction(self, scale, sizes):
+        with no_cache():
+            simplicial_fraction(self.H, min_size=2)
+
+    def time_edit_simpliciality(self, scale, sizes):
+        with no_cache():
+            edit_simpliciality(self.H, min_size=2)
+
+    def time_face_edit_simpliciality(self, scale, sizes):
+        with no_cache():
+            face_edit_simpliciality(self.H, min_size=2)
+
+
+class NestedMetrics:
+    """The global measures as the planted subfaces make the edges more nested."""
+
+    params = [0.0, 0.1, 0.5]
+    param_names = ["nesting"]
+
+    def setup(self, nesting):
+        self.H = workload_like(
+            "email-enron", nesting=nesting, max_size=8, seed=0
+        ).to_hypergraph()
+
+    def time_simplicial_fraction(self, nesting):
+        with no_cache():
+            simplicial_fraction(self.H, min_size=2)
+
+    def time_edit_simpliciality(self, nesting):
+        with no_cache():
+            edit_simpliciality(self.H, min_size=2)
+
+    def time_face_edit_simpliciality(self, nesting):
+        with no_cache():
+            face_edit_simpliciality(self.H, min_size=2)
@@ -0,0 +1,22 @@
+"""Benchmarks of building and searching the trie of edges."""
+
+from sod import Trie
+
+from .common import SCALES, SIZES, synthetic_hypergraph
+
+
+class TrieSuite:
+    params = (list(SCALES), list(SIZES))
+    param_names = ["scale", "sizes"]
+
+    def setup(self, scale, sizes):
+        self.edges = synthetic_hypergraph(scale, sizes).edges.members()
+        self.trie = Trie()
+        self.trie.build_trie(self.edges)
+
+    def time_build_trie(self, scale, sizes):
+        Trie().build_trie(self.edges)
+
+    def time_search(self, scale, sizes):
+        for e in self.edges:
+            self.trie.search(e)
@@ -0,0 +1,43 @@
+"""Synthetic hypergraphs for the benchmarks."""
+
+import numpy as np
+import xgi
+
+# (number of nodes, number of edges)
+SCALES = {"small": (100, 300), "medium": (1000, 3000)}
+# the distributions of the edge sizes
+SIZES = {
+    # mostly dyads and triangles, as in contact networks
+    "narrow": lambda rng, m: rng.integers(2, 5, m),
+    # a heavy tail up to size 8, as in email and co-authorship networks
+    "wide": lambda rng, m: np.minimum(rng.geometric(0.4, m) + 1, 8),
+}
+
+
+def synthetic_hypergraph(scale, sizes, seed=0):
+    """A random hypergraph with heterogeneous degrees.
+
+    Parameters
+    ----------
+    scale : str
+        A key of `SCALES`.
+    sizes : str
+        A key of `SIZES`.
+    seed : int, optional
+        The seed, by default 0.
+
+    Returns
+    -------
+    xgi.Hypergraph
+        The hypergraph.
+    """
+    rng = np.random.default_rng(seed)
+    n, m = SCALES[scale]
+    # the members are drawn with Zipf weights, so that some nodes are hubs
+    weights = 1 / np.arange(1, n + 1) ** 0.8
+    weights /= weights.sum()
+    edges = [
+        rng.choice(n, size, replace=False, p=weights).tolist()
+        for size in SIZES[sizes](rng, m)
+    ]
+    return xgi.Hypergraph(edges)
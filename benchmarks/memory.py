@@ -0,0 +1,194 @@
+"""Measure the peak memory of the metrics on synthetic workloads.
+
+Each metric runs on each workload in a new interpreter, first alone, to read
+the growth of the peak resident set size of the process, and then under
+tracemalloc, which traces the allocations of Python and numpy and counts the
+enumerated subfaces with `sod.instrumented`. The peaks are reported per stored
+face, that is, per edge of the workload, and per enumerated subface, so that
+the scaling with the size of the data shows, and are saved to
+`benchmarks/results/memory-<commit>.json`. Run as
+
+    python benchmarks/memory.py [-b REGEX] [-w REGEX]
+    python benchmarks/memory.py --compare BASE [HEAD] [--threshold 1.1]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# the workloads are like email-enron at increasing scales, with nested edges
+WORKLOADS = {
+    f"enron-x{scale}": {
+        "dataset": "email-enron",
+        "scale": scale,
+        "nesting": 0.1,
+        "max_size": 8,
+        "seed": 0,
+    }
+    for scale in [1, 4, 16]
+}
+METRICS = [
+    "simplicial_fraction",
+    "simplicial_edit_distance",
+    "edit_simpliciality_full_construction",
+    "face_edit_simpliciality",
+]
+
+_TEMPLATE = """
+import json, resource, sys, tracemalloc
+import sod
+
+sod.disable_cache()
+H = sod.workload_like(**{workload!r}).to_hypergraph()
+metric = getattr(sod, {metric!r})
+
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+metric(H, min_size=2)
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# kilobytes on Linux, bytes on macOS
+unit = 1 if sys.platform == "darwin" else 1024
+
+tracemalloc.start()
+with sod.instrumented() as rec:
+    metric(H, min_size=2)
+_, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+
+print(json.dumps({{
+    "faces": H.num_edges,
+    "subfaces": rec.counters.get("subsets", 0),
+    "peak": peak,
+    "rss": (after - before) * unit,
+}}))
+"""
+
+
+def measure(metric, workload):
+    """Measures the peak memory of a metric in a new interpreter.
+
+    Parameters
+    ----------
+    metric : str
+        The name of the metric in sod.
+    workload : dict
+        The keyword arguments of `sod.workload_like`.
+
+    Returns
+    -------
+    dict
+        The number of faces and enumerated subfaces, the peak of the traced
+        memory, the growth of the peak resident set size, all in bytes, and
+        the peak per face and per subface.
+    """
+    code = _TEMPLATE.format(metric=metric, workload=workload)
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(out)
+    result["per_face"] = result["peak"] / result["faces"]
+    result["per_subface"] = result["peak"] / max(result["subfaces"], 1)
+    return result
+
+
+def run(metrics, workloads):
+    """Measures the peak memory of every metric on every workload.
+
+    Parameters
+    ----------
+    metrics : list of str
+        The names of the metrics.
+    workloads : dict
+        The keyword arguments of `sod.workload_like` of each workload.
+
+    Returns
+    -------
+    dict
+        The measurements of each metric on each workload.
+    """
+    results = dict()
+    for metric in metrics:
+        results[metric] = dict()
+        for name, workload in workloads.items():
+            r = measure(metric, workload)
+            results[metric][name] = r
+            print(
+                f"{metric}({name}): {r['peak'] / 2**20:8.1f} MiB traced, "
+                f"{r['rss'] / 2**20:8.1f} MiB RSS, {r['per_face']:8.0f} B/face, "
+                f"{r['per_subface']:6.1f} B/subface",
+                flush=True,
+            )
+    return results
+
+
+def compare(base, head, threshold=1.1):
+    """Compares the peak memory of two runs.
+
+    Parameters
+    ----------
+    base : str
+        The commit or the file of the baseline.
+    head : str
+        The commit or the file of the run to compare.
+    threshold : float, optional
+        The ratio of the traced peaks above which a measurement is reported
+        as a regression, by default 1.1.
+
+    Returns
+    -------
+    list of str
+        The measurements that regressed.
+    """
+    base, head = _load(base), _load(head)
+    regressions = []
+    for metric, results in head.items():
+        for name, r in results.items():
+            if name not in base.get(metric, {}):
+                continue
+            ratio = r["peak"] / base[metric][name]["peak"]
+            flag = ""
+            if ratio > threshold:
+                flag = "  larger"
+                regressions.append(f"{metric}({name})")
+            elif ratio < 1 / threshold:
+                flag = "  smaller"
+            print(f"{ratio:6.2f}  {metric}({name}){flag}")
+    return regressions
+
+
+def _load(name):
+    fname = (
+        name if os.path.exists(name) else os.path.join(RESULTS, f"memory-{name}.json")
+    )
+    with open(fname) as file:
+        return json.loads(file.read())["results"]
+
+
+if __name__ == "__main__":
+    # the benchmarks are imported as the benchmarks package of the repository
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from benchmarks.run import commit, save
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-b", "--bench", default=None, help="A regular expression.")
+    parser.add_argument("-w", "--workloads", default=None, help="A regular expression.")
+    parser.add_argument("--compare", nargs="+", metavar="COMMIT")
+    parser.add_argument("--threshold", type=float, default=1.1)
+    args = parser.parse_args()
+
+    if args.compare:
+        head = args.compare[1] if len(args.compare) > 1 else commit()
+        regressions = compare(args.compare[0], head, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    metrics = [m for m in METRICS if args.bench is None or re.search(args.bench, m)]
+    workloads = {
+        name: w
+        for name, w in WORKLOADS.items()
+        if args.workloads is None or re.search(args.workloads, name)
+    }
+    results = run(metrics, workloads)
+    print(f"Saved to {save(results, name=f'memory-{commit()}')}")
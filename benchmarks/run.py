@@ -0,0 +1,208 @@
+"""Run the benchmarks offline and compare them across commits.
+
+The benchmarks follow the conventions of asv: every `time_*` method of a class
+in a `bench_*` module is timed for every combination of the `params` of the
+class, after calling its `setup` with them, so the suite also runs with
+`asv run`. Without asv, this script times them and saves the results to
+`benchmarks/results/<commit>.json`. Run as
+
+    python benchmarks/run.py [-b REGEX] [-r REPEAT]
+    python benchmarks/run.py --compare BASE [HEAD] [--threshold 1.2]
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import re
+import subprocess
+import sys
+import time
+
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def discover(pattern=None):
+    """Finds the benchmarks.
+
+    Parameters
+    ----------
+    pattern : str, optional
+        A regular expression that the names of the benchmarks must contain,
+        by default None, in which case all of them are returned.
+
+    Returns
+    -------
+    list of tuple
+        The name, the class, and the name of the method of each benchmark.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    benchmarks = []
+    for info in pkgutil.iter_modules([root]):
+        if not info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"benchmarks.{info.name}")
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for method in sorted(vars(cls)):
+                name = f"{info.name}.{cls_name}.{method}"
+                if method.startswith("time_") and (
+                    pattern is None or re.search(pattern, name)
+                ):
+                    benchmarks.append((name, cls, method))
+    return benchmarks
+
+
+def run(benchmarks, repeat=5):
+    """Times the benchmarks.
+
+    Parameters
+    ----------
+    benchmarks : list of tuple
+        The benchmarks, as returned by `discover`.
+    repeat : int, optional
+        The number of times each benchmark runs, by default 5.
+
+    Returns
+    -------
+    dict
+        For each benchmark and each combination of parameters, the minimum
+        and the median time in seconds.
+    """
+    results = dict()
+    for name, cls, method in benchmarks:
+        params = getattr(cls, "params", [])
+        if params and not isinstance(params[0], (list, tuple)):
+            params = [params]
+        results[name] = dict()
+        for p in itertools.product(*params):
+            bench = cls()
+            if hasattr(bench, "setup"):
+                bench.setup(*p)
+            times = []
+            for _ in range(repeat):
+                t = time.perf_counter()
+                getattr(bench, method)(*p)
+                times.append(time.perf_counter() - t)
+            times.sort()
+            key = ", ".join(map(str, p))
+            results[name][key] = {"min": times[0], "median": times[len(times) // 2]}
+            print(f"{name}({key}): {1000 * times[0]:.2f} ms", flush=True)
+    return results
+
+
+def commit():
+    """The short hash of the checked-out commit, marked if the tree is dirty."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    git = ["git", "-C", root]
+    try:
+        h = subprocess.run(
+            git + ["rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    dirty = subprocess.run(git + ["diff", "--quiet", "HEAD"]).returncode != 0
+    return f"{h}-dirty" if dirty else h
+
+
+def save(results, name=None):
+    """Saves the results of a run.
+
+    Parameters
+    ----------
+    results : dict
+        The results, as returned by `run`.
+    name : str, optional
+        The name of the file, by default the commit.
+
+    Returns
+    -------
+    str
+        The file.
+    """
+    name = commit() if name is None else name
+    os.makedirs(RESULTS, exist_ok=True)
+    fname = os.path.join(RESULTS, f"{name}.json")
+    data = {
+        "commit": name,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.node(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    with open(fname, "w") as file:
+        file.write(json.dumps(data, indent=2))
+    return fname
+
+
+def compare(base, head, threshold=1.2):
+    """Compares the results of two runs.
+
+    Parameters
+    ----------
+    base : str
+        The commit or the file of the baseline.
+    head : str
+        The commit or the file of the run to compare.
+    threshold : float, optional
+        The ratio of the minimum times above which a benchmark is
+        reported as a regression, by default 1.2.
+
+    Returns
+    -------
+    list of str
+        The benchmarks that regressed.
+    """
+    base, head = _load(base), _load(head)
+    regressions = []
+    for name, results in head.items():
+        for key, r in results.items():
+            if key not in base.get(name, {}):
+                continue
+            ratio = r["min"] / base[name][key]["min"]
+            flag = ""
+            if ratio > threshold:
+                flag = "  slower"
+                regressions.append(f"{name}({key})")
+            elif ratio < 1 / threshold:
+                flag = "  faster"
+            print(f"{ratio:6.2f}  {name}({key}){flag}")
+    return regressions
+
+
+def _load(name):
+    fname = name if os.path.exists(name) else os.path.join(RESULTS, f"{name}.json")
+    with open(fname) as file:
+        return json.loads(file.read())["results"]
+
+
+if __name__ == "__main__":
+    # the benchmarks are imported as the benchmarks package of the repository
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-b", "--bench", default=None, help="A regular expression.")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--compare", nargs="+", metavar="COMMIT")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    if args.compare:
+        head = args.compare[1] if len(args.compare) > 1 else commit()
+        regressions = compare(args.compare[0], head, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    from sod import disable_cache
+
+    # measure the computations rather than the cache
+    disable_cache()
+    results = run(discover(args.bench), args.repeat)
+    print(f"Saved to {save(results)}")
@@ -0,0 +1,67 @@
+"""Measure the time to import sod in a fresh interpreter.
+
+Each statement runs in a new process, as in a short-lived worker, and the
+median over the repeats is reported along with the heavy dependencies that
+the statement imported. Run as
+
+    python benchmarks/startup.py [repeats]
+"""
+
+import json
+import subprocess
+import sys
+
+STATEMENTS = {
+    "python": "pass",
+    "import sod": "import sod",
+    "sod.Trie": "import sod; sod.Trie",
+    "sod.Checkpoint": "import sod; sod.Checkpoint",
+    "sod.simplicial_fraction": "import sod; sod.simplicial_fraction",
+    "from sod import *": "from sod import *",
+}
+HEAVY = ["numpy", "scipy", "xgi", "joblib", "matplotlib"]
+
+_TEMPLATE = """
+import time
+t = time.perf_counter()
+{statement}
+t = time.perf_counter() - t
+import json, sys
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"time": t, "heavy": heavy}}))
+"""
+
+
+def measure(statement, repeats=10):
+    """Measures the time to run a statement in a new interpreter.
+
+    Parameters
+    ----------
+    statement : str
+        The statement.
+    repeats : int, optional
+        The number of new interpreters, by default 10.
+
+    Returns
+    -------
+    dict
+        The median time in seconds and the heavy dependencies imported.
+    """
+    code = _TEMPLATE.format(statement=statement, heavy=HEAVY)
+    times = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(out)
+        times.append(result["time"])
+    times.sort()
+    return {"time": times[len(times) // 2], "heavy": result["heavy"]}
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for name, statement in STATEMENTS.items():
+        result = measure(statement, repeats)
+        heavy = ", ".join(result["heavy"]) or "-"
+        print(f"{name:<26} {1000 * result['time']:8.1f} ms   {heavy}", flush=True)
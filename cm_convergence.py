@@ -9,8 +9,9 @@ from joblib import Parallel, delayed
 from sod import *
 
 
-def cm_in_parallel(H, dataset_name, num_swaps, min_size):
-    H_CM = configuration_model(H, num_swaps=num_swaps)
+def cm_in_parallel(handle, dataset_name, num_swaps, seed, min_size):
+    H = attach_hypergraph(handle)
+    H_CM = configuration_model(H, num_swaps=num_swaps, seed=seed)
 
     sf = simplicial_fraction(H_CM, min_size=min_size)
     es = edit_simpliciality(H_CM, min_size=min_size)
@@ -34,6 +35,14 @@ print(f"{num_processes} processes", flush=True)
 max_order = 10
 min_size = 2
 num_num_swaps = 10
+# the cost of a proposed swap relative to that of a subface lookup
+swap_cost = 10
+# set to the printed seed to reproduce a run
+seed = None
+
+# every task gets its own random stream
+root_seed = np.random.SeedSequence(seed)
+print(f"Seed: {root_seed.entropy}", flush=True)
 
 if not os.path.exists("Data"):
     os.mkdir("Data")
@@ -41,10 +50,15 @@ if not os.path.exists("Figures"):
     os.mkdir("Figures")
 
 
+# publish each dataset once so that tasks attach to it instead of pickling it
+handles = []
 arglist = []
+costs = []
 for dataset in datasets:
-    H = xgi.load_xgi_data(dataset, max_order=max_order)
+    H = load_dataset(dataset, max_order=max_order)
     H.cleanup(singletons=False)
+    handle = publish_arrays(unlabeled_arrays(incidence_arrays(H)))
+    handles.append(handle)
 
     n = H.num_nodes
     m = H.num_edges
@@ -55,14 +69,22 @@ for dataset in datasets:
     num_swaps = np.logspace(1, max_log, num_num_swaps).astype(int)
 
     # configuration model
+    cost = edge_costs(attach_arrays(handle), min_size).sum()
     for nswaps in num_swaps:
-        arglist.append((H, dataset, nswaps, min_size))
+        arglist.append((handle, dataset, nswaps, root_seed.spawn(1)[0], min_size))
+        costs.append(cost + swap_cost * nswaps)
+
+# dispatch the most expensive tasks first so that no core idles at the end
+order = np.argsort(costs, kind="stable")[::-1]
 cm_data = Parallel(n_jobs=num_processes)(
-    delayed(cm_in_parallel)(*arg) for arg in arglist
+    delayed(cm_in_parallel)(*arglist[i]) for i in order
 )
 
+for handle in handles:
+    release_arrays(handle)
+
 data = {d: defaultdict(list) for d in datasets}
-for name, nswaps, sf, es, fes in cm_data:
+for name, nswaps, sf, es, fes in sorted(cm_data, key=lambda d: d[:2]):
     data[name]["num-swaps"].append(int(nswaps))
     data[name]["sf"].append(sf)
     data[name]["es"].append(es)
@@ -71,3 +93,5 @@ for name, nswaps, sf, es, fes in cm_data:
 with open("Data/cm_convergence.json", "w") as file:
     datastring = json.dumps(data, indent=2)
     file.write(datastring)
+
+sync_results(ResultsStore("Data/results"), "Data")
@@ -7,15 +7,15 @@ import matplotlib.pyplot as plt
 import numpy as np
 import xgi
 from matplotlib import cm
-from matplotlib.colors import LinearSegmentedColormap, ListedColormap
+from matplotlib.colors import LinearSegmentedColormap, ListedColormap, to_rgba
 from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
 from numpy import ndarray
 from xgi.exception import XGIError
 from xgi.stats import IDStat
 
 
-def _scalar_arg_to_dict(scalar_arg, ids, min_val, max_val):
-    """Map different types of arguments for drawing style to a dict with scalar values.
+def _scalar_arg_to_array(scalar_arg, ids, min_val, max_val):
+    """Map different types of arguments for drawing style to an array of scalars.
 
     Parameters
     ----------
@@ -30,13 +30,16 @@ def _scalar_arg_to_dict(scalar_arg, ids, min_val, max_val):
 
     Returns
     -------
-    dict
-        An ID: scalar dictionary.
+    numpy.ndarray
+        The scalar of each ID, in the order of `ids`. IDs missing from
+        a dict are NaN.
 
     Raises
     ------
     TypeError
         If a int, float, list, dict, or NodeStat/EdgeStat is not passed.
+    ValueError
+        If a list or array doesn't have one value per ID.
     """
     if isinstance(scalar_arg, str):
         raise TypeError(
@@ -46,34 +49,37 @@ def _scalar_arg_to_dict(scalar_arg, ids, min_val, max_val):
 
     # Single argument
     if isinstance(scalar_arg, (int, float)):
-        return {id: scalar_arg for id in ids}
+        return np.full(len(ids), float(scalar_arg))
 
     # IDStat
     if isinstance(scalar_arg, IDStat):
-        vals = np.interp(
-            scalar_arg.asnumpy(),
-            [scalar_arg.min(), scalar_arg.max()],
-            [min_val, max_val],
-        )
-        return dict(zip(ids, vals))
+        return _interp(scalar_arg.asnumpy(), min_val, max_val)
 
     # Iterables of floats or ints
     if isinstance(scalar_arg, Iterable):
         if isinstance(scalar_arg, dict):
             try:
-                return {id: float(scalar_arg[id]) for id in scalar_arg if id in ids}
-            except ValueError as e:
+                return np.array(
+                    [scalar_arg.get(id, np.nan) for id in ids], dtype=float
+                ).reshape(-1)
+            except (TypeError, ValueError) as e:
                 raise TypeError(
                     "The input dict must have values that can be cast to floats."
                 )
 
         elif isinstance(scalar_arg, (list, ndarray)):
             try:
-                return {id: float(scalar_arg[idx]) for idx, id in enumerate(ids)}
-            except ValueError as e:
+                values = np.asarray(scalar_arg, dtype=float)
+            except (TypeError, ValueError) as e:
                 raise TypeError(
                     "The input list or array must have values that can be cast to floats."
                 )
+            if values.shape != (len(ids),):
+                raise ValueError(
+                    f"The input list or array has {len(values)} values "
+                    f"but there are {len(ids)} IDs."
+                )
+            return values
         else:
             raise TypeError(
                 "Argument must be an dict, list, or numpy array of floats or ints."
@@ -85,8 +91,8 @@ def _scalar_arg_to_dict(scalar_arg, ids, min_val, max_val):
     )
 
 
-def _color_arg_to_dict(color_arg, ids, cmap):
-    """Map different types of arguments for drawing style to a dict with color values.
+def _color_arg_to_array(color_arg, ids, cmap):
+    """Map different types of arguments for drawing style to an array of RGBA colors.
 
     Parameters
     ----------
@@ -122,8 +128,9 @@ def _color_arg_to_dict(color_arg, ids, cmap):
 
     Returns
     -------
-    dict
-        An ID: color dictionary.
+    numpy.ndarray
+        An array of shape (number of IDs, 4) with the RGBA color of each ID,
+        in the order of `ids`. IDs missing from a dict are transparent.
 
     Raises
     ------
@@ -135,24 +142,27 @@ def _color_arg_to_dict(color_arg, ids, cmap):
     For the iterable of values, we do not accept tuples,
     because there is the potential for ambiguity.
     """
+    n = len(ids)
 
     # single argument. Must be a string or a tuple of floats
     if isinstance(color_arg, str) or (
         isinstance(color_arg, tuple) and isinstance(color_arg[0], float)
     ):
-        return {id: color_arg for id in ids}
+        return np.tile(to_rgba(color_arg), (n, 1))
 
     # Iterables of colors. The values of these iterables must strings or tuples. As of now,
     # there is not a check to verify that the tuples contain floats.
+    if isinstance(color_arg, dict) and not color_arg:
+        return np.zeros((n, 4))
     if isinstance(color_arg, Iterable):
         if isinstance(color_arg, dict) and isinstance(
             next(iter(color_arg.values())), (str, tuple, ndarray)
         ):
-            return {id: color_arg[id] for id in color_arg if id in ids}
+            return _to_rgba([color_arg.get(id, (0, 0, 0, 0)) for id in ids])
         if isinstance(color_arg, (list, ndarray)) and isinstance(
             color_arg[0], (str, tuple, ndarray)
         ):
-            return {id: color_arg[idx] for idx, id in enumerate(ids)}
+            return _to_rgba(color_arg[:n])
 
     # Stats or iterable of values
     if isinstance(color_arg, (Iterable, IDStat)):
@@ -168,39 +178,26 @@ def _color_arg_to_dict(color_arg, ids, cmap):
 
         # handle the case of IDStat vs iterables
         if isinstance(color_arg, IDStat):
-            vals = np.interp(
-                color_arg.asnumpy(),
-                [color_arg.min(), color_arg.max()],
-                [minval, maxval],
-            )
-            return {
-                id: np.array(cmap(vals[i])).reshape(1, -1) for i, id in enumerate(ids)
-            }
+            return cmap(_interp(color_arg.asnumpy(), minval, maxval))
 
         elif isinstance(color_arg, Iterable):
             if isinstance(color_arg, dict) and isinstance(
-                next(iter(color_arg.values())), (int, float)
+                next(iter(color_arg.values())), (int, float, np.number)
             ):
-                v = list(color_arg.values())
-                vals = np.interp(v, [np.min(v), np.max(v)], [minval, maxval])
                 # because we have ids, we can't just assume that the keys of arg correspond to
                 # the ids.
-                return {
-                    id: np.array(cmap(v)).reshape(1, -1)
-                    for v, id in zip(vals, color_arg.keys())
-                    if id in ids
-                }
+                vals = _interp(np.array(list(color_arg.values())), minval, maxval)
+                lookup = dict(zip(color_arg, range(len(vals))))
+                idx = np.array([lookup.get(id, -1) for id in ids], dtype=int)
+                colors = cmap(vals)[idx].reshape(-1, 4)
+                colors[idx < 0] = 0
+                return colors
 
             if isinstance(color_arg, (list, ndarray)) and isinstance(
-                color_arg[0], (int, float)
+                color_arg[0], (int, float, np.number)
             ):
-                vals = np.interp(
-                    color_arg, [np.min(color_arg), np.max(color_arg)], [minval, maxval]
-                )
-                return {
-                    id: np.array(cmap(vals[i])).reshape(1, -1)
-                    for i, id in enumerate(ids)
-                }
+                vals = np.asarray(color_arg, dtype=float)[:n]
+                return cmap(_interp(vals, minval, maxval))
             else:
                 raise TypeError(
                     "Argument must be an dict, list, or numpy array of floats."
@@ -212,15 +209,57 @@ def _color_arg_to_dict(color_arg, ids, cmap):
     )
 
 
+def _interp(vals, min_val, max_val):
+    """
+    Linearly map the values from their range to [min_val, max_val].
+    """
+    vals = np.asarray(vals, dtype=float)
+    if vals.size == 0:
+        return vals
+    return np.interp(vals, [np.min(vals), np.max(vals)], [min_val, max_val])
+
+
 def _CCW_sort(p):
     """
     Sort the input 2D points counterclockwise.
+
+    The points can also be a stack of polygons with the same number of vertices,
+    of shape (number of polygons, number of vertices, dimension), in which case
+    the vertices of every polygon are sorted at once.
     """
-    p = np.array(p)
-    mean = np.mean(p, axis=0)
+    p = np.asarray(p)
+    mean = np.mean(p, axis=-2, keepdims=True)
     d = p - mean
-    s = np.arctan2(d[:, 0], d[:, 1])
-    return p[np.argsort(s), :]
+    s = np.arctan2(d[..., 0], d[..., 1])
+    return np.take_along_axis(p, np.argsort(s, axis=-1)[..., None], axis=-2)
+
+
+def _bin_centroids(centroids, num_bins, rng):
+    """
+    Pick one random point in each occupied cell of a grid of about num_bins cells.
+
+    Returns the sorted indices of the picked points, at most num_bins of them.
+    """
+    k = max(int(np.sqrt(num_bins)), 1)
+    lo = centroids.min(axis=0)
+    extent = np.ptp(centroids, axis=0)
+    extent[extent == 0] = 1
+    cells = np.clip(((centroids - lo) / extent * k).astype(int), 0, k - 1)
+    cells = cells[:, 0] * k + cells[:, 1]
+
+    # the first point of each cell in a random order is a random point of the cell
+    order = rng.permutation(len(centroids))
+    _, first = np.unique(cells[order], return_index=True)
+    return np.sort(order[first])
+
+
+def _to_rgba(colors):
+    """
+    Convert a list of colors, each a str, a tuple, or an array, to an RGBA array.
+    """
+    return np.array(
+        [to_rgba(np.ravel(c) if isinstance(c, ndarray) else c) for c in colors]
+    ).reshape(-1, 4)
 
 
 def draw_node_labels(
@@ -472,9 +511,15 @@ def draw_multilayer(
     conn_lines_style="dotted",
     width=5,
     height=5,
+    dpi=600,
     h_angle=10,
     v_angle=20,
     sep=1,
+    max_edges=None,
+    lod="sample",
+    max_conn_lines=None,
+    rasterized=False,
+    seed=None,
     **kwargs,
 ):
     """Draw a hypergraph or simplicial complex visualized in 3D
@@ -538,12 +583,31 @@ def draw_multilayer(
         The width of the figure in inches. Default is 5.
     height : float, optional
         The height of the figure in inches. Default is 5.
+    dpi : float, optional
+        The resolution of the figure if a new one is created. Default is 600.
     h_angle : float, optional
         The rotation angle around the horizontal axis in degrees. Default is 10.
     v_angle : float, optional
         The rotation angle around the vertical axis in degrees. Default is 0.
     sep : float, optional
         The separation between layers. Default is 1.
+    max_edges : int, optional
+        The maximum number of edges drawn on each layer, for overviews of large
+        hypergraphs. If None (default), all edges are drawn.
+    lod : str, optional
+        How a layer with more than max_edges edges is reduced. If 'sample' (default),
+        the edges are sampled uniformly at random. If 'bin', the centroids of the
+        edges are binned on a grid of about max_edges cells and one edge is drawn
+        per occupied cell, so that sparse regions keep their edges.
+    max_conn_lines : int, optional
+        The maximum number of connections between layers. If there are more nodes,
+        only the nodes with the largest degrees get one. If None (default), every
+        node gets one.
+    rasterized : bool, optional
+        Whether to rasterize the nodes, edges, and layers when saving to a vector
+        format, while any labels stay vector. Default is False.
+    seed : int, optional
+        The seed of the random choice of edges, by default None.
     **kwargs : optional args
         Alternate default values. Values that can be overwritten are the following:
         * min_node_size
@@ -561,7 +625,15 @@ def draw_multilayer(
     -------
     ax : matplotlib Axes3DSubplot
         The subplot with the multilayer network visualization.
+
+    Raises
+    ------
+    ValueError
+        If lod is neither 'sample' nor 'bin'.
     """
+    if lod not in ("sample", "bin"):
+        raise ValueError(f"lod must be 'sample' or 'bin', not {lod!r}.")
+
     settings = {
         "min_node_size": 10.0,
         "max_node_size": 30.0,
@@ -585,7 +657,7 @@ def draw_multilayer(
 
     if ax is None:
         _, ax = plt.subplots(
-            1, 1, figsize=(width, height), dpi=600, subplot_kw={"projection": "3d"}
+            1, 1, figsize=(width, height), dpi=dpi, subplot_kw={"projection": "3d"}
         )
 
     s = xgi.unique_edge_sizes(H)
@@ -597,95 +669,98 @@ def draw_multilayer(
 
     xs, ys = zip(*pos.values())
 
-    dyad_color = _color_arg_to_dict(dyad_color, H.edges, settings["dyad_color_cmap"])
-    dyad_lw = _scalar_arg_to_dict(
+    # the styles are arrays in the order of H.edges and H.nodes
+    dyad_color = _color_arg_to_array(dyad_color, H.edges, settings["dyad_color_cmap"])
+    dyad_lw = _scalar_arg_to_array(
         dyad_lw, H.edges, settings["min_dyad_lw"], settings["max_dyad_lw"]
     )
 
-    edge_fc = _color_arg_to_dict(edge_fc, H.edges, settings["edge_fc_cmap"])
+    edge_fc = _color_arg_to_array(edge_fc, H.edges, settings["edge_fc_cmap"])
 
-    node_fc = _color_arg_to_dict(node_fc, H.nodes, settings["node_fc_cmap"])
-    node_ec = _color_arg_to_dict(node_ec, H.nodes, settings["node_ec_cmap"])
-    node_lw = _scalar_arg_to_dict(
+    node_fc = _color_arg_to_array(node_fc, H.nodes, settings["node_fc_cmap"])
+    node_ec = _color_arg_to_array(node_ec, H.nodes, settings["node_ec_cmap"])
+    node_lw = _scalar_arg_to_array(
         node_lw,
         H.nodes,
         settings["min_node_lw"],
         settings["max_node_lw"],
     )
-    node_size = _scalar_arg_to_dict(
+    node_size = _scalar_arg_to_array(
         node_size, H.nodes, settings["min_node_size"], settings["max_node_size"]
     )
 
-    for id, he in H.edges.members(dtype=dict).items():
-        d = len(he) - 1
+    # group the edges by order, so that each layer is drawn as a single collection
+    node_pos = np.array([pos[n] for n in H.nodes], dtype=float).reshape(-1, 2)
+    node_index = {n: i for i, n in enumerate(H.nodes)}
+    members = H.edges.members(dtype=dict)
+    ids = np.array(list(members), dtype=object)
+    layers = defaultdict(list)
+    for i, he in enumerate(members.values()):
+        if len(he) - 1 <= max_order:
+            layers[len(he) - 1].append(i)
+
+    rng = np.random.default_rng(seed)
+    for d, edges in sorted(layers.items()):
         zs = d * sep
+        edges = np.array(edges)
+        if max_edges is not None and len(edges) > max_edges and lod == "sample":
+            edges = np.sort(rng.choice(edges, max_edges, replace=False))
+        idx = np.array([[node_index[n] for n in members[id]] for id in ids[edges]])
+        vertices = node_pos[idx]
+        if max_edges is not None and len(edges) > max_edges and lod == "bin":
+            keep = _bin_centroids(vertices.mean(axis=1), max_edges, rng)
+            edges, vertices = edges[keep], vertices[keep]
+        vertices = np.concatenate(
+            [vertices, np.full(vertices.shape[:-1] + (1,), zs)], axis=-1
+        )
 
         # dyads
-        if d > max_order:
-            continue
-
         if d == 1:
-            he = list(he)
-            x1 = [pos[he[0]][0], pos[he[0]][1], zs]
-            x2 = [pos[he[1]][0], pos[he[1]][1], zs]
             l = Line3DCollection(
-                [(x1, x2)],
-                color=dyad_color[id],
-                linewidth=dyad_lw[id],
+                vertices,
+                color=dyad_color[edges],
+                linewidth=dyad_lw[edges],
+                rasterized=rasterized,
             )
             ax.add_collection3d(l)
         # higher-orders
-        else:
-            poly = []
-            vertices = np.array([[pos[i][0], pos[i][1], zs] for i in he])
-            vertices = _CCW_sort(vertices)
-            poly.append(vertices)
+        elif d > 1:
             poly = Poly3DCollection(
-                poly,
+                _CCW_sort(vertices),
                 zorder=d - 1,
-                color=edge_fc[id],
+                color=edge_fc[edges],
                 alpha=0.5,
                 edgecolor=None,
+                rasterized=rasterized,
             )
             ax.add_collection3d(poly)
 
     # now draw by order
     # draw lines connecting points on the different planes
     if conn_lines:
-        lines3d_between = [
-            (list(pos[i]) + [min_order * sep], list(pos[i]) + [max_order * sep])
-            for i in H.nodes
-        ]
+        conn_pos = node_pos
+        if max_conn_lines is not None and len(node_pos) > max_conn_lines:
+            degrees = H.nodes.degree.asnumpy()
+            conn_pos = node_pos[np.argsort(-degrees, kind="stable")[:max_conn_lines]]
+        lines3d_between = np.stack(
+            [
+                np.column_stack([conn_pos, np.full(len(conn_pos), min_order * sep)]),
+                np.column_stack([conn_pos, np.full(len(conn_pos), max_order * sep)]),
+            ],
+            axis=1,
+        )
         between_lines = Line3DCollection(
             lines3d_between,
-            zorder=d,
+            zorder=max_order,
             color=".5",
             alpha=0.4,
             linestyle=conn_lines_style,
             linewidth=1,
+            rasterized=rasterized,
         )
         ax.add_collection3d(between_lines)
 
-    (
-        x,
-        y,
-        s,
-        c,
-        ec,
-        lw,
-    ) = zip(
-        *[
-            (
-                pos[i][0],
-                pos[i][1],
-                node_size[i] ** 2,
-                node_fc[i],
-                node_ec[i],
-                node_lw[i],
-            )
-            for i in H.nodes
-        ]
-    )
+    x, y = node_pos.T
     for d in range(min_order, max_order + 1):
         # draw nodes
         z = [sep * d] * H.num_nodes
@@ -693,12 +768,13 @@ def draw_multilayer(
             x,
             y,
             z,
-            s=s,
-            c=c,
-            edgecolors=ec,
-            linewidths=lw,
+            s=node_size**2,
+            c=node_fc,
+            edgecolors=node_ec,
+            linewidths=node_lw,
             zorder=max_order + 1,
             alpha=1,
+            rasterized=rasterized,
         )
 
         # draw surfaces corresponding to the different orders
@@ -717,6 +793,7 @@ def draw_multilayer(
             color="grey",
             alpha=0.1,
             zorder=d,
+            rasterized=rasterized,
         )
 
     ax.view_init(h_angle, v_angle)
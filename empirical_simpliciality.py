@@ -10,6 +10,9 @@ if not os.path.exists("Data"):
 if not os.path.exists("Figures"):
     os.mkdir("Figures")
 
+# reuse the results of unchanged datasets from previous runs
+enable_cache("Data/cache")
+
 datasets = [
     "contact-primary-school",
     "contact-high-school",
@@ -32,7 +35,7 @@ max_order = 10
 
 for d in datasets:
     data[d] = dict()
-    H = xgi.load_xgi_data(d, max_order=max_order)
+    H = load_dataset(d, max_order=max_order)
     H.cleanup(singletons=True)
 
     data[d]["es"] = edit_simpliciality(H, min_size=min_size)
@@ -44,3 +47,5 @@ for d in datasets:
 with open(f"Data/empirical_simpliciality.json", "w") as file:
     datastring = json.dumps(data, indent=2)
     file.write(datastring)
+
+sync_results(ResultsStore("Data/results"), "Data")
@@ -1,26 +1,18 @@
-import json
 import time
 
 import biSBM as bm
 import numpy as np
 import xgi
 
-
-def to_bipartite_edgelist(H):
-    data = []
-    n = H.num_nodes
-    for id1, members in H._node.items():
-        for id2 in members:
-            data.append([id1, id2 + n])
-    return np.array(data, dtype=np.int_)
-
+from sod import *
 
 max_order = 10
 dataset = "coauthor-mag-history"
 
-H = xgi.load_xgi_data(dataset, max_order=max_order)
+H = load_dataset(dataset, max_order=max_order)
 H.cleanup()
-edgelist = to_bipartite_edgelist(H)
+arrays = incidence_arrays(H)
+edgelist = to_bipartite_edgelist(arrays)
 
 
 mcmc = bm.engines.MCMC(
@@ -47,19 +39,14 @@ k_b = sampler.bm_state["kb"]
 
 omega = sampler.bm_state["e_rs"][:k_a, k_a:]
 
-k = H.nodes.degree.asdict()
-s = H.edges.size.asdict()
+# the degrees and sizes in the order of the nodes and edges of the edge list
+k = np.bincount(arrays["edge_members"], minlength=H.num_nodes)
+s = np.diff(arrays["edge_ptr"])
 
-g1 = {i: int(labels[i]) for i in range(n_a)}
-g2 = {i: int(labels[i + n_a] - k_a) for i in range(n_b)}
+labels = np.asarray(labels)
+g1 = labels[:n_a]
+g2 = labels[n_a : n_a + n_b] - k_a
 
-data = dict()
-data["omega"] = omega.tolist()
-data["d"] = k
-data["s"] = s
-data["g1"] = g1
-data["g2"] = g2
-
-with open(f"Data/DCSBM_parameters_{dataset}.json", "w") as file:
-    datastring = json.dumps(data, indent=1)
-    file.write(datastring)
+save_dcsbm_parameters(
+    f"Data/DCSBM_parameters_{dataset}.npz", k, s, g1, g2, np.asarray(omega)
+)
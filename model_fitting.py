@@ -5,47 +5,52 @@ from sys import platform
 
 import numpy as np
 import xgi
-from joblib import Parallel, delayed
+from joblib import delayed
 
 from sod import *
 
 
-def cl_in_parallel(k, s, min_size):
-    H_CL = xgi.chung_lu_hypergraph(k, s)
+def cl_in_parallel(i, seed, k, s, min_size):
+    H_CL = xgi.chung_lu_hypergraph(k, s, seed=seed)
 
     sf = simplicial_fraction(H_CL, min_size=min_size)
     es = edit_simpliciality(H_CL, min_size=min_size)
     fes = face_edit_simpliciality(H_CL, min_size=min_size)
 
     print("CL completed", flush=True)
-    return sf, es, fes
+    return ("CL", i), (sf, es, fes)
 
 
-def cm_in_parallel(H, min_size):
-    H_CM = configuration_model(H)
+def cm_in_parallel(i, seed, handle, min_size):
+    H_CM = configuration_model(attach_hypergraph(handle), seed=seed)
 
     sf = simplicial_fraction(H_CM, min_size=min_size)
     es = edit_simpliciality(H_CM, min_size=min_size)
     fes = face_edit_simpliciality(H_CM, min_size=min_size)
 
     print("CM completed", flush=True)
-    return sf, es, fes
+    return ("CM", i), (sf, es, fes)
 
 
-def dcsbm_in_parallel(d, s, g1, g2, omega, min_size):
-    H_DCSBM = xgi.dcsbm_hypergraph(d, s, g1, g2, omega)
+def dcsbm_in_parallel(i, seed, d, s, g1, g2, omega, min_size):
+    H_DCSBM = xgi.dcsbm_hypergraph(d, s, g1, g2, omega, seed=seed)
 
     sf = simplicial_fraction(H_DCSBM, min_size=min_size)
     es = edit_simpliciality(H_DCSBM, min_size=min_size)
     fes = face_edit_simpliciality(H_DCSBM, min_size=min_size)
 
     print("DCSBM completed", flush=True)
-    return sf, es, fes
+    return ("DCSBM", i), (sf, es, fes)
 
 
 # args
 dataset = sys.argv[1]
 realizations = int(sys.argv[2])
+# If given, stop a model early once the 95% confidence intervals of the means
+# of all the metrics are narrower than this.
+target_width = float(sys.argv[3]) if len(sys.argv) > 3 else None
+# the seed of the run, by default the seed of the interrupted run, if any
+seed = int(sys.argv[4]) if len(sys.argv) > 4 else None
 
 if platform == "linux" or platform == "linux2":
     num_processes = len(os.sched_getaffinity(0))
@@ -62,8 +67,47 @@ if not os.path.exists("Data"):
 if not os.path.exists("Figures"):
     os.mkdir("Figures")
 
+# reuse the results of unchanged datasets from previous runs
+enable_cache("Data/cache")
 
-H = xgi.load_xgi_data(dataset, max_order=max_order)
+# Every realization is logged as soon as it finishes, so if this script is
+# interrupted, running it again only runs the missing realizations.
+checkpoint = Checkpoint(f"Data/model_simpliciality_{dataset}.jsonl")
+
+# Every realization has its own random stream, spawned from the seed of the run
+# and keyed by the model and the realization, so a run is reproducible
+# regardless of the number of processes and the order of the realizations.
+entropy = checkpoint.seed((dataset, "seed"), seed)
+print(f"Seed: {entropy}", flush=True)
+
+models = ["CM", "CL", "DCSBM"]
+runners = dict()
+
+
+def realization_seed(model, i):
+    return np.random.SeedSequence(entropy, spawn_key=(models.index(model), i))
+
+
+def run_and_log(model, func, arglist):
+    # run the missing realizations and log the results as they finish
+    runner = EnsembleRunner(target_width=target_width)
+    for i in range(realizations):
+        if (dataset, model, i, entropy) in checkpoint:
+            runner.add(checkpoint[dataset, model, i, entropy])
+    runners[model] = runner
+
+    arglist = [
+        arg for arg in arglist if (dataset, model, arg[0], entropy) not in checkpoint
+    ]
+    n = runner.run(
+        (delayed(func)(*arg) for arg in arglist),
+        num_processes=num_processes,
+        callback=lambda key, values: checkpoint.add((dataset, *key, entropy), values),
+    )
+    print(f"{model}: {runner.realizations} realizations ({n} new)", flush=True)
+
+
+H = load_dataset(dataset, max_order=max_order)
 H.cleanup(singletons=False)
 
 k = H.nodes.degree.asdict()
@@ -71,67 +115,53 @@ s = H.edges.size.asdict()
 n = H.num_nodes
 m = H.num_edges
 
-data = dict()
-
-# Initialize configuration model data
-data["CM"] = dict()
-
-# Initialize Chung-Lu model data
-data["CL"] = dict()
-
-# Initialize DCSBM data
-data["DCSBM"] = dict()
-
 arglist = []
 
 # configuration model
-for i in range(realizations):
-    arglist.append((H, min_size))
+with shared_arrays(unlabeled_arrays(incidence_arrays(H))) as handle:
+    for i in range(realizations):
+        arglist.append((i, realization_seed("CM", i), handle, min_size))
 
-cm_data = Parallel(n_jobs=num_processes)(
-    delayed(cm_in_parallel)(*arg) for arg in arglist
-)
-
-data["CM"]["sf"] = [d[0] for d in cm_data]
-data["CM"]["es"] = [d[1] for d in cm_data]
-data["CM"]["fes"] = [d[2] for d in cm_data]
+    run_and_log("CM", cm_in_parallel, arglist)
 
 arglist = []
 # chung-lu model
 for i in range(realizations):
-    arglist.append((k, s, min_size))
-
-cl_data = Parallel(n_jobs=num_processes)(
-    delayed(cl_in_parallel)(*arg) for arg in arglist
-)
-
-data["CL"]["sf"] = [d[0] for d in cl_data]
-data["CL"]["es"] = [d[1] for d in cl_data]
-data["CL"]["fes"] = [d[2] for d in cl_data]
+    arglist.append((i, realization_seed("CL", i), k, s, min_size))
 
-# DCSBM
-with open(f"Data/DCSBM_parameters_{dataset}.json", "r") as file:
-    j = json.loads(file.read())
+run_and_log("CL", cl_in_parallel, arglist)
 
-# convert everything to int just in case
-d = {int(i): int(deg) for i, deg in j["d"].items()}
-s = {int(i): int(size) for i, size in j["s"].items()}
-g1 = {int(i): int(g) for i, g in j["g1"].items()}
-g2 = {int(i): int(g) for i, g in j["g2"].items()}
-omega = np.array(j["omega"])
+# DCSBM (the JSON parameters of earlier runs are converted on first use)
+d, s, g1, g2, omega = load_dcsbm_parameters(f"Data/DCSBM_parameters_{dataset}.npz")
 
 arglist = []
 for i in range(realizations):
-    arglist.append((d, s, g1, g2, omega, min_size))
+    arglist.append((i, realization_seed("DCSBM", i), d, s, g1, g2, omega, min_size))
 
-dcsbm_data = Parallel(n_jobs=num_processes)(
-    delayed(dcsbm_in_parallel)(*arg) for arg in arglist
-)
+run_and_log("DCSBM", dcsbm_in_parallel, arglist)
 
-data["DCSBM"]["sf"] = [d[0] for d in dcsbm_data]
-data["DCSBM"]["es"] = [d[1] for d in dcsbm_data]
-data["DCSBM"]["fes"] = [d[2] for d in dcsbm_data]
+checkpoint.close()
+
+# assemble the results of the realizations in order from the log
+data = dict()
+for model in models:
+    values = [
+        checkpoint[dataset, model, i, entropy]
+        for i in range(realizations)
+        if (dataset, model, i, entropy) in checkpoint
+    ]
+    data[model] = dict()
+    data[model]["sf"] = [v[0] for v in values]
+    data[model]["es"] = [v[1] for v in values]
+    data[model]["fes"] = [v[2] for v in values]
 
 with open(f"Data/model_simpliciality_{dataset}.json", "w") as file:
     datastring = json.dumps(data, indent=2)
     file.write(datastring)
+
+summary = {model: runner.summary() for model, runner in runners.items()}
+with open(f"Data/model_simpliciality_summary_{dataset}.json", "w") as file:
+    datastring = json.dumps(summary, indent=2)
+    file.write(datastring)
+
+sync_results(ResultsStore("Data/results"), "Data")
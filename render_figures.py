@@ -0,0 +1,351 @@
+"""Render the figures from the results store, headless and in parallel.
+
+Each figure is a spec with the kind of plot, the query of the results store
+it is drawn from, and its output files. A figure is only rendered again if the
+hash of its spec, its data, and the code of its plot changed since the last
+run, which is recorded in `Figures/manifest.json`. Run as
+
+    python render_figures.py [figure ...] [--force] [--processes N] [--dpi DPI]
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from draw import set_fonts
+from sod import CONVERGENCE_MODEL, ResultsStore, Task, run_tasks, sync_results
+
+DATASETS = [
+    "contact-primary-school",
+    "contact-high-school",
+    "hospital-lyon",
+    "email-enron",
+    "email-eu",
+    "diseasome",
+    "disgenenet",
+    "ndc-substances",
+    "congress-bills",
+    "tags-ask-ubuntu",
+]
+MEASURES = ["sf", "es", "fes"]
+MEASURE_LABELS = [
+    "Simplicial Fraction",
+    "Edit Simpliciality",
+    "Face Edit Simpliciality",
+]
+COLOR_PALETTE = ["#59C6DA", "#5986DA", "#59DAAD"]
+
+FIGURES = {
+    "model_fitting": {
+        "kind": "model_fitting",
+        # the realizations of the models, which have no parameter
+        "query": {
+            "dataset": DATASETS,
+            "model": ["empirical", "CM", "CL", "DCSBM"],
+            "param": np.nan,
+            "metric": MEASURES,
+        },
+        "datasets": DATASETS[::-1],
+        "output": ["Figures/Fig2/model_fitting.png", "Figures/Fig2/model_fitting.pdf"],
+        "dpi": 1000,
+    },
+    "cm_convergence": {
+        "kind": "cm_convergence",
+        "query": {
+            "dataset": [
+                "email-enron",
+                "contact-high-school",
+                "ndc-substances",
+                "tags-ask-ubuntu",
+            ],
+            "model": CONVERGENCE_MODEL,
+            "metric": MEASURES,
+        },
+        "output": [
+            "Figures/Fig4/cm_convergence.png",
+            "Figures/Fig4/cm_convergence.pdf",
+        ],
+        "dpi": 1000,
+    },
+    "empirical_simpliciality": {
+        "kind": "empirical_simpliciality",
+        "query": {"model": "empirical", "dataset": DATASETS, "metric": MEASURES},
+        "datasets": DATASETS[::-1],
+        "output": [
+            "Figures/FigX/empirical_simpliciality.png",
+            "Figures/FigX/empirical_simpliciality.pdf",
+        ],
+        "dpi": 1000,
+    },
+}
+
+
+def plot_model_fitting(data, spec):
+    datasets = spec["datasets"]
+    set_fonts()
+    fig, axes = plt.subplots(1, len(MEASURES), figsize=(12, 4.5))
+
+    for i, m in enumerate(MEASURES):
+        ax = axes[i]
+        for d in range(len(datasets)):
+            ax.plot(
+                [0, 1], [d, d], linestyle=(1, (1, 10)), linewidth=0.5, color="black"
+            )
+
+        ax.set_xlim([0.0, 1.0])
+        ax.set_ylim([-0.5, len(datasets) - 0.5])
+        ax.set_xticks([0, 0.5, 1], [0, 0.5, 1])
+        ax.set_xlabel(MEASURE_LABELS[i])
+        if i != 0:
+            ax.set_yticks([], [])
+
+        empirical = _select(data, model="empirical", metric=m)
+        ax.plot(
+            [_values(empirical, d)[0] for d in datasets],
+            datasets,
+            marker="o",
+            linestyle="",
+            color="grey",
+            markersize=6,
+            label="Empirical dataset",
+        )
+
+        handles = []
+        for model in ["CM", "CL", "DCSBM"]:
+            values = _select(data, model=model, metric=m)
+            vp = ax.violinplot(
+                [_values(values, d) for d in datasets],
+                range(len(datasets)),
+                orientation="horizontal",
+                widths=1,
+                showextrema=False,
+                showmeans=True,
+            )
+            handles.append(vp["bodies"][0].get_facecolor().flatten())
+
+    from matplotlib.patches import Patch
+
+    ax_handles, labels = axes[0].get_legend_handles_labels()
+    ax_handles += [Patch(facecolor=c, edgecolor=None) for c in handles]
+    labels += ["Configuration model", "Chung-Lu model", "biSBM"]
+    axes[0].legend(ax_handles, labels, loc=(0.2, 0.12))
+
+    fig.tight_layout()
+    return fig
+
+
+def plot_cm_convergence(data, spec):
+    datasets = list(dict.fromkeys(data["dataset"].tolist()))
+    fig = plt.figure(figsize=(8, 6))
+    for i, d in enumerate(datasets):
+        ax = fig.add_subplot(2, 2, i + 1)
+        ax.set_title(d)
+        for m, marker, label in zip(
+            ["fes", "es", "sf"], ["ko-", "ks-", "k^-"], ["FES", "ES", "SF"]
+        ):
+            rows = _select(data, dataset=d, metric=m)
+            order = np.argsort(rows["param"], kind="stable")
+            ax.semilogx(
+                rows["param"][order],
+                rows["value"][order],
+                marker,
+                linewidth=1,
+                label=label,
+            )
+        ax.set_xlabel("Number of edge swaps")
+        ax.set_ylabel("Simpliciality")
+        ax.spines[["top", "right"]].set_visible(False)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def plot_empirical_simpliciality(data, spec):
+    datasets = spec["datasets"]
+    plt.rcParams["font.family"] = "sans-serif"
+    plt.rcParams["font.sans-serif"] = [
+        "Tahoma",
+        "DejaVu Sans",
+        "Lucida Grande",
+        "Verdana",
+    ]
+    plt.rcParams["font.size"] = 16
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    for i in range(len(datasets)):
+        ax.plot([0, 1], [i, i], linestyle=(1, (1, 10)), linewidth=0.5, color="black")
+
+    for m, marker, color in zip(MEASURES, ["s", "d", "o"], COLOR_PALETTE):
+        values = _select(data, metric=m)
+        ax.plot(
+            [_values(values, d)[0] for d in datasets],
+            datasets,
+            marker=marker,
+            linestyle="",
+            color=color,
+            label=m.upper(),
+        )
+
+    ax.set_xlabel("Simpliciality")
+    ax.set_xlim([-0.0, 1.0])
+    ax.set_ylim([-0.5, len(datasets) - 0.5])
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+PLOTS = {
+    "model_fitting": plot_model_fitting,
+    "cm_convergence": plot_cm_convergence,
+    "empirical_simpliciality": plot_empirical_simpliciality,
+}
+
+
+def figure_hash(spec, data):
+    """The hash of everything a figure depends on.
+
+    Parameters
+    ----------
+    spec : dict
+        The spec of the figure.
+    data : dict of numpy.ndarray
+        The results the figure is drawn from.
+
+    Returns
+    -------
+    str
+        The hex digest of the spec, the code of the plot and of the helpers
+        and constants shared by the plots, and the data.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps(spec, sort_keys=True).encode())
+    for func in [PLOTS[spec["kind"]], render_figure, _select, _values, set_fonts]:
+        h.update(inspect.getsource(func).encode())
+    h.update(json.dumps([MEASURES, MEASURE_LABELS, COLOR_PALETTE]).encode())
+    for key in sorted(data):
+        h.update(key.encode())
+        h.update(np.ascontiguousarray(data[key]).tobytes())
+    return h.hexdigest()
+
+
+def render_figure(spec, results_path):
+    """Renders a figure to its output files.
+
+    Parameters
+    ----------
+    spec : dict
+        The spec of the figure.
+    results_path : str
+        The directory of the results store.
+    """
+    data = ResultsStore(results_path).query(**spec["query"])
+    # every plot starts from the default style, and the fonts it sets don't
+    # carry over to the next figure rendered by the same worker
+    with plt.rc_context():
+        plt.rcdefaults()
+        fig = PLOTS[spec["kind"]](data, spec)
+        for fname in spec["output"]:
+            os.makedirs(os.path.dirname(fname) or ".", exist_ok=True)
+            fig.savefig(fname, dpi=spec.get("dpi"))
+    plt.close(fig)
+
+
+def render_figures(
+    figures,
+    results_path="Data/results",
+    manifest="Figures/manifest.json",
+    force=False,
+    num_processes=None,
+):
+    """Renders the figures whose inputs changed since the last run.
+
+    Parameters
+    ----------
+    figures : dict
+        The spec of each figure, keyed by its name.
+    results_path : str, optional
+        The directory of the results store, by default "Data/results".
+    manifest : str, optional
+        The JSON file with the hash of each rendered figure,
+        by default "Figures/manifest.json".
+    force : bool, optional
+        Whether to render all the figures, by default False.
+    num_processes : int, optional
+        The number of worker processes, by default all the available CPUs.
+
+    Returns
+    -------
+    list of str
+        The names of the rendered figures.
+    """
+    hashes = dict()
+    if os.path.exists(manifest):
+        with open(manifest) as file:
+            hashes = json.loads(file.read())
+
+    results = ResultsStore(results_path)
+    tasks = []
+    for name, spec in figures.items():
+        h = figure_hash(spec, results.query(**spec["query"]))
+        outputs_exist = all(os.path.exists(f) for f in spec["output"])
+        if force or hashes.get(name) != h or not outputs_exist:
+            tasks.append(Task((name, h), render_figure, spec, results_path))
+        else:
+            print(f"{name} is up to date", flush=True)
+
+    rendered = []
+    for task, _ in run_tasks(tasks, num_processes=num_processes):
+        name, h = task.key
+        print(f"{name} rendered", flush=True)
+        rendered.append(name)
+        # record each figure as soon as it's rendered, in case a later one fails
+        hashes[name] = h
+        os.makedirs(os.path.dirname(manifest) or ".", exist_ok=True)
+        with open(manifest, "w") as file:
+            file.write(json.dumps(hashes, indent=2))
+    return rendered
+
+
+def _select(data, **filters):
+    mask = np.ones(len(data["value"]), dtype=bool)
+    for key, value in filters.items():
+        mask &= data[key] == value
+    return {key: a[mask] for key, a in data.items()}
+
+
+def _values(data, dataset):
+    return data["value"][data["dataset"] == dataset]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("figures", nargs="*", help="The figures, by default all.")
+    parser.add_argument("-r", "--results", default="Data/results")
+    parser.add_argument("-f", "--force", action="store_true")
+    parser.add_argument("-p", "--processes", type=int, default=None)
+    parser.add_argument("--dpi", type=float, default=None)
+    args = parser.parse_args()
+
+    # rebuild the store if the JSON files of the scripts changed
+    sync_results(ResultsStore(args.results), "Data")
+
+    figures = {
+        name: spec
+        for name, spec in FIGURES.items()
+        if not args.figures or name in args.figures
+    }
+    if args.dpi is not None:
+        figures = {name: dict(spec, dpi=args.dpi) for name, spec in figures.items()}
+
+    render_figures(
+        figures, args.results, force=args.force, num_processes=args.processes
+    )
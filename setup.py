@@ -31,7 +31,7 @@ license = "3-Clause BSD license"
 
 setup(
     name=name,
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks*"]),
     version=version,
     author=authors,
     author_email=author_email,
@@ -2,19 +2,21 @@ import json
 import os
 from sys import platform
 
+import numpy as np
 import xgi
 from joblib import Parallel, delayed
 
 from sod import *
 
 
-def get_simplicial_assortativity(dataset, max_order, metric):
-    H = xgi.load_xgi_data(dataset, max_order=max_order)
-    H.cleanup()
+def get_local_simpliciality(dataset, handle, metric, idx):
+    # a worker builds the hypergraph once and reuses it for its next tasks
+    H = attach_hypergraph(handle)
+    nodes = idx.tolist()
 
-    a = simplicial_assortativity(H, metric)
-    print(f"{dataset}-{metric} completed!", flush=True)
-    return dataset, metric, a
+    s = local_simpliciality(H, metric, nodes)
+    print(f"{dataset}-{metric} ({len(nodes)} nodes) completed!", flush=True)
+    return dataset, metric, idx, [s[n] for n in nodes]
 
 
 datasets = [
@@ -32,6 +34,8 @@ datasets = [
 
 max_order = 2
 metrics = ["sf", "es", "fes"]
+# datasets whose estimated cost is above this are split into several tasks
+split_cost = 2**20
 
 if platform == "linux" or platform == "linux2":
     num_processes = len(os.sched_getaffinity(0))
@@ -40,19 +44,59 @@ elif platform == "darwin" or platform == "win32":
 
 print(f"{num_processes} processes", flush=True)
 
+# reuse the results of unchanged datasets from previous runs. The local
+# measures are split into tasks, so the assortativities are looked up and
+# stored under the keys of simplicial_assortativity here.
+cache = enable_cache("Data/cache")
+cache_keys = dict()
+a_data = defaultdict(dict)
+
+# load each dataset once and publish it so that tasks attach to it
+handles = dict()
 arglist = []
+costs = []
 for d in datasets:
+    H = load_dataset(d, max_order=max_order)
+    H.cleanup()
+    handles[d] = publish_arrays(unlabeled_arrays(incidence_arrays(H)))
+    fp = fingerprint(H)
+
+    # split the nodes of large datasets into tasks of about the same cost
+    c = node_costs(attach_arrays(handles[d]))
+    num_parts = int(np.clip(np.ceil(c.sum() / split_cost), 1, num_processes))
     for m in metrics:
-        arglist.append((d, max_order, m))
+        cache_keys[d, m] = metric_key(simplicial_assortativity, fp, m)
+        value = cache.get(cache_keys[d, m])
+        if value is not None:
+            a_data[d][m] = value
+            continue
+        for idx in balanced_partition(c, num_parts):
+            arglist.append((d, handles[d], m, idx))
+            costs.append(c[idx].sum())
 
+# dispatch the most expensive tasks first so that no core idles at the end
+order = np.argsort(costs, kind="stable")[::-1]
 data = Parallel(n_jobs=num_processes)(
-    delayed(get_simplicial_assortativity)(*arg) for arg in arglist
+    delayed(get_local_simpliciality)(*arglist[i]) for i in order
 )
 
-a_data = defaultdict(dict)
-for d, metric, a in data:
-    a_data[d][metric] = a
+s = defaultdict(dict)
+for d, metric, idx, values in data:
+    s[d].setdefault(metric, np.full(len(attach_arrays(handles[d])["node_ids"]), np.nan))
+    s[d][metric][idx] = values
+
+for d in datasets:
+    H = hypergraph_from_arrays(attach_arrays(handles[d]))
+    for metric in s[d]:
+        a_data[d][metric] = assortativity(H, s[d][metric])
+        cache.set(cache_keys[d, metric], a_data[d][metric])
+    a_data[d] = {metric: a_data[d][metric] for metric in metrics}
+
+for handle in handles.values():
+    release_arrays(handle)
 
 with open("Data/empirical_simplicial_assortativity.json", "w") as file:
     datastring = json.dumps(a_data, indent=2)
     file.write(datastring)
+
+sync_results(ResultsStore("Data/results"), "Data")
@@ -1,5 +1,212 @@
-from . import generators, simpliciality, trie, utilities
-from .generators import *
-from .simpliciality import *
-from .trie import Trie
-from .utilities import *
+"""Measures of the simpliciality of higher-order networks.
+
+The submodules are imported lazily (PEP 562), so `import sod` is quick and the
+heavy dependencies, such as xgi and scipy, are only imported by the functions
+that need them. `from sod import *` still imports everything.
+"""
+
+import importlib
+import sys
+import types
+
+# the submodules, in the order in which their names are exported
+_SUBMODULES = [
+    "backends",
+    "cache",
+    "checkpoint",
+    "dcsbm",
+    "faceindex",
+    "fingerprint",
+    "generators",
+    "hashindex",
+    "incidence",
+    "instrument",
+    "results",
+    "scheduler",
+    "sharedmem",
+    "simpliciality",
+    "stats",
+    "store",
+    "trie",
+    "utilities",
+    "workloads",
+]
+
+# the public names of each submodule
+_EXPORTS = {
+    "backends": [
+        "REFERENCE",
+        "differential_test",
+        "get_backends",
+        "random_edges",
+        "register_backend",
+        "shrink",
+        "unregister_backend",
+    ],
+    "cache": [
+        "ResultCache",
+        "cached",
+        "disable_cache",
+        "enable_cache",
+        "get_cache",
+        "metric_key",
+        "no_cache",
+    ],
+    "checkpoint": ["Checkpoint"],
+    "dcsbm": [
+        "convert_dcsbm_parameters",
+        "load_dcsbm_parameters",
+        "save_dcsbm_parameters",
+    ],
+    "faceindex": [
+        "FaceIndex",
+        "KeyRuns",
+        "face_blocks",
+        "hash_keys",
+        "key_dtype",
+        "pack_array",
+        "pack_faces",
+        "subface_combinations",
+        "unpack_faces",
+        "unpack_keys",
+    ],
+    "fingerprint": ["fingerprint"],
+    "generators": ["configuration_model"],
+    "hashindex": [
+        "HashIndex",
+        "ZobristHasher",
+        "count_missing_subfaces_hashed",
+        "gray_code_subsets",
+        "is_simplex_hashed",
+    ],
+    "incidence": [
+        "attach_hypergraph",
+        "face_index",
+        "hypergraph_from_arrays",
+        "incidence_arrays",
+        "to_bipartite_edgelist",
+        "unlabeled_arrays",
+    ],
+    "instrument": [
+        "Instrumentation",
+        "disable_instrumentation",
+        "enable_instrumentation",
+        "get_instrumentation",
+        "instrumented",
+        "phase",
+        "run_instrumented",
+    ],
+    "results": [
+        "CONVERGENCE_MODEL",
+        "ResultsStore",
+        "import_cm_convergence",
+        "import_empirical_simpliciality",
+        "import_model_simpliciality",
+        "import_results",
+        "sync_results",
+    ],
+    "scheduler": [
+        "Task",
+        "available_cpus",
+        "balanced_partition",
+        "edge_costs",
+        "node_costs",
+        "parse_memory",
+        "run_tasks",
+    ],
+    "sharedmem": [
+        "attach_arrays",
+        "publish_arrays",
+        "release_arrays",
+        "shared_arrays",
+    ],
+    "simpliciality": [
+        "assortativity",
+        "count_missing_faces",
+        "count_missing_subfaces",
+        "count_simplices",
+        "edit_simpliciality",
+        "edit_simpliciality_full_construction",
+        "edit_simpliciality_mapreduce",
+        "face_edit_distance_sum",
+        "face_edit_simpliciality",
+        "indexed_edit_simpliciality",
+        "indexed_face_edit_distance_sum",
+        "indexed_simplex_counts",
+        "is_simplex",
+        "local_edit_simpliciality",
+        "local_face_edit_simpliciality",
+        "local_simplicial_fraction",
+        "local_simpliciality",
+        "max_number_of_subfaces",
+        "maximal_edges",
+        "mean_face_edit_distance",
+        "missing_faces",
+        "missing_subfaces",
+        "out_of_core_simpliciality",
+        "potential_simplices",
+        "powerset",
+        "read_edgelist_chunks",
+        "simplex_counts",
+        "simplicial_assortativity",
+        "simplicial_edit_distance",
+        "simplicial_fraction",
+        "write_simplicial_closure",
+    ],
+    "stats": ["EnsembleRunner", "RunningStats"],
+    "store": ["CompactHypergraph", "import_xgi_json", "load_dataset", "save_dataset"],
+    "trie": ["Trie"],
+    "utilities": ["list_of_lists_to_latex_table"],
+    "workloads": ["PROFILES", "workload", "workload_like", "write_workload"],
+}
+_ATTRS = {name: module for module, names in _EXPORTS.items() for name in names}
+
+
+def __getattr__(name):
+    if name in _ATTRS:
+        module = importlib.import_module(f".{_ATTRS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name == "__all__":
+        # the names that the submodules import, such as np, are exported as
+        # well, but any other name, such as one probed by hasattr, is missing
+        # without importing anything
+        return list(_load_all())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ATTRS) | set(_SUBMODULES))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds its name in the package, which mustn't hide
+        # the function of the same name, that is, fingerprint.
+        if name in _ATTRS and isinstance(value, types.ModuleType):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
+
+def _load_all():
+    namespace = dict()
+    for name in _SUBMODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        if name == "trie":
+            # only the Trie is exported
+            public = _EXPORTS[name]
+        else:
+            public = [k for k in vars(module) if not k.startswith("_")]
+        namespace.update((k, getattr(module, k)) for k in public)
+    # the submodules take precedence over the names they import, and the
+    # public names over the submodules
+    namespace.update((name, sys.modules[f"{__name__}.{name}"]) for name in _SUBMODULES)
+    namespace.update((name, getattr(namespace[m], name)) for name, m in _ATTRS.items())
+    globals().update(namespace)
+    return namespace
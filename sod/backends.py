@@ -0,0 +1,360 @@
+"""Alternate backends of the measures of simpliciality and their differential test.
+
+A backend computes one of the global measures, "sf", "es", or "fes", of a
+hypergraph with the signature of the reference implementation, that is,
+``f(H, min_size=2, exclude_min_size=True)``. `differential_test` runs every
+registered backend against the reference on many random hypergraphs, for all
+the combinations of `min_size` and `exclude_min_size`, and shrinks every
+hypergraph on which they disagree to a minimal one. A faster backend, such as
+a hashed, out-of-core, or parallel one, should pass it before it replaces the
+reference in production runs.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import xgi
+
+from .cache import no_cache
+from .hashindex import (
+    HashIndex,
+    ZobristHasher,
+    count_missing_subfaces_hashed,
+    is_simplex_hashed,
+)
+from .incidence import face_index, incidence_arrays
+from .simpliciality import (
+    edit_simpliciality,
+    edit_simpliciality_full_construction,
+    edit_simpliciality_mapreduce,
+    face_edit_simpliciality,
+    indexed_edit_simpliciality,
+    indexed_face_edit_distance_sum,
+    indexed_simplex_counts,
+    max_number_of_subfaces,
+    maximal_edges,
+    out_of_core_simpliciality,
+    simplicial_fraction,
+)
+
+REFERENCE = {
+    "sf": simplicial_fraction,
+    "es": edit_simpliciality,
+    "fes": face_edit_simpliciality,
+}
+# the (func, rtol, atol) of each backend of each measure
+_BACKENDS = {metric: dict() for metric in REFERENCE}
+
+
+def register_backend(metric, name, func, rtol=1e-12, atol=1e-12):
+    """Registers a backend of a measure.
+
+    Parameters
+    ----------
+    metric : str
+        "sf", "es", or "fes".
+    name : str
+        The name of the backend. A backend of the same name is replaced.
+    func : callable
+        The backend, with the signature ``func(H, min_size, exclude_min_size)``.
+    rtol, atol : float, optional
+        The relative and absolute tolerances of the agreement with the
+        reference, by default 1e-12, which only allows for rounding. An
+        estimator, such as a sampled one, should register the tolerance it
+        guarantees, for example, a few standard errors.
+
+    Raises
+    ------
+    KeyError
+        If the measure is invalid.
+    """
+    _BACKENDS[metric][name] = (func, rtol, atol)
+
+
+def unregister_backend(metric, name):
+    """Removes a backend of a measure.
+
+    Parameters
+    ----------
+    metric : str
+        "sf", "es", or "fes".
+    name : str
+        The name of the backend.
+
+    Raises
+    ------
+    KeyError
+        If there is no such backend.
+    """
+    del _BACKENDS[metric][name]
+
+
+def get_backends(metric):
+    """The registered backends of a measure.
+
+    Parameters
+    ----------
+    metric : str
+        "sf", "es", or "fes".
+
+    Returns
+    -------
+    dict
+        The function of each backend, keyed by its name.
+    """
+    return {name: b[0] for name, b in _BACKENDS[metric].items()}
+
+
+def random_edges(rng, max_nodes=8, max_edges=12, max_size=5):
+    """Draws the edges of a random hypergraph without multiedges.
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+        The random number generator.
+    max_nodes : int, optional
+        The maximum number of nodes, by default 8.
+    max_edges : int, optional
+        The maximum number of edges, by default 12. There may be none.
+    max_size : int, optional
+        The maximum size of the edges, by default 5.
+
+    Returns
+    -------
+    list of tuple
+        The sorted integer members of each edge.
+    """
+    n = int(rng.integers(1, max_nodes + 1))
+    m = int(rng.integers(0, max_edges + 1))
+    edges = set()
+    for _ in range(m):
+        k = int(rng.integers(1, min(max_size, n) + 1))
+        edges.add(tuple(sorted(rng.choice(n, k, replace=False).tolist())))
+    return sorted(edges)
+
+
+def shrink(edges, fails):
+    """Shrinks a failing input to a minimal one.
+
+    Edges and then members of edges are removed one at a time, as long as
+    the input still fails, until no single removal does.
+
+    Parameters
+    ----------
+    edges : list of tuple
+        The edges on which `fails` is True.
+    fails : callable
+        Whether a list of edges fails.
+
+    Returns
+    -------
+    list of tuple
+        The shrunk edges, on which `fails` is True.
+    """
+    edges = list(edges)
+    changed = True
+    while changed:
+        changed = False
+        candidates = [edges[:i] + edges[i + 1 :] for i in range(len(edges))]
+        for i, e in enumerate(edges):
+            for j in range(len(e)):
+                smaller = e[:j] + e[j + 1 :]
+                if smaller and smaller not in edges:
+                    candidates.append(edges[:i] + [smaller] + edges[i + 1 :])
+        for candidate in candidates:
+            if fails(candidate):
+                edges = candidate
+                changed = True
+                break
+    return edges
+
+
+def differential_test(
+    metrics=None,
+    num_hypergraphs=100,
+    max_nodes=8,
+    max_edges=12,
+    max_size=5,
+    seed=None,
+):
+    """Tests the backends against the reference on random hypergraphs.
+
+    Parameters
+    ----------
+    metrics : list of str, optional
+        The measures whose backends are tested, by default all of them.
+    num_hypergraphs : int, optional
+        The number of random hypergraphs, by default 100.
+    max_nodes, max_edges, max_size : int, optional
+        The limits of the random hypergraphs, see `random_edges`.
+    seed : int, optional
+        The seed, by default None.
+
+    Returns
+    -------
+    list of dict
+        One failure per backend and combination of parameters that failed,
+        with the measure, the backend, the parameters, the shrunk edges,
+        and the outcomes of the reference and of the backend on them. An
+        outcome is a value or the exception raised, and the outcomes agree
+        if they are close or both the same type of exception.
+    """
+    if metrics is None:
+        metrics = list(REFERENCE)
+    rng = np.random.default_rng(seed)
+    failures = dict()
+    for _ in range(num_hypergraphs):
+        edges = random_edges(rng, max_nodes, max_edges, max_size)
+        for metric in metrics:
+            for name, (func, rtol, atol) in _BACKENDS[metric].items():
+                for min_size in [1, 2]:
+                    for exclude_min_size in [True, False]:
+                        key = (metric, name, min_size, exclude_min_size)
+                        if key in failures:
+                            continue
+                        case = (metric, func, min_size, exclude_min_size, rtol, atol)
+                        if _fails(case, edges):
+                            shrunk = shrink(edges, lambda e: _fails(case, e))
+                            failures[key] = _failure(case, name, shrunk)
+    return list(failures.values())
+
+
+def _outcome(func, edges, min_size, exclude_min_size):
+    with no_cache():
+        try:
+            return func(xgi.Hypergraph(edges), min_size, exclude_min_size)
+        except Exception as e:
+            return e
+
+
+def _agree(expected, actual, rtol, atol):
+    if isinstance(expected, Exception) or isinstance(actual, Exception):
+        return type(expected) is type(actual)
+    return bool(np.isclose(expected, actual, rtol=rtol, atol=atol, equal_nan=True))
+
+
+def _fails(case, edges):
+    metric, func, min_size, exclude_min_size, rtol, atol = case
+    expected = _outcome(REFERENCE[metric], edges, min_size, exclude_min_size)
+    actual = _outcome(func, edges, min_size, exclude_min_size)
+    return not _agree(expected, actual, rtol, atol)
+
+
+def _failure(case, name, edges):
+    metric, func, min_size, exclude_min_size, _, _ = case
+    return {
+        "metric": metric,
+        "backend": name,
+        "min_size": min_size,
+        "exclude_min_size": exclude_min_size,
+        "edges": edges,
+        "expected": _outcome(REFERENCE[metric], edges, min_size, exclude_min_size),
+        "actual": _outcome(func, edges, min_size, exclude_min_size),
+    }
+
+
+def _hash_index(H):
+    index = HashIndex(ZobristHasher(seed=0))
+    index.build_index(H.edges.members())
+    return index
+
+
+def _simplicial_fraction_hashed(H, min_size=2, exclude_min_size=True):
+    index = _hash_index(H)
+    edges = H.edges.filterby("size", min_size + exclude_min_size, "geq").members()
+    if not edges:
+        return np.nan
+    ns = sum(is_simplex_hashed(index, e, min_size) for e in edges)
+    return ns / len(edges)
+
+
+def _face_edit_simpliciality_hashed(H, min_size=2, exclude_min_size=True):
+    index = _hash_index(H)
+    max_faces = (
+        H.edges.maximal().filterby("size", min_size + exclude_min_size, "geq").members()
+    )
+    avg_d = 0
+    for e in max_faces:
+        if len(e) >= min_size:
+            d = count_missing_subfaces_hashed(index, e, min_size=min_size)
+            m = max_number_of_subfaces(min_size, len(e))
+            if m != 0:
+                d *= 1.0 / m
+            avg_d += d / len(max_faces)
+    return 1 - avg_d
+
+
+class _SerialRunner:
+    # runs the map and reduce tasks in this process
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+
+def _edit_simpliciality_mapreduce(H, min_size=2, exclude_min_size=True):
+    return edit_simpliciality_mapreduce(
+        H,
+        min_size,
+        exclude_min_size,
+        num_mappers=2,
+        num_reducers=2,
+        runner=_SerialRunner(),
+        buffer_size=64,
+    )
+
+
+def _out_of_core(metric):
+    def backend(H, min_size=2, exclude_min_size=True):
+        work_dir = tempfile.mkdtemp(prefix="sod-backend-")
+        try:
+            fname = os.path.join(work_dir, "edges.txt")
+            node_index = {n: i for i, n in enumerate(H.nodes)}
+            with open(fname, "w") as file:
+                for e in H.edges.members():
+                    file.write(" ".join(str(node_index[n]) for n in e) + "\n")
+            s = out_of_core_simpliciality(
+                fname,
+                min_size=min_size,
+                exclude_min_size=exclude_min_size,
+                buffer_size=64,
+                chunksize=16,
+                work_dir=work_dir,
+            )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return s[metric]
+
+    return backend
+
+
+def _indexed(metric):
+    def backend(H, min_size=2, exclude_min_size=True):
+        arrays = incidence_arrays(H)
+        index = face_index(arrays, min_size)
+        if metric == "sf":
+            ns, ps = indexed_simplex_counts(arrays, index, min_size, exclude_min_size)
+            return ns / ps if ps else np.nan
+        maximal = maximal_edges(arrays, index, min_size)
+        if metric == "es":
+            return indexed_edit_simpliciality(
+                arrays, index, maximal, min_size, exclude_min_size
+            )
+        total, count = indexed_face_edit_distance_sum(
+            arrays, index, maximal, min_size, exclude_min_size
+        )
+        return 1 - (total / count if count else 0)
+
+    return backend
+
+
+register_backend("sf", "hashed", _simplicial_fraction_hashed)
+register_backend("sf", "out_of_core", _out_of_core("sf"))
+register_backend("sf", "indexed", _indexed("sf"))
+register_backend("es", "full_construction", edit_simpliciality_full_construction)
+register_backend("es", "mapreduce", _edit_simpliciality_mapreduce)
+register_backend("es", "out_of_core", _out_of_core("es"))
+register_backend("es", "indexed", _indexed("es"))
+register_backend("fes", "hashed", _face_edit_simpliciality_hashed)
+register_backend("fes", "out_of_core", _out_of_core("fes"))
+register_backend("fes", "indexed", _indexed("fes"))
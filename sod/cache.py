@@ -0,0 +1,302 @@
+"""A content-addressed cache of metric results on local disk.
+
+Results are keyed by a structural fingerprint of the hypergraph, the name of
+the metric, its version, and its parameters, so a rerun on unchanged data reads
+the result instead of recomputing it. The version of a metric is bumped
+whenever a change of its code, or of the code it calls, changes its results,
+so that the results of the old code are no longer read. The cache is disabled by default; `enable_cache`
+turns it on for this process and for any worker processes started afterwards.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import partial, wraps
+
+from .fingerprint import fingerprint
+from .instrument import get_instrumentation
+
+_ENV_VAR = "SOD_CACHE_DIR"
+_ENV_VAR_MAX_BYTES = "SOD_CACHE_MAX_BYTES"
+_MISSING = object()
+
+_cache = None
+_state = threading.local()
+
+
+class ResultCache:
+    """Metric results stored as small JSON files in a directory.
+
+    When the files take up more than `max_bytes`, the least recently
+    used entries are evicted.
+
+    Parameters
+    ----------
+    directory : str
+        The directory of the cache. It is created if it doesn't exist.
+    max_bytes : int, optional
+        The maximum size of the cache, by default 100 MB.
+    """
+
+    def __init__(self, directory, max_bytes=100 * 2**20):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, fingerprint, metric, params, version=1):
+        """The key of a result.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the hypergraph.
+        metric : str
+            The name of the metric.
+        params : dict
+            The parameters of the metric. They must be JSON serializable.
+        version : int, optional
+            The version of the metric, by default 1.
+
+        Returns
+        -------
+        str
+            A hexadecimal digest.
+        """
+        s = json.dumps([fingerprint, metric, version, params], sort_keys=True)
+        return hashlib.sha256(s.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key, default=None):
+        """Reads a result.
+
+        Parameters
+        ----------
+        key : str
+            The key of the result.
+        default : optional
+            The value to return if the key is not in the cache, by default None.
+
+        Returns
+        -------
+        The cached result or `default`.
+        """
+        path = self._path(key)
+        try:
+            with open(path) as file:
+                value = json.loads(file.read())["value"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return default
+        # mark as recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return value
+
+    def set(self, key, value):
+        """Writes a result and evicts old results if the cache is full.
+
+        Parameters
+        ----------
+        key : str
+            The key of the result.
+        value
+            The JSON-serializable result.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            file.write(json.dumps({"value": value}))
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used results until the cache fits."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Removes all results."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                os.remove(entry.path)
+
+    def __len__(self):
+        return sum(1 for e in os.scandir(self.directory) if e.name.endswith(".json"))
+
+
+def enable_cache(directory="Data/cache", max_bytes=100 * 2**20):
+    """Turns on the result cache.
+
+    Worker processes started afterwards use the same cache.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The directory of the cache, by default "Data/cache".
+    max_bytes : int, optional
+        The maximum size of the cache, by default 100 MB.
+
+    Returns
+    -------
+    ResultCache
+        The cache.
+    """
+    global _cache
+    _cache = ResultCache(directory, max_bytes)
+    os.environ[_ENV_VAR] = _cache.directory
+    os.environ[_ENV_VAR_MAX_BYTES] = str(max_bytes)
+    return _cache
+
+
+def disable_cache():
+    """Turns off the result cache."""
+    global _cache
+    _cache = None
+    os.environ.pop(_ENV_VAR, None)
+    os.environ.pop(_ENV_VAR_MAX_BYTES, None)
+
+
+def get_cache():
+    """The active result cache.
+
+    Returns
+    -------
+    ResultCache or None
+        The cache, or None if it is disabled.
+    """
+    global _cache
+    directory = os.environ.get(_ENV_VAR)
+    if directory is None:
+        return None
+    if _cache is None or _cache.directory != directory:
+        max_bytes = int(os.environ.get(_ENV_VAR_MAX_BYTES, 100 * 2**20))
+        _cache = ResultCache(directory, max_bytes)
+    return _cache
+
+
+@contextmanager
+def no_cache():
+    """Bypasses the result cache inside a `with` block."""
+    active = getattr(_state, "active", False)
+    _state.active = True
+    try:
+        yield
+    finally:
+        _state.active = active
+
+
+def cached(func=None, *, version=1):
+    """Caches the results of a metric of a hypergraph.
+
+    The first argument of `func` must be the hypergraph and the other
+    arguments must be JSON serializable. Calls made while computing
+    another cached metric are not cached themselves.
+
+    Parameters
+    ----------
+    func : callable
+        The metric.
+    version : int, optional
+        The version of the metric, by default 1. Bump it whenever a change
+        of the code of the metric, or of the code it calls, changes its
+        results, so that the results cached before are not read.
+
+    Returns
+    -------
+    callable
+        The metric, which consults the active cache, if any.
+
+    Examples
+    --------
+    >>> @cached(version=2)  # doctest: +SKIP
+    ... def face_edit_simpliciality(H, min_size=2, exclude_min_size=True):
+    ...     ...
+    """
+    if func is None:
+        return partial(cached, version=version)
+
+    sig = inspect.signature(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @wraps(func)
+    def wrapper(H, *args, **kwargs):
+        cache = get_cache()
+        if cache is None or getattr(_state, "active", False):
+            return func(H, *args, **kwargs)
+
+        params = _params(sig, H, args, kwargs)
+        key = cache.key(fingerprint(H), name, params, version)
+
+        value = cache.get(key, _MISSING)
+        rec = get_instrumentation()
+        if rec is not None:
+            rec.count("cache.misses" if value is _MISSING else "cache.hits")
+        if value is _MISSING:
+            with no_cache():
+                value = func(H, *args, **kwargs)
+            cache.set(key, value)
+        return value
+
+    wrapper.cache_version = version
+    return wrapper
+
+
+def metric_key(func, fingerprint, *args, **kwargs):
+    """The key of a result of a cached metric in the active cache.
+
+    A result computed some other way, for example, by adding up the results
+    of parallel tasks, can be stored under this key so that a later call of
+    the metric reads it, and conversely.
+
+    Parameters
+    ----------
+    func : callable
+        The metric, decorated with `cached`.
+    fingerprint : str
+        The fingerprint of the hypergraph, as returned by `fingerprint`.
+    *args
+        The positional arguments of the metric after the hypergraph.
+    **kwargs
+        The keyword arguments of the metric.
+
+    Returns
+    -------
+    str or None
+        The key, or None if the cache is disabled.
+    """
+    cache = get_cache()
+    if cache is None:
+        return None
+    version = func.cache_version
+    func = inspect.unwrap(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+    params = _params(inspect.signature(func), None, args, kwargs)
+    return cache.key(fingerprint, name, params, version)
+
+
+def _params(sig, H, args, kwargs):
+    # the arguments after the hypergraph, including the defaults
+    bound = sig.bind(H, *args, **kwargs)
+    bound.apply_defaults()
+    return dict(list(bound.arguments.items())[1:])
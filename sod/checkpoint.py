@@ -0,0 +1,116 @@
+"""Durable logs of task results for resuming long runs.
+
+Each finished task appends one line of JSON with its key and its result to a
+log file and syncs it to disk, so a run that crashes or is preempted loses at
+most the tasks that were running. When the run restarts, the tasks already in
+the log are skipped and the final results are assembled from the log.
+"""
+
+import json
+import os
+
+import numpy as np
+
+
+class Checkpoint:
+    """An append-only log of task results in the JSON Lines format.
+
+    Parameters
+    ----------
+    path : str
+        The log file. If it exists, its results are loaded, and a
+        truncated last line, left by a crash mid-write, is discarded.
+
+    Examples
+    --------
+    >>> with Checkpoint("run.jsonl") as checkpoint:  # doctest: +SKIP
+    ...     for i in range(10):
+    ...         if ("CM", i) not in checkpoint:
+    ...             checkpoint.add(("CM", i), run(i))
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.results = dict()
+
+        size = 0
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    self.results[tuple(record["key"])] = record["result"]
+                    size += len(line)
+
+        self.file = open(self.path, "ab")
+        # drop anything after the last complete record
+        self.file.truncate(size)
+
+    def __contains__(self, key):
+        return tuple(key) in self.results
+
+    def __getitem__(self, key):
+        return self.results[tuple(key)]
+
+    def __len__(self):
+        return len(self.results)
+
+    def add(self, key, result):
+        """Appends a result to the log and syncs it to disk.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the task, for example, (dataset, model, realization).
+            Its elements must be JSON serializable.
+        result
+            The JSON-serializable result of the task.
+        """
+        key = tuple(key)
+        line = json.dumps({"key": key, "result": result}) + "\n"
+        self.file.write(line.encode())
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        # store the result as it would be read back
+        self.results[key] = json.loads(line)["result"]
+
+    def seed(self, key, seed=None):
+        """The root seed of a run, recorded so that a resumed run reuses it.
+
+        Parameters
+        ----------
+        key : tuple
+            The key under which the seed is recorded.
+        seed : int, optional
+            The seed of the run. If None (default), the seed recorded in
+            the log is used, and if there is none, a new one is drawn
+            and recorded.
+
+        Returns
+        -------
+        int
+            The entropy of the root `numpy.random.SeedSequence`, from which
+            each task spawns its own stream.
+        """
+        if seed is not None:
+            return np.random.SeedSequence(seed).entropy
+        if key in self:
+            return self[key]
+        entropy = np.random.SeedSequence().entropy
+        self.add(key, entropy)
+        return entropy
+
+    def items(self):
+        """The keys and results in the log, in the order they were added."""
+        return self.results.items()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
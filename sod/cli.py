@@ -0,0 +1,596 @@
+"""The command line interface, run with `python -m sod`.
+
+The stages of the analysis, that is, the empirical simpliciality, the model
+fitting, the simplicial assortativity, and the convergence of the
+configuration model, are broken into tasks for every dataset, metric, model,
+and realization, and all the tasks run on a single process pool, from the most
+to the least expensive. The simplicial fraction, the face edit simpliciality,
+and the simplicial assortativity of large datasets are further split into
+sub-tasks over subsets of edges or nodes. The outputs are the same JSON files
+as those of the driver scripts.
+
+Every dataset is published once to shared memory, labeled by the indices of
+its nodes and edges. For the global measures, the face index of its edges and
+its maximal faces are published along with it, so that the tasks look up the
+subfaces of their edges directly in the shared arrays.
+"""
+
+import argparse
+import json
+import os
+from collections import defaultdict
+
+import numpy as np
+import xgi
+
+from .cache import enable_cache, get_cache, metric_key
+from .checkpoint import Checkpoint
+from .dcsbm import load_dcsbm_parameters
+from .faceindex import FaceIndex
+from .fingerprint import fingerprint
+from .generators import configuration_model
+from .incidence import (
+    attach_hypergraph,
+    face_index,
+    hypergraph_from_arrays,
+    incidence_arrays,
+    unlabeled_arrays,
+)
+from .instrument import run_instrumented
+from .results import ResultsStore, sync_results
+from .scheduler import (
+    Task,
+    available_cpus,
+    balanced_partition,
+    edge_costs,
+    node_costs,
+    run_tasks,
+)
+from .sharedmem import attach_arrays, publish_arrays, release_arrays
+from .simpliciality import (
+    assortativity,
+    edit_simpliciality,
+    face_edit_simpliciality,
+    indexed_edit_simpliciality,
+    indexed_face_edit_distance_sum,
+    indexed_simplex_counts,
+    local_simpliciality,
+    maximal_edges,
+    simplicial_assortativity,
+    simplicial_fraction,
+)
+from .store import load_dataset
+
+DATASETS = [
+    "contact-primary-school",
+    "contact-high-school",
+    "hospital-lyon",
+    "email-enron",
+    "email-eu",
+    "ndc-substances",
+    "diseasome",
+    "disgenenet",
+    "congress-bills",
+    "tags-ask-ubuntu",
+]
+CONVERGENCE_DATASETS = [
+    "email-enron",
+    "contact-high-school",
+    "ndc-substances",
+    "tags-ask-ubuntu",
+]
+STAGES = ["empirical", "models", "assortativity", "convergence"]
+METRICS = {
+    "es": edit_simpliciality,
+    "fes": face_edit_simpliciality,
+    "sf": simplicial_fraction,
+}
+MODELS = ["CM", "CL", "DCSBM"]
+
+min_size = 2
+max_order = 10
+# the assortativity is only computed for pairwise and triangle edges
+assortativity_max_order = 2
+num_num_swaps = 10
+# tasks that cost more than this are split into sub-tasks where possible
+split_cost = 2**20
+# the cost of a proposed swap of the configuration model relative to that
+# of a subface lookup
+swap_cost = 10
+
+
+def main(argv=None):
+    """Runs the stages of the analysis.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        The command line arguments. If None (default), `sys.argv` is used.
+    """
+    args = _parse_args(argv)
+    stages = args.stages or STAGES
+    os.makedirs(args.output, exist_ok=True)
+    if not args.no_cache:
+        enable_cache(os.path.join(args.output, "cache"))
+
+    print(f"{args.processes} processes", flush=True)
+
+    datasets = _Datasets(args.store)
+    try:
+        tasks = []
+        outputs = []
+        for stage in stages:
+            datasets_for_stage = args.datasets
+            if datasets_for_stage is None:
+                if stage == "convergence":
+                    datasets_for_stage = CONVERGENCE_DATASETS
+                else:
+                    datasets_for_stage = DATASETS
+            output = _STAGES[stage](datasets, datasets_for_stage, args, tasks)
+            outputs.append(output)
+
+        if args.instrument is not None:
+            tasks = [_instrumented_task(task, args.instrument) for task in tasks]
+
+        for task, result in run_tasks(
+            tasks,
+            num_processes=args.processes,
+            memory_limit=args.memory_limit,
+            raise_errors=False,
+        ):
+            if isinstance(result, Exception):
+                print(f"{task.key} failed: {result!r}", flush=True)
+                result = None
+            else:
+                print(f"{task.key} completed", flush=True)
+            for output in outputs:
+                output.collect(task.key, result)
+
+        for output in outputs:
+            output.write(args.output)
+        sync_results(ResultsStore(os.path.join(args.output, "results")), args.output)
+    finally:
+        datasets.release()
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m sod",
+        description="Measure the simpliciality of datasets and null models.",
+    )
+    parser.add_argument(
+        "stages",
+        nargs="*",
+        choices=STAGES,
+        help="the stages to run, by default all of them",
+    )
+    parser.add_argument(
+        "-d",
+        "--datasets",
+        nargs="+",
+        help="the datasets to use, by default those of the paper",
+    )
+    parser.add_argument(
+        "-r",
+        "--realizations",
+        type=int,
+        default=10,
+        help="the number of realizations of each null model (default: 10)",
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        default=available_cpus(),
+        help="the number of worker processes (default: all available CPUs)",
+    )
+    parser.add_argument(
+        "-m",
+        "--memory-limit",
+        help="the maximum memory of each worker, such as 4G (default: no limit)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="Data",
+        help="the directory of the output files (default: Data)",
+    )
+    parser.add_argument(
+        "--store",
+        default="Data/store",
+        help="the directory of the dataset store (default: Data/store)",
+    )
+    parser.add_argument(
+        "-s",
+        "--seed",
+        type=int,
+        help="the seed of the null models (default: the seed logged by a "
+        "previous run or a random one)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="don't use the result cache"
+    )
+    parser.add_argument(
+        "--instrument",
+        metavar="DIR",
+        help="write the counters and timers of the phases of each task to a "
+        "JSON file in this directory (default: no instrumentation)",
+    )
+    return parser.parse_args(argv)
+
+
+class _Datasets:
+    # publishes each preprocessed dataset once, whichever stages use it
+    def __init__(self, store):
+        self.store = store
+        self.handles = dict()
+        self.fingerprints = dict()
+
+    def get(self, dataset, max_order, singletons, indexed=False):
+        key = (dataset, max_order, singletons, indexed)
+        if key not in self.handles:
+            H = load_dataset(dataset, max_order=max_order, store=self.store)
+            H.cleanup(singletons=singletons)
+            labeled = incidence_arrays(H)
+            self.fingerprints[key] = fingerprint(labeled)
+            # the outputs only need the order of the nodes, not their IDs
+            arrays = unlabeled_arrays(labeled)
+            if indexed:
+                index = face_index(arrays, min_size)
+                arrays["faces"] = index.keys
+                arrays["maximal"] = maximal_edges(arrays, index, min_size)
+            self.handles[key] = publish_arrays(arrays)
+        return self.handles[key]
+
+    def fingerprint(self, dataset, max_order, singletons, indexed=False):
+        # that of the dataset with its IDs, as the cached metrics compute it
+        self.get(dataset, max_order, singletons, indexed)
+        return self.fingerprints[dataset, max_order, singletons, indexed]
+
+    def release(self):
+        for handle in self.handles.values():
+            release_arrays(handle)
+        self.handles.clear()
+
+
+class _Output:
+    # collects the results of the tasks of one output file
+    def __init__(self, stage):
+        self.stage = stage
+        self.results = dict()
+
+    def collect(self, key, result):
+        if key[0] == self.stage:
+            self.results[key[1:]] = result
+
+    def write(self, directory):
+        for fname, data in self.files():
+            with open(os.path.join(directory, fname), "w") as file:
+                datastring = json.dumps(data, indent=2)
+                file.write(datastring)
+
+
+def _empirical_stage(datasets, names, args, tasks):
+    output = _EmpiricalOutput(names)
+    cache = get_cache()
+    for d in names:
+        handle = datasets.get(d, max_order, singletons=True, indexed=True)
+        costs = edge_costs(attach_arrays(handle), min_size)
+        parts = _split(costs, args.processes)
+        fp = datasets.fingerprint(d, max_order, singletons=True, indexed=True)
+
+        for metric in ["es", "fes", "sf"]:
+            # the results are cached under the keys of the metrics, however
+            # they were split, so reruns and the metrics themselves read them
+            cache_key = metric_key(METRICS[metric], fp, min_size=min_size)
+            if cache_key is not None:
+                value = cache.get(cache_key)
+                if value is not None:
+                    output.cached[d, metric] = value
+                    continue
+                output.cache_keys[d, metric] = cache_key
+
+            if metric == "es":
+                key = ("empirical", d, "es")
+                tasks.append(Task(key, _metric_task, handle, "es", cost=costs.sum()))
+                continue
+            # the other metrics add up over subsets of edges
+            for i, idx in enumerate(parts):
+                key = ("empirical", d, metric, i)
+                tasks.append(
+                    Task(key, _metric_task, handle, metric, idx, cost=costs[idx].sum())
+                )
+    return output
+
+
+class _EmpiricalOutput(_Output):
+    def __init__(self, names):
+        super().__init__("empirical")
+        self.names = names
+        self.cached = dict()
+        self.cache_keys = dict()
+
+    def files(self):
+        # the partial sums are added in the order of the parts, not in that
+        # in which they completed, so that the float sums are reproducible
+        partial = defaultdict(list)
+        for (d, metric, *_), value in sorted(self.results.items()):
+            partial[d, metric].append(value)
+
+        data = {d: dict() for d in self.names}
+        for (d, metric), values in sorted(partial.items()):
+            if any(v is None for v in values):
+                data[d][metric] = np.nan
+            elif metric == "es":
+                data[d][metric] = values[0]
+            elif metric == "sf":
+                ns, ps = np.sum(values, axis=0)
+                data[d][metric] = ns / ps if ps else np.nan
+            elif metric == "fes":
+                total, count = np.sum(values, axis=0)
+                data[d][metric] = 1 - (total / count if count else 0)
+            if (d, metric) in self.cache_keys and not any(v is None for v in values):
+                get_cache().set(self.cache_keys[d, metric], data[d][metric])
+
+        for (d, metric), value in self.cached.items():
+            data[d][metric] = value
+        data = {d: dict(sorted(data[d].items())) for d in self.names}
+        yield "empirical_simpliciality.json", data
+
+
+def _models_stage(datasets, names, args, tasks):
+    output = _ModelsOutput(names)
+    for d in names:
+        # the same log as that of model_fitting.py
+        checkpoint = Checkpoint(
+            os.path.join(args.output, f"model_simpliciality_{d}.jsonl")
+        )
+        output.checkpoints[d] = checkpoint
+        # every realization has its own stream, spawned from the seed of the run
+        entropy = checkpoint.seed((d, "seed"), args.seed)
+        output.entropy[d] = entropy
+        handle = datasets.get(d, max_order, singletons=False)
+        fname = os.path.join(args.output, f"DCSBM_parameters_{d}")
+        if os.path.exists(f"{fname}.npz") or os.path.exists(f"{fname}.json"):
+            dcsbm = load_dcsbm_parameters(f"{fname}.npz")
+        else:
+            print(f"No DCSBM parameters for {d}, skipping the DCSBM.", flush=True)
+            dcsbm = None
+
+        for model in MODELS:
+            if model == "DCSBM" and dcsbm is None:
+                continue
+            params = dcsbm if model == "DCSBM" else None
+            cost = edge_costs(attach_arrays(handle), min_size).sum()
+            if model == "CM":
+                cost += swap_cost * 10 * len(attach_arrays(handle)["edge_ids"])
+            for i in range(args.realizations):
+                if (d, model, i, entropy) in checkpoint:
+                    output.results[d, model, i] = checkpoint[d, model, i, entropy]
+                    continue
+                key = ("models", d, model, i)
+                seed = np.random.SeedSequence(
+                    entropy, spawn_key=(MODELS.index(model), i)
+                )
+                tasks.append(
+                    Task(key, _model_task, handle, model, seed, params, cost=cost)
+                )
+    return output
+
+
+class _ModelsOutput(_Output):
+    # logs every realization as soon as it finishes
+    def __init__(self, names):
+        super().__init__("models")
+        self.names = names
+        self.checkpoints = dict()
+        self.entropy = dict()
+
+    def collect(self, key, result):
+        super().collect(key, result)
+        if key[0] == self.stage and result is not None:
+            d = key[1]
+            self.checkpoints[d].add((*key[1:], self.entropy[d]), result)
+
+    def files(self):
+        for checkpoint in self.checkpoints.values():
+            checkpoint.close()
+
+        for d in self.names:
+            data = {model: dict() for model in MODELS}
+            for (name, model, i), values in sorted(self.results.items()):
+                if name != d:
+                    continue
+                if values is None:
+                    values = (np.nan,) * 3
+                for metric, value in zip(["sf", "es", "fes"], values):
+                    data[model].setdefault(metric, []).append(value)
+            data = {model: data[model] for model in MODELS if data[model]}
+            yield f"model_simpliciality_{d}.json", data
+
+
+def _assortativity_stage(datasets, names, args, tasks):
+    output = _AssortativityOutput(names)
+    cache = get_cache()
+    for d in names:
+        handle = datasets.get(d, assortativity_max_order, singletons=False)
+        output.handles[d] = handle
+        costs = node_costs(attach_arrays(handle), min_size)
+        fp = datasets.fingerprint(d, assortativity_max_order, singletons=False)
+        # the local measures of the nodes are independent
+        for metric in ["sf", "es", "fes"]:
+            # cached under the key of simplicial_assortativity, as in empirical
+            cache_key = metric_key(simplicial_assortativity, fp, metric)
+            if cache_key is not None:
+                value = cache.get(cache_key)
+                if value is not None:
+                    output.cached[d, metric] = value
+                    continue
+                output.cache_keys[d, metric] = cache_key
+
+            for i, idx in enumerate(_split(costs, args.processes)):
+                key = ("assortativity", d, metric, i)
+                output.nodes[key[1:]] = idx
+                cost = costs[idx].sum()
+                tasks.append(
+                    Task(key, _local_simpliciality_task, handle, metric, idx, cost=cost)
+                )
+    return output
+
+
+class _AssortativityOutput(_Output):
+    def __init__(self, names):
+        super().__init__("assortativity")
+        self.names = names
+        self.handles = dict()
+        self.nodes = dict()
+        self.cached = dict()
+        self.cache_keys = dict()
+
+    def files(self):
+        data = {d: dict() for d in self.names}
+        for d in self.names:
+            H = hypergraph_from_arrays(attach_arrays(self.handles[d]))
+            for metric in ["sf", "es", "fes"]:
+                if (d, metric) in self.cached:
+                    data[d][metric] = self.cached[d, metric]
+                    continue
+                s = np.full(H.num_nodes, np.nan)
+                failed = False
+                for key, idx in self.nodes.items():
+                    if key[:2] == (d, metric):
+                        values = self.results.get(key)
+                        if values is None:
+                            failed = True
+                        else:
+                            s[idx] = values
+                if failed:
+                    data[d][metric] = np.nan
+                else:
+                    data[d][metric] = assortativity(H, s)
+                    if (d, metric) in self.cache_keys:
+                        get_cache().set(self.cache_keys[d, metric], data[d][metric])
+        yield "empirical_simplicial_assortativity.json", data
+
+
+def _convergence_stage(datasets, names, args, tasks):
+    output = _ConvergenceOutput(names)
+    entropy = np.random.SeedSequence(args.seed).entropy
+    print(f"Seed of the convergence stage: {entropy}", flush=True)
+    for j, d in enumerate(names):
+        handle = datasets.get(d, max_order, singletons=False)
+        m = len(attach_arrays(handle)["edge_ids"])
+        max_log = np.log10(10 * m)
+        num_swaps = np.logspace(1, max_log, num_num_swaps).astype(int)
+        cost = edge_costs(attach_arrays(handle), min_size).sum()
+        for i, nswaps in enumerate(num_swaps):
+            key = ("convergence", d, int(nswaps))
+            seed = np.random.SeedSequence(entropy, spawn_key=(j, i))
+            tasks.append(
+                Task(
+                    key,
+                    _convergence_task,
+                    handle,
+                    int(nswaps),
+                    seed,
+                    cost=cost + swap_cost * nswaps,
+                )
+            )
+    return output
+
+
+class _ConvergenceOutput(_Output):
+    def __init__(self, names):
+        super().__init__("convergence")
+        self.names = names
+
+    def files(self):
+        data = {d: defaultdict(list) for d in self.names}
+        for (d, nswaps), values in sorted(self.results.items()):
+            if values is None:
+                values = (np.nan,) * 3
+            data[d]["num-swaps"].append(nswaps)
+            for metric, value in zip(["sf", "es", "fes"], values):
+                data[d][metric].append(value)
+        yield "cm_convergence.json", data
+
+
+_STAGES = {
+    "empirical": _empirical_stage,
+    "models": _models_stage,
+    "assortativity": _assortativity_stage,
+    "convergence": _convergence_stage,
+}
+
+
+def _split(costs, num_processes):
+    # enough parts that none is much more expensive than split_cost,
+    # but no more than there are workers
+    num_parts = int(np.clip(np.ceil(costs.sum() / split_cost), 1, num_processes))
+    return balanced_partition(costs, num_parts)
+
+
+def _instrumented_task(task, directory):
+    # each task dumps its counters and timers to a file named after its key
+    fname = os.path.join(directory, "_".join(map(str, task.key)) + ".json")
+    return Task(
+        task.key,
+        run_instrumented,
+        fname,
+        task.func,
+        *task.args,
+        cost=task.cost,
+        **task.kwargs,
+    )
+
+
+def _metric_task(handle, metric, idx=None):
+    # the global measures, or the partial counts or sums over the edges idx,
+    # from the shared face index and maximal faces
+    arrays = attach_arrays(handle)
+    index = FaceIndex(arrays["faces"])
+    if metric == "es":
+        return indexed_edit_simpliciality(
+            arrays, index, arrays["maximal"], min_size=min_size
+        )
+    elif metric == "sf":
+        return indexed_simplex_counts(arrays, index, min_size=min_size, edges=idx)
+    elif metric == "fes":
+        return indexed_face_edit_distance_sum(
+            arrays, index, arrays["maximal"], min_size=min_size, edges=idx
+        )
+
+
+def _local_simpliciality_task(handle, metric, idx):
+    # the local measures need the neighborhoods of the nodes, so a worker
+    # builds the hypergraph once and reuses it for its following tasks
+    H = attach_hypergraph(handle)
+    nodes = idx.tolist()
+    s = local_simpliciality(H, metric, nodes)
+    return [s[n] for n in nodes]
+
+
+def _model_task(handle, model, seed, dcsbm=None):
+    if model == "CM":
+        H = configuration_model(attach_hypergraph(handle), seed=seed)
+    elif model == "CL":
+        arrays = attach_arrays(handle)
+        n = len(arrays["node_ids"])
+        k = dict(enumerate(np.bincount(arrays["edge_members"], minlength=n).tolist()))
+        s = dict(enumerate(np.diff(arrays["edge_ptr"]).tolist()))
+        H = xgi.chung_lu_hypergraph(k, s, seed=seed)
+    elif model == "DCSBM":
+        H = xgi.dcsbm_hypergraph(*dcsbm, seed=seed)
+    return _simpliciality(H)
+
+
+def _convergence_task(handle, num_swaps, seed):
+    H = attach_hypergraph(handle)
+    return _simpliciality(configuration_model(H, num_swaps=num_swaps, seed=seed))
+
+
+def _simpliciality(H):
+    sf = simplicial_fraction(H, min_size=min_size)
+    es = edit_simpliciality(H, min_size=min_size)
+    fes = face_edit_simpliciality(H, min_size=min_size)
+    return sf, es, fes
@@ -0,0 +1,157 @@
+"""Storage of the parameters of the degree-corrected SBM.
+
+The parameters are stored in a NumPy NPZ file with the degree sequence "d",
+the size sequence "s", and the node and edge communities "g1" and "g2" as
+arrays indexed by the node and edge labels, and the community connection
+matrix "omega" as a dense array or, if it's mostly empty, as a sparse matrix
+in the COO format. The JSON files of earlier runs can still be read.
+"""
+
+import json
+import os
+
+import numpy as np
+
+_SEQUENCES = ["d", "s", "g1", "g2"]
+
+
+def save_dcsbm_parameters(fname, d, s, g1, g2, omega, sparse=None):
+    """Saves the parameters of the DCSBM to an NPZ file.
+
+    Parameters
+    ----------
+    fname : str
+        The NPZ file.
+    d : array-like or dict
+        The degree of each node, where the nodes are labeled 0 to n-1.
+    s : array-like or dict
+        The size of each edge, where the edges are labeled 0 to m-1.
+    g1 : array-like or dict
+        The community of each node.
+    g2 : array-like or dict
+        The community of each edge.
+    omega : array-like or scipy.sparse matrix
+        The number of incidences between each pair of node and edge
+        communities.
+    sparse : bool, optional
+        Whether to store `omega` as a sparse matrix. If None (default),
+        it is stored sparse when fewer than a quarter of its entries
+        are nonzero.
+
+    Raises
+    ------
+    ValueError
+        If the labels of a sequence aren't 0 to n-1.
+
+    See Also
+    --------
+    load_dcsbm_parameters
+    """
+    arrays = {key: _as_array(key, x) for key, x in zip(_SEQUENCES, [d, s, g1, g2])}
+
+    if hasattr(omega, "tocoo"):
+        omega = omega.tocoo()
+        row, col, data, shape = omega.row, omega.col, omega.data, omega.shape
+    else:
+        omega = np.asarray(omega)
+        row, col = np.nonzero(omega)
+        data, shape = omega[row, col], omega.shape
+
+    if sparse is None:
+        sparse = len(data) < 0.25 * np.prod(shape)
+    if sparse:
+        arrays["omega_row"] = row
+        arrays["omega_col"] = col
+        arrays["omega_data"] = data
+        arrays["omega_shape"] = np.array(shape)
+    else:
+        arrays["omega"] = np.zeros(shape, dtype=data.dtype)
+        arrays["omega"][row, col] = data
+
+    np.savez_compressed(fname, **arrays)
+
+
+def load_dcsbm_parameters(fname, save=True):
+    """Loads the parameters of the DCSBM.
+
+    Parameters
+    ----------
+    fname : str
+        The NPZ file. If it doesn't exist but a JSON file of the same name
+        does, the JSON file is imported instead.
+    save : bool, optional
+        Whether to save an imported JSON file to `fname` so that it is
+        only parsed once, by default True.
+
+    Returns
+    -------
+    tuple
+        The degree sequence, the size sequence, the node communities, and the
+        edge communities as dicts, and the dense community connection matrix,
+        in the order of the arguments of `xgi.dcsbm_hypergraph`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If neither file exists.
+
+    Examples
+    --------
+    >>> params = load_dcsbm_parameters("Data/DCSBM_parameters_email-enron.npz")  # doctest: +SKIP
+    >>> H = xgi.dcsbm_hypergraph(*params)  # doctest: +SKIP
+    """
+    root, ext = os.path.splitext(fname)
+    if ext == ".json" or not os.path.exists(fname):
+        arrays = _read_json(root + ".json")
+        if save:
+            save_dcsbm_parameters(root + ".npz", **arrays)
+    else:
+        with np.load(fname) as file:
+            arrays = dict(file)
+        if "omega" not in arrays:
+            omega = np.zeros(
+                arrays.pop("omega_shape"), dtype=arrays["omega_data"].dtype
+            )
+            omega[arrays.pop("omega_row"), arrays.pop("omega_col")] = arrays.pop(
+                "omega_data"
+            )
+            arrays["omega"] = omega
+
+    params = [dict(enumerate(np.asarray(arrays[key]).tolist())) for key in _SEQUENCES]
+    return (*params, np.asarray(arrays["omega"]))
+
+
+def convert_dcsbm_parameters(json_fname, npz_fname=None):
+    """Converts DCSBM parameters from the JSON to the NPZ format.
+
+    Parameters
+    ----------
+    json_fname : str
+        The JSON file, with the sequences as dicts and omega as nested lists.
+    npz_fname : str, optional
+        The NPZ file. By default, None, in which case it is the JSON file
+        with the extension replaced.
+    """
+    if npz_fname is None:
+        npz_fname = os.path.splitext(json_fname)[0] + ".npz"
+    save_dcsbm_parameters(npz_fname, **_read_json(json_fname))
+
+
+def _read_json(fname):
+    with open(fname, "r") as file:
+        j = json.loads(file.read())
+    arrays = {key: _as_array(key, j[key]) for key in _SEQUENCES}
+    arrays["omega"] = np.array(j["omega"])
+    return arrays
+
+
+def _as_array(key, x):
+    if not isinstance(x, dict):
+        return np.asarray(x)
+    labels = np.fromiter(map(int, x), dtype=np.int64, count=len(x))
+    values = np.fromiter(map(int, x.values()), dtype=np.int64, count=len(x))
+    a = np.full(len(x), -1, dtype=np.int64)
+    if len(x) and (labels.min() < 0 or labels.max() >= len(x)):
+        raise ValueError(f"The labels of {key} must be 0 to {len(x) - 1}!")
+    a[labels] = values
+    return a
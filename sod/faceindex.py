@@ -0,0 +1,447 @@
+"""Packed face keys and sorted face indices.
+
+A face of non-negative integer nodes is packed into a fixed-width key of
+`width` big-endian 64-bit words holding the sorted nodes shifted by one, and
+zero-padded on the right. Byte-wise comparison of two keys then agrees with
+lexicographic comparison of the sorted faces, so sorted arrays of keys can
+be searched with `numpy.searchsorted` and merged on disk.
+"""
+
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+
+def key_dtype(width):
+    """The NumPy dtype of a packed face key.
+
+    Parameters
+    ----------
+    width : int
+        The maximum face size that a key can hold.
+
+    Returns
+    -------
+    numpy.dtype
+        A void dtype of `8 * width` bytes.
+    """
+    return np.dtype((np.void, 8 * width))
+
+
+def pack_array(nodes, width):
+    """Packs a 2D array of faces of equal size into keys.
+
+    Parameters
+    ----------
+    nodes : numpy.ndarray
+        An (n, k) array of non-negative integers, one face per row.
+    width : int
+        The key width. Must be at least k.
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of n keys.
+
+    Raises
+    ------
+    ValueError
+        If the faces are larger than the key width or have negative nodes.
+    """
+    nodes = np.asarray(nodes)
+    if nodes.ndim != 2:
+        raise ValueError("The faces must be a 2D array!")
+    n, k = nodes.shape
+    if k > width:
+        raise ValueError(f"Faces of size {k} do not fit in keys of width {width}!")
+    if nodes.size and nodes.min() < 0:
+        raise ValueError("Nodes must be non-negative integers!")
+
+    words = np.zeros((n, width), dtype=">u8")
+    words[:, :k] = np.sort(nodes, axis=1) + 1
+    return words.view(key_dtype(width)).ravel()
+
+
+def pack_faces(faces, width):
+    """Packs faces of non-negative integer nodes into keys.
+
+    Parameters
+    ----------
+    faces : iterable of iterables
+        The faces to pack.
+    width : int
+        The key width. Must be at least the size of the largest face.
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of keys in the same order as `faces`.
+    """
+    faces = [tuple(f) for f in faces]
+    keys = np.zeros(len(faces), dtype=key_dtype(width))
+    sizes = np.fromiter(map(len, faces), dtype=int, count=len(faces))
+    for k in np.unique(sizes):
+        idx = np.flatnonzero(sizes == k)
+        block = np.array([faces[i] for i in idx], dtype=np.int64).reshape(len(idx), k)
+        keys[idx] = pack_array(block, width)
+    return keys
+
+
+def unpack_keys(keys):
+    """Unpacks keys into a 2D array of shifted nodes.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray
+        An array of packed keys.
+
+    Returns
+    -------
+    numpy.ndarray
+        An (n, width) array of nodes shifted by one with zeros as padding,
+        so that each row has as many non-zero entries as the size of its face.
+    """
+    width = keys.dtype.itemsize // 8
+    return np.ascontiguousarray(keys).view(">u8").reshape(len(keys), width)
+
+
+def unpack_faces(keys):
+    """Unpacks keys into faces.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray
+        An array of packed keys.
+
+    Returns
+    -------
+    list of tuples
+        The sorted faces.
+    """
+    return [tuple(int(n) - 1 for n in row if n) for row in unpack_keys(keys)]
+
+
+@lru_cache(maxsize=None)
+def subface_combinations(k, r):
+    """The column indices of all subsets of size r of a face of size k.
+
+    Parameters
+    ----------
+    k : int
+        The face size.
+    r : int
+        The subset size.
+
+    Returns
+    -------
+    numpy.ndarray
+        A (binom(k, r), r) array of column indices.
+    """
+    c = np.array(list(combinations(range(k), r)), dtype=np.intp)
+    return c.reshape(-1, r)
+
+
+def hash_keys(keys):
+    """Hashes packed keys to 64-bit integers.
+
+    The hash only depends on the face, so it can be used to route
+    keys to partitions consistently across processes and machines.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray
+        An array of packed keys.
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of unsigned 64-bit hashes.
+    """
+    words = unpack_keys(keys).astype(np.uint64)
+    h = np.zeros(len(keys), dtype=np.uint64)
+    for column in words.T:
+        h = _mix(h ^ column)
+    return h
+
+
+def _mix(x):
+    # the splitmix64 finalizer
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def face_blocks(keys, min_size=1, buffer_size=1000000):
+    """Streams packed keys as blocks of equal-sized faces.
+
+    The blocks are small enough that all the subfaces of their faces
+    fit in a buffer of `buffer_size` keys.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray
+        An array of packed keys, possibly memory-mapped.
+    min_size : int, optional
+        Faces smaller than this are skipped, by default 1.
+    buffer_size : int, optional
+        The maximum number of subfaces of a block, by default 1000000.
+
+    Yields
+    ------
+    numpy.ndarray
+        An (n, k) array of the integer nodes of n faces of size k.
+    """
+    width = keys.dtype.itemsize // 8
+    block = max(1, buffer_size // 2**width)
+    for start in range(0, len(keys), block):
+        words = unpack_keys(np.asarray(keys[start : start + block]))
+        sizes = (words != 0).sum(axis=1)
+        for k in np.unique(sizes):
+            if k < min_size:
+                continue
+            nodes = words[sizes == k, :k].astype(np.int64) - 1
+            step = max(1, buffer_size // 2**k)
+            for i in range(0, len(nodes), step):
+                yield nodes[i : i + step]
+
+
+class FaceIndex:
+    """A sorted array of unique packed face keys.
+
+    The keys can live in memory or in a memory-mapped file, so that
+    an index larger than the available memory can still be searched.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray
+        A sorted array of unique keys.
+    """
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.width = keys.dtype.itemsize // 8
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def from_faces(cls, faces, width):
+        """Builds an index from faces of non-negative integer nodes.
+
+        Parameters
+        ----------
+        faces : iterable of iterables
+            The faces to index. Duplicates are removed.
+        width : int
+            The key width.
+
+        Returns
+        -------
+        FaceIndex
+            The index of the faces.
+        """
+        return cls(np.unique(pack_faces(faces, width)))
+
+    @classmethod
+    def from_runs(cls, runs, path):
+        """Builds a memory-mapped index by merging sorted runs on disk.
+
+        Parameters
+        ----------
+        runs : KeyRuns
+            The sorted runs of keys.
+        path : str
+            The file in which to store the index.
+
+        Returns
+        -------
+        FaceIndex
+            The index of the unique keys in the runs.
+        """
+        n = runs.merge(path)
+        if n == 0:
+            return cls(np.zeros(0, dtype=runs.dtype))
+        return cls(np.memmap(path, dtype=runs.dtype, mode="r", shape=(n,)))
+
+    def contains(self, keys):
+        """Vectorized membership test.
+
+        Parameters
+        ----------
+        keys : numpy.ndarray
+            An array of keys of the same width as the index.
+
+        Returns
+        -------
+        numpy.ndarray
+            A boolean array which is True where the key is in the index.
+        """
+        if len(self.keys) == 0:
+            return np.zeros(len(keys), dtype=bool)
+        idx = np.searchsorted(self.keys, keys)
+        idx[idx == len(self.keys)] = 0
+        return self.keys[idx] == keys
+
+    def search(self, face):
+        """Whether a single face is in the index.
+
+        Parameters
+        ----------
+        face : iterable
+            The face of interest.
+
+        Returns
+        -------
+        bool
+            Whether the face is in the index.
+        """
+        face = tuple(face)
+        if len(face) > self.width:
+            return False
+        return bool(self.contains(pack_faces([face], self.width))[0])
+
+    def subfaces(self, nodes, min_size=1):
+        """Looks up the proper subfaces of equal-sized faces.
+
+        Parameters
+        ----------
+        nodes : numpy.ndarray
+            An (n, k) array of the integer nodes of n faces of size k.
+        min_size : int, optional
+            The minimum subface size, by default 1.
+
+        Yields
+        ------
+        present : numpy.ndarray
+            For each subface size r from `min_size` to k - 1, an
+            (n, binom(k, r)) boolean array which is True where
+            the subface of a face is in the index.
+        keys : numpy.ndarray
+            The flattened keys of these subfaces.
+        """
+        n, k = nodes.shape
+        for r in range(min_size, k):
+            sub = nodes[:, subface_combinations(k, r)].reshape(-1, r)
+            keys = pack_array(sub, self.width)
+            yield self.contains(keys).reshape(n, -1), keys
+
+
+class KeyRuns:
+    """Sorted runs of packed keys spilled to disk.
+
+    Keys are buffered in memory and written to disk as a sorted, deduplicated
+    run each time the buffer is full. The runs are then merged block by block,
+    so that no more than `buffer_size` keys are held in memory at once.
+
+    Parameters
+    ----------
+    width : int
+        The key width.
+    directory : str, optional
+        The directory in which to create the runs. If None (default),
+        the system's temporary directory is used.
+    buffer_size : int, optional
+        The maximum number of keys held in memory, by default 1000000.
+    """
+
+    def __init__(self, width, directory=None, buffer_size=1000000):
+        self.dtype = key_dtype(width)
+        self.dir = tempfile.mkdtemp(prefix="sod-runs-", dir=directory)
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered = 0
+        self.paths = []
+
+    def add(self, keys):
+        """Adds keys, writing a new run if the buffer is full.
+
+        Parameters
+        ----------
+        keys : numpy.ndarray
+            The keys to add.
+        """
+        if len(keys) == 0:
+            return
+        self.buffer.append(np.asarray(keys))
+        self.buffered += len(keys)
+        if self.buffered >= self.buffer_size:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        keys = np.unique(np.concatenate(self.buffer))
+        path = os.path.join(self.dir, f"run{len(self.paths)}.npy")
+        np.save(path, keys)
+        self.paths.append(path)
+        self.buffer = []
+        self.buffered = 0
+
+    def merge(self, path=None):
+        """Merges the runs into a single sorted array of unique keys.
+
+        Parameters
+        ----------
+        path : str, optional
+            The file to which to write the raw merged keys. If None (default),
+            the unique keys are only counted.
+
+        Returns
+        -------
+        int
+            The number of unique keys.
+        """
+        self._flush()
+        runs = [np.load(p, mmap_mode="r") for p in self.paths]
+        pos = [0] * len(runs)
+        block_size = max(1, self.buffer_size // max(1, len(runs)))
+
+        count = 0
+        last = None
+        file = open(path, "wb") if path is not None else None
+        try:
+            while True:
+                active = [i for i, r in enumerate(runs) if pos[i] < len(r)]
+                if not active:
+                    break
+                blocks = {i: runs[i][pos[i] : pos[i] + block_size] for i in active}
+
+                # every key up to the smallest block end is in one of the blocks
+                bound = np.sort(np.array([b[-1] for b in blocks.values()]))[:1]
+                taken = []
+                for i, b in blocks.items():
+                    n = int(np.searchsorted(b, bound, side="right")[0])
+                    taken.append(b[:n])
+                    pos[i] += n
+
+                merged = np.unique(np.concatenate(taken))
+                if last is not None and len(merged) and merged[0] == last:
+                    merged = merged[1:]
+                if len(merged):
+                    last = merged[-1]
+                    count += len(merged)
+                    if file is not None:
+                        file.write(merged.tobytes())
+        finally:
+            if file is not None:
+                file.close()
+        return count
+
+    def close(self):
+        """Deletes the runs."""
+        self.buffer = []
+        self.buffered = 0
+        self.paths = []
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
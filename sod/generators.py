@@ -1,5 +1,4 @@
 import logging
-import random
 from collections import defaultdict
 
 import numpy as np
@@ -7,7 +6,7 @@ from xgi import Hypergraph
 from xgi.exception import XGIError
 
 
-def configuration_model(d, s=None, num_swaps=None):
+def configuration_model(d, s=None, num_swaps=None, seed=None):
     """Generate hypergraph configuration null model
 
     Parameters
@@ -20,27 +19,46 @@ def configuration_model(d, s=None, num_swaps=None):
         Otherwise it's ignored. By default, None.
     num_swaps : int, optional
         The number of proposed edge swaps, by default 1000
+    seed : int, numpy.random.SeedSequence, or numpy.random.Generator, optional
+        The seed for the random number generator. By default, None.
 
     Returns
     -------
     Hypergraph
         The reshuffled hypergraph
+
+    Notes
+    -----
+    For a given seed, the output is reproducible across processes whatever
+    the types of the IDs: nodes and edges are sorted before they are drawn,
+    since the order of sets of strings depends on `PYTHONHASHSEED`.
     """
+    rng = np.random.default_rng(seed)
+
     if isinstance(d, Hypergraph):
         H_CM = d.copy()
     elif isinstance(d, dict) and isinstance(s, dict):
-        H_CM = _initialize_hypergraph(d, s)
+        H_CM = _initialize_hypergraph(d, s, rng)
     else:
         raise XGIError("Invalid input!")
 
     if num_swaps is None:
         num_swaps = 10 * H_CM.num_edges
 
+    # swaps keep the edge IDs, so list them once
+    edges = list(H_CM.edges)
+    m = len(edges)
+
     swaps = 0
     while swaps < num_swaps:
-        k, l = random.sample(list(H_CM.edges), 2)
-        i = random.choice(list(H_CM.edges.members(k)))
-        j = random.choice(list(H_CM.edges.members(l)))
+        # two distinct edges chosen uniformly at random
+        a = rng.integers(m)
+        b = rng.integers(m - 1)
+        if b >= a:
+            b += 1
+        k, l = edges[a], edges[b]
+        i = _random_member(H_CM.edges.members(k), rng)
+        j = _random_member(H_CM.edges.members(l), rng)
         try:
             H_CM.double_edge_swap(i, j, k, l)
         except:
@@ -50,8 +68,22 @@ def configuration_model(d, s=None, num_swaps=None):
     return H_CM
 
 
-def _initialize_hypergraph(d, s):
+def _random_member(e, rng):
+    e = _sorted(e)
+    return e[rng.integers(len(e))]
+
+
+def _sorted(ids):
+    # a stable order of IDs, even of mixed types
+    try:
+        return sorted(ids)
+    except TypeError:
+        return sorted(ids, key=repr)
+
+
+def _initialize_hypergraph(d, s, rng=None):
     # A Principled, Flexible and Efficient Framework for Hypergraph Benchmarking https://arxiv.org/abs/2212.08593
+    rng = np.random.default_rng(rng)
     H = Hypergraph()
 
     nwd = defaultdict(set)
@@ -68,17 +100,19 @@ def _initialize_hypergraph(d, s):
 
     for size in edges_of_size:
         eos = edges_of_size[size]
-        for id in eos:
-            e = _extract_hyperedge(size, nodes_with_degree)
+        for id in _sorted(eos):
+            e = _extract_hyperedge(size, nodes_with_degree, rng)
             if len(e) > 0:
                 H.add_edge(e, id=id)
     return H
 
 
-def _extract_hyperedge(size, nodes_with_degree):
+def _extract_hyperedge(size, nodes_with_degree, rng=None):
     if size < 1:
         raise ValueError(f"Invalid size: {size}")
 
+    rng = np.random.default_rng(rng)
+
     nodes_chosen = dict()
     n_nodes_sampled = 0
     degrees = iter(
@@ -94,8 +128,8 @@ def _extract_hyperedge(size, nodes_with_degree):
             )
 
             nodes_chosen[0] = set(
-                np.random.choice(
-                    list(nodes_with_degree[0]),
+                rng.choice(
+                    _sorted(nodes_with_degree[0]),
                     size=size - n_nodes_sampled,
                     replace=False,
                 )
@@ -106,8 +140,8 @@ def _extract_hyperedge(size, nodes_with_degree):
         n_nodes_to_sample = min(len(nodes_with_degree[deg]), size - n_nodes_sampled)
 
         nodes_chosen[deg] = set(
-            np.random.choice(
-                list(nodes_with_degree[deg]),
+            rng.choice(
+                _sorted(nodes_with_degree[deg]),
                 size=n_nodes_to_sample,
                 replace=False,
             )
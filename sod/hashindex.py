@@ -0,0 +1,219 @@
+"""Hashed face lookups with Gray-code subset enumeration.
+
+Each node gets a random 64-bit Zobrist key and a face hashes to the XOR of
+the keys of its nodes. Walking the subsets of a face in Gray-code order
+flips a single node in or out at each step, so the hash of the next subset
+is one XOR away from the previous one and no subset is ever materialized.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+class ZobristHasher:
+    """Assigns random 64-bit keys to nodes and hashes faces.
+
+    Parameters
+    ----------
+    seed : int or numpy.random.Generator, optional
+        The seed for the node keys, by default None.
+
+    Notes
+    -----
+    Two distinct faces collide with probability :math:`2^{-64}`, so with
+    :math:`N` faces, a false positive is expected with probability about
+    :math:`N^2 2^{-65}`, which is negligible for any realistic dataset.
+    """
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.keys = dict()
+
+    def __getitem__(self, node):
+        try:
+            return self.keys[node]
+        except KeyError:
+            key = int(self.rng.integers(2**64, dtype=np.uint64))
+            self.keys[node] = key
+            return key
+
+    def hash(self, face):
+        """The Zobrist hash of a face.
+
+        Parameters
+        ----------
+        face : iterable
+            The face of interest.
+
+        Returns
+        -------
+        int
+            The XOR of the keys of the nodes of the face.
+        """
+        h = 0
+        for n in face:
+            h ^= self[n]
+        return h
+
+
+class HashIndex:
+    """A set of Zobrist hashes of faces.
+
+    Parameters
+    ----------
+    hasher : ZobristHasher, optional
+        The hasher to use. If None (default), a new one is created.
+    """
+
+    def __init__(self, hasher=None):
+        self.hasher = ZobristHasher() if hasher is None else hasher
+        self.hashes = set()
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def build_index(self, faces):
+        for face in faces:
+            self.insert(face)
+
+    def insert(self, face):
+        self.hashes.add(self.hasher.hash(face))
+
+    def search(self, face):
+        return self.hasher.hash(face) in self.hashes
+
+
+def gray_code_subsets(face, hasher, min_size=1, max_size=None):
+    """Enumerates the subsets of a face in Gray-code order.
+
+    Consecutive subsets differ by a single node, so the hash of each
+    subset is computed from the previous one with a single XOR.
+
+    Parameters
+    ----------
+    face : iterable
+        The face whose subsets to enumerate, with at most 64 nodes.
+    hasher : ZobristHasher
+        The hasher of the nodes.
+    min_size : int, optional
+        The minimum subset size, by default 1.
+    max_size : int, optional
+        The maximum subset size. If None (default), the face itself
+        is included.
+
+    Yields
+    ------
+    mask : int
+        The bit mask of the members of the subset, where bit i stands
+        for the i-th node of `face`.
+    hash : int
+        The Zobrist hash of the subset.
+
+    Raises
+    ------
+    ValueError
+        If the face has more than 64 nodes.
+    """
+    z = _node_keys(face, hasher)
+    k = len(z)
+    if max_size is None:
+        max_size = k
+
+    h = 0
+    if min_size <= 0 <= max_size:
+        yield 0, h
+    for b, size, mask in _gray_steps(k):
+        h ^= z[b]
+        if min_size <= size <= max_size:
+            yield mask, h
+
+
+def count_missing_subfaces_hashed(index, face, min_size=1):
+    """Computing the edit distance for a single face with a hash index.
+
+    This is the hashed counterpart of `count_missing_subfaces`.
+
+    Parameters
+    ----------
+    index : HashIndex
+        The hash index representing the hypergraph
+    face : iterable
+        The edge for which to find the edit distance
+    min_size: int, default: 1
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces.
+
+    Returns
+    -------
+    int
+        The edit distance
+    """
+    z = _node_keys(face, index.hasher)
+    k = len(z)
+    hashes = index.hashes
+
+    count = 0
+    h = 0
+    for b, size, _ in _gray_steps(k):
+        h ^= z[b]
+        if h not in hashes and min_size <= size < k:
+            count += 1
+    return count
+
+
+def is_simplex_hashed(index, face, min_size=2):
+    """Whether a face is a simplex, checked with a hash index.
+
+    This is the hashed counterpart of `is_simplex`.
+
+    Parameters
+    ----------
+    index : HashIndex
+        The hash index representing the hypergraph
+    face : iterable
+        The edge of interest
+    min_size: int, default: 2
+        The minimum subface size to check.
+
+    Returns
+    -------
+    bool
+        Whether all the subfaces of the face, including the face itself,
+        are in the index.
+    """
+    hashes = index.hashes
+    for _, h in gray_code_subsets(face, index.hasher, min_size=min_size):
+        if h not in hashes:
+            return False
+    return True
+
+
+def _gray_steps(k):
+    # The i-th step of the Gray code flips the lowest set bit of i and
+    # lands on the subset with mask i ^ (i >> 1).
+    if k <= _MAX_CACHED_SIZE:
+        return _cached_gray_steps(k)
+    return _iter_gray_steps(k)
+
+
+_MAX_CACHED_SIZE = 16
+
+
+@lru_cache(maxsize=None)
+def _cached_gray_steps(k):
+    return tuple(_iter_gray_steps(k))
+
+
+def _iter_gray_steps(k):
+    for i in range(1, 1 << k):
+        mask = i ^ (i >> 1)
+        yield (i & -i).bit_length() - 1, mask.bit_count(), mask
+
+
+def _node_keys(face, hasher):
+    z = [hasher[n] for n in face]
+    if len(z) > 64:
+        raise ValueError("Faces with more than 64 nodes are not supported!")
+    return z
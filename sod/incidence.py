@@ -0,0 +1,199 @@
+import numpy as np
+import xgi
+
+from .faceindex import FaceIndex, pack_array
+from .sharedmem import attach_arrays
+
+# the hypergraph last attached by this process
+_attached = (None, None)
+
+
+def incidence_arrays(H):
+    """Converts a hypergraph to flat incidence arrays.
+
+    Parameters
+    ----------
+    H : xgi.Hypergraph
+        The hypergraph of interest
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        "node_ids" and "edge_ids" hold the node and edge IDs, and the members
+        of edge i are the node indices `edge_members[edge_ptr[i]:edge_ptr[i + 1]]`.
+        IDs of mixed types are kept as Python objects rather than cast to a
+        common type.
+
+    See Also
+    --------
+    unlabeled_arrays
+    """
+    node_ids = list(H.nodes)
+    node_index = {n: i for i, n in enumerate(node_ids)}
+    members = H.edges.members()
+
+    sizes = np.fromiter(map(len, members), dtype=np.int64, count=len(members))
+    edge_ptr = np.zeros(len(members) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=edge_ptr[1:])
+    edge_members = np.fromiter(
+        (node_index[n] for e in members for n in e),
+        dtype=np.int64,
+        count=int(edge_ptr[-1]),
+    )
+    return {
+        "node_ids": _id_array(node_ids),
+        "edge_ids": _id_array(list(H.edges)),
+        "edge_ptr": edge_ptr,
+        "edge_members": edge_members,
+    }
+
+
+def unlabeled_arrays(arrays):
+    """The incidence arrays with the nodes and edges labeled by their indices.
+
+    The measures only depend on the structure of a hypergraph, so workers
+    don't need the IDs, which may be Python objects that can't be published
+    with `publish_arrays`. The IDs stay with the caller, which maps the
+    indices back to them.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The incidence arrays, as returned by `incidence_arrays`.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        The incidence arrays with `node_ids` and `edge_ids` replaced
+        by 0 to n-1 and 0 to m-1.
+    """
+    return {
+        "node_ids": np.arange(len(arrays["node_ids"])),
+        "edge_ids": np.arange(len(arrays["edge_ptr"]) - 1),
+        "edge_ptr": arrays["edge_ptr"],
+        "edge_members": arrays["edge_members"],
+    }
+
+
+def hypergraph_from_arrays(arrays):
+    """Builds a hypergraph from flat incidence arrays.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The incidence arrays, as returned by `incidence_arrays`.
+
+    Returns
+    -------
+    xgi.Hypergraph
+        The hypergraph, including isolated nodes.
+    """
+    node_ids = arrays["node_ids"].tolist()
+    edge_ids = arrays["edge_ids"].tolist()
+    edge_ptr = arrays["edge_ptr"]
+    edge_members = arrays["edge_members"]
+
+    H = xgi.Hypergraph()
+    H.add_nodes_from(node_ids)
+    H.add_edges_from(
+        {
+            id: [node_ids[i] for i in edge_members[edge_ptr[j] : edge_ptr[j + 1]]]
+            for j, id in enumerate(edge_ids)
+        }
+    )
+    return H
+
+
+def attach_hypergraph(handle):
+    """Attaches to published incidence arrays as a hypergraph.
+
+    The hypergraph is built the first time and reused by the following calls
+    with the same handle, so that the tasks of a worker that need a Hypergraph,
+    such as those of the local measures or the null models, don't each rebuild
+    it. Only the last hypergraph is kept.
+
+    Parameters
+    ----------
+    handle : dict
+        The handle returned by `publish_arrays` for incidence arrays.
+
+    Returns
+    -------
+    xgi.Hypergraph
+        The hypergraph. It is shared by the calls, so it must not be modified.
+    """
+    global _attached
+    key = handle.get("name", handle.get("path"))
+    if _attached[0] != key:
+        _attached = (None, None)
+        _attached = (key, hypergraph_from_arrays(attach_arrays(handle)))
+    return _attached[1]
+
+
+def to_bipartite_edgelist(H):
+    """The bipartite edge list of a hypergraph.
+
+    Node i and edge j of the incidence arrays are the vertices i and
+    n + j of the bipartite graph, where n is the number of nodes.
+
+    Parameters
+    ----------
+    H : xgi.Hypergraph or dict of numpy.ndarray
+        The hypergraph of interest or its incidence arrays, as returned
+        by `incidence_arrays`.
+
+    Returns
+    -------
+    numpy.ndarray
+        An array with a row for each node-edge incidence, sorted by node.
+    """
+    arrays = incidence_arrays(H) if isinstance(H, xgi.Hypergraph) else H
+    edge_ptr = arrays["edge_ptr"]
+    nodes = arrays["edge_members"]
+    edges = np.repeat(np.arange(len(edge_ptr) - 1), np.diff(edge_ptr))
+
+    order = np.argsort(nodes, kind="stable")
+    n = len(arrays["node_ids"])
+    return np.column_stack([nodes[order], edges[order] + n]).astype(np.int_)
+
+
+def face_index(arrays, min_size=1):
+    """Builds the face index of the edges in flat incidence arrays.
+
+    The faces are stored with the node indices of the incidence arrays
+    rather than the node IDs.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The incidence arrays, as returned by `incidence_arrays`.
+    min_size : int, optional
+        Edges smaller than this are not indexed, by default 1.
+
+    Returns
+    -------
+    FaceIndex
+        The index of the unique edges.
+    """
+    edge_ptr = arrays["edge_ptr"]
+    edge_members = arrays["edge_members"]
+    sizes = np.diff(edge_ptr)
+    width = max(1, int(sizes.max(initial=0)))
+
+    keys = []
+    for k in np.unique(sizes):
+        if k < min_size:
+            continue
+        starts = edge_ptr[:-1][sizes == k]
+        nodes = edge_members[starts[:, None] + np.arange(k)]
+        keys.append(pack_array(nodes, width))
+    if not keys:
+        return FaceIndex(pack_array(np.zeros((0, 1), dtype=np.int64), width))
+    return FaceIndex(np.unique(np.concatenate(keys)))
+
+
+def _id_array(ids):
+    # numpy casts IDs of mixed types, such as integers and strings, to strings
+    if len({type(i) for i in ids}) > 1:
+        return np.fromiter(ids, dtype=object, count=len(ids))
+    return np.array(ids)
@@ -0,0 +1,216 @@
+"""Opt-in counters and timers of the phases of the metrics.
+
+When a metric is slow, the counters and timers tell whether the time goes into
+filtering the edges, finding the maximal faces, building the trie, enumerating
+the subfaces, or looking them up. Instrumentation is disabled by default, in
+which case `phase` returns a shared null context, and the hot loops only check
+whether it is enabled once per face, not once per lookup.
+
+The phases are
+
+* "filterby": selecting the edges of at least the minimum size.
+* "maximal": finding the maximal faces.
+* "trie.build": building the trie of the edges.
+* "simplices", "subfaces": the main loop of a metric.
+
+and the counters are
+
+* "trie.nodes": the nodes created in tries.
+* "trie.lookups", "trie.hits": the searches of tries and those that found
+  the edge.
+* "subsets": the subfaces enumerated.
+* "maximal_faces": the maximal faces whose subfaces are enumerated.
+* "neighbor_intersections": the intersections of neighboring maximal faces
+  in `simplicial_edit_distance`.
+* "cache.hits", "cache.misses": the calls of cached metrics, when the result
+  cache is enabled. A hit records nothing else.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+_active = None
+_NULL = nullcontext()
+
+
+class Instrumentation:
+    """Counters and phase timers.
+
+    Attributes
+    ----------
+    counters : dict
+        The value of each counter.
+    timers : dict
+        The total time in seconds and the number of calls of each phase.
+        Nested phases are timed separately, so their times overlap.
+    """
+
+    def __init__(self):
+        self.counters = dict()
+        self.timers = dict()
+
+    def count(self, name, n=1):
+        """Increments a counter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        n : int, optional
+            The increment, by default 1.
+        """
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def phase(self, name):
+        """Times a phase inside a `with` block.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timer = self.timers.setdefault(name, [0.0, 0])
+            timer[0] += time.perf_counter() - start
+            timer[1] += 1
+
+    def to_dict(self):
+        """The counters and timers.
+
+        Returns
+        -------
+        dict
+            The counters and, for each phase, its total time in seconds
+            and number of calls, sorted by name.
+        """
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "timers": {
+                name: {"seconds": seconds, "calls": calls}
+                for name, (seconds, calls) in sorted(self.timers.items())
+            },
+        }
+
+    def dump(self, fname, **metadata):
+        """Writes the counters and timers to a JSON file.
+
+        Parameters
+        ----------
+        fname : str
+            The JSON file. Its directory is created if it doesn't exist.
+        **metadata
+            JSON-serializable values to write along with them, such as the
+            key of the task.
+        """
+        os.makedirs(os.path.dirname(fname) or ".", exist_ok=True)
+        with open(fname, "w") as file:
+            file.write(json.dumps(dict(metadata, **self.to_dict()), indent=2))
+
+    def reset(self):
+        """Zeroes the counters and timers."""
+        self.counters.clear()
+        self.timers.clear()
+
+
+def enable_instrumentation():
+    """Turns on instrumentation for this process.
+
+    Returns
+    -------
+    Instrumentation
+        The new, empty counters and timers.
+    """
+    global _active
+    _active = Instrumentation()
+    return _active
+
+
+def disable_instrumentation():
+    """Turns off instrumentation."""
+    global _active
+    _active = None
+
+
+def get_instrumentation():
+    """The active counters and timers.
+
+    Returns
+    -------
+    Instrumentation or None
+        The counters and timers, or None if instrumentation is disabled.
+    """
+    return _active
+
+
+@contextmanager
+def instrumented():
+    """Records new counters and timers inside a `with` block.
+
+    The instrumentation that was active before, if any, is restored
+    afterwards.
+
+    Examples
+    --------
+    >>> with instrumented() as rec:  # doctest: +SKIP
+    ...     edit_simpliciality(H)
+    >>> rec.counters["trie.lookups"]  # doctest: +SKIP
+    """
+    global _active
+    previous = _active
+    _active = Instrumentation()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def phase(name):
+    """Times a phase inside a `with` block, if instrumentation is enabled.
+
+    Parameters
+    ----------
+    name : str
+        The name of the phase.
+
+    Returns
+    -------
+    context manager
+        The timer, or a null context if instrumentation is disabled.
+    """
+    if _active is None:
+        return _NULL
+    return _active.phase(name)
+
+
+def run_instrumented(fname, func, *args, **kwargs):
+    """Calls a function and dumps its counters and timers.
+
+    It is picklable, so it can wrap the function of a `Task`.
+
+    Parameters
+    ----------
+    fname : str
+        The JSON file of the counters and timers.
+    func : callable
+        The function.
+    *args
+        The positional arguments of the function.
+    **kwargs
+        The keyword arguments of the function.
+
+    Returns
+    -------
+    The return value of the function.
+    """
+    with instrumented() as rec:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    rec.dump(fname, function=func.__qualname__, seconds=elapsed, pid=os.getpid())
+    return result
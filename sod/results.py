@@ -0,0 +1,462 @@
+"""A columnar store of the measures of simpliciality of a study.
+
+Every row is one value of a metric for a dataset, a model, a realization, and
+a parameter, such as the number of double-edge swaps. Each column is a binary
+file of fixed-width values that is memory-mapped when read and appended to
+when written, and the strings of the dataset, model, and metric columns are
+stored as integer codes. Loading all the results of a study, or selecting a
+subset of them, is therefore a single bulk read instead of parsing many nested
+JSON files.
+
+The scripts still write their results to JSON files, and `sync_results`
+rebuilds the store from them whenever one of them changed.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from functools import partial
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_FORMAT_VERSION = 1
+_COLUMNS = {
+    "dataset": np.int32,
+    "model": np.int32,
+    "metric": np.int32,
+    "realization": np.int64,
+    "param": np.float64,
+    "value": np.float64,
+}
+_CATEGORICAL = ["dataset", "model", "metric"]
+# the model of the convergence of the configuration model, whose parameter
+# is the number of double-edge swaps, as opposed to the realizations of "CM"
+CONVERGENCE_MODEL = "CM-convergence"
+
+
+class ResultsStore:
+    """An append-only table of results in columnar files.
+
+    The columns are
+
+    * "dataset", "model", "metric": strings, stored as integer codes.
+    * "realization": the index of the realization of the model.
+    * "param": a parameter of the model, NaN if it has none.
+    * "value": the value of the metric.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the store. It is created if it doesn't exist.
+        Rows left incomplete by a crash mid-append are discarded.
+
+    Examples
+    --------
+    >>> results = ResultsStore("Data/results")  # doctest: +SKIP
+    >>> results.append("email-enron", "CM", "sf", [0.1, 0.2])  # doctest: +SKIP
+    >>> results.query(dataset="email-enron", metric="sf")["value"]  # doctest: +SKIP
+    array([0.1, 0.2])
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        os.makedirs(self.path, exist_ok=True)
+        self._load()
+
+    def __len__(self):
+        return self._len
+
+    def append(self, dataset, model, metric, value, realization=None, param=np.nan):
+        """Appends rows to the store.
+
+        The arguments are broadcast against each other, so, for example, the
+        values of all the realizations of a model can be appended at once.
+
+        Parameters
+        ----------
+        dataset : str or array-like of str
+            The dataset.
+        model : str or array-like of str
+            The model, for example, "CM", or "empirical" for the dataset itself.
+        metric : str or array-like of str
+            The metric, for example, "sf".
+        value : float or array-like of float
+            The values. None is stored as NaN.
+        realization : int or array-like of int, optional
+            The realizations. If None (default), the values are numbered
+            from 0.
+        param : float or array-like of float, optional
+            The parameter of the model, by default NaN.
+        """
+        value = np.asarray(value, dtype=np.float64)
+        if realization is None:
+            realization = np.arange(value.size).reshape(value.shape)
+
+        columns = dict(
+            dataset=self._encode("dataset", dataset),
+            model=self._encode("model", model),
+            metric=self._encode("metric", metric),
+            realization=np.asarray(realization),
+            param=np.asarray(param, dtype=np.float64),
+            value=value,
+        )
+        columns = dict(zip(columns, np.broadcast_arrays(*columns.values())))
+
+        # the new categories must be saved before the rows that use them
+        self._save_schema()
+        for col, dtype in _COLUMNS.items():
+            a = np.ascontiguousarray(columns[col].ravel(), dtype=dtype)
+            with open(self._column_path(col), "ab") as file:
+                file.write(a.tobytes())
+        self._len += columns["value"].size
+
+    def column(self, col):
+        """A column of the store, memory-mapped.
+
+        Parameters
+        ----------
+        col : str
+            The name of the column. The categorical columns are returned
+            as their integer codes.
+
+        Returns
+        -------
+        numpy.ndarray
+            The read-only column.
+        """
+        if self._len == 0:
+            return np.empty(0, dtype=_COLUMNS[col])
+        return np.memmap(
+            self._column_path(col), dtype=_COLUMNS[col], mode="r", shape=(self._len,)
+        )
+
+    def query(
+        self,
+        dataset=None,
+        model=None,
+        metric=None,
+        realization=None,
+        param=None,
+        columns=None,
+    ):
+        """Selects rows of the store.
+
+        Each filter is a value or a list of values, and None, the default,
+        selects all of them. NaN selects the rows without a parameter.
+
+        Parameters
+        ----------
+        dataset : str or list of str, optional
+            The datasets to select.
+        model : str or list of str, optional
+            The models to select.
+        metric : str or list of str, optional
+            The metrics to select.
+        realization : int or list of int, optional
+            The realizations to select.
+        param : float or list of float, optional
+            The parameters to select, where NaN stands for no parameter.
+        columns : list of str, optional
+            The columns to return, by default all of them.
+
+        Returns
+        -------
+        dict of numpy.ndarray
+            The selected rows of each column, in the order they were
+            appended. The categorical columns are decoded to strings.
+        """
+        if columns is None:
+            columns = list(_COLUMNS)
+
+        mask = np.ones(self._len, dtype=bool)
+        filters = dict(
+            dataset=dataset,
+            model=model,
+            metric=metric,
+            realization=realization,
+            param=param,
+        )
+        for col, values in filters.items():
+            if values is None:
+                continue
+            values = np.atleast_1d(values)
+            if col in _CATEGORICAL:
+                codes = self._codes[col]
+                values = [codes[v] for v in values.tolist() if v in codes]
+                mask &= np.isin(self.column(col), values)
+            elif col == "param" and np.isnan(values).any():
+                # NaN never equals itself, so it's matched separately
+                column = self.column(col)
+                mask &= np.isin(column, values) | np.isnan(column)
+            else:
+                mask &= np.isin(self.column(col), values)
+
+        idx = np.flatnonzero(mask)
+        result = dict()
+        for col in columns:
+            a = self.column(col)[idx]
+            if col in _CATEGORICAL:
+                a = np.array(self.categories[col], dtype=str)[a]
+            result[col] = np.asarray(a)
+        return result
+
+    def _load(self):
+        self.categories = {col: [] for col in _CATEGORICAL}
+        if os.path.exists(self._schema_path):
+            with open(self._schema_path) as file:
+                self.categories.update(json.loads(file.read())["categories"])
+        self._codes = {
+            col: {c: i for i, c in enumerate(cats)}
+            for col, cats in self.categories.items()
+        }
+
+        sizes = {
+            col: (
+                os.path.getsize(self._column_path(col)) // np.dtype(dtype).itemsize
+                if os.path.exists(self._column_path(col))
+                else 0
+            )
+            for col, dtype in _COLUMNS.items()
+        }
+        self._len = min(sizes.values())
+        # drop the values of the rows that weren't fully appended
+        for col, dtype in _COLUMNS.items():
+            with open(self._column_path(col), "ab") as file:
+                file.truncate(self._len * np.dtype(dtype).itemsize)
+
+    def _encode(self, col, values):
+        values = np.asarray(values, dtype=str)
+        uniques, inverse = np.unique(values, return_inverse=True)
+        codes = self._codes[col]
+        for v in uniques.tolist():
+            if v not in codes:
+                codes[v] = len(codes)
+                self.categories[col].append(v)
+        lookup = np.array([codes[v] for v in uniques.tolist()], dtype=np.int32)
+        return lookup[inverse].reshape(values.shape)
+
+    def _save_schema(self):
+        schema = {"format": _FORMAT_VERSION, "categories": self.categories}
+        with open(self._schema_path, "w") as file:
+            file.write(json.dumps(schema, indent=2))
+
+    @property
+    def _schema_path(self):
+        return os.path.join(self.path, "schema.json")
+
+    def _column_path(self, col):
+        return os.path.join(self.path, f"{col}.bin")
+
+
+def import_model_simpliciality(results, fname, dataset):
+    """Imports the realizations of the null models of a dataset.
+
+    Parameters
+    ----------
+    results : ResultsStore
+        The store to append to.
+    fname : str
+        A JSON file written by the model fitting script, with the values
+        of each metric for each model.
+    dataset : str
+        The dataset of the file.
+    """
+    data = _read_json(fname)
+    for model, metrics in data.items():
+        for metric, values in metrics.items():
+            results.append(dataset, model, metric, _as_values(values))
+
+
+def import_empirical_simpliciality(results, fname, suffix=""):
+    """Imports the measures of the empirical datasets.
+
+    Each value is stored as realization 0 of the "empirical" model.
+
+    Parameters
+    ----------
+    results : ResultsStore
+        The store to append to.
+    fname : str
+        A JSON file with the value of each metric for each dataset.
+    suffix : str, optional
+        A suffix of the metric names, for example, "-assortativity"
+        for the simplicial assortativity. By default, "".
+    """
+    data = _read_json(fname)
+    for dataset, metrics in data.items():
+        for metric, value in metrics.items():
+            results.append(
+                dataset, "empirical", metric + suffix, _as_values(value), realization=0
+            )
+
+
+def import_cm_convergence(results, fname):
+    """Imports the convergence of the configuration model.
+
+    Each value is stored as realization 0 of the "CM-convergence" model,
+    which is kept apart from the realizations of the fitted "CM", with the
+    number of double-edge swaps as the parameter.
+
+    Parameters
+    ----------
+    results : ResultsStore
+        The store to append to.
+    fname : str
+        A JSON file written by the convergence script.
+    """
+    data = _read_json(fname)
+    for dataset, d in data.items():
+        num_swaps = np.asarray(d["num-swaps"], dtype=np.float64)
+        for metric, values in d.items():
+            if metric != "num-swaps":
+                results.append(
+                    dataset,
+                    CONVERGENCE_MODEL,
+                    metric,
+                    _as_values(values),
+                    realization=0,
+                    param=num_swaps,
+                )
+
+
+def import_results(results, path="Data"):
+    """Imports all the JSON results of the scripts in a directory.
+
+    The rows are appended, so importing the same files twice duplicates them.
+
+    Parameters
+    ----------
+    results : ResultsStore
+        The store to append to.
+    path : str, optional
+        The directory of the JSON files, by default "Data".
+
+    See Also
+    --------
+    sync_results
+    """
+    for fname, importer in _result_files(path):
+        importer(results, fname)
+
+
+def sync_results(results, path="Data"):
+    """Rebuilds the store from the JSON results of the scripts if they changed.
+
+    The hashes of the imported files are recorded in the store, and if a file
+    was added, changed, or removed since, all the files are imported into a
+    new store, which then replaces the old one, so the store always mirrors
+    the files. The rebuild holds a lock next to the store, so the scripts
+    can sync the same store concurrently, for example, one per dataset.
+
+    Parameters
+    ----------
+    results : ResultsStore
+        The store to rebuild.
+    path : str, optional
+        The directory of the JSON files, by default "Data".
+
+    Returns
+    -------
+    bool
+        Whether the store was rebuilt.
+    """
+    with _locked(results.path):
+        files = _result_files(path)
+        hashes = {os.path.basename(fname): _file_hash(fname) for fname, _ in files}
+        if _sources(results.path) == hashes:
+            # another process may have rebuilt it since it was opened
+            results._load()
+            return False
+
+        parent = os.path.dirname(os.path.abspath(results.path))
+        new = tempfile.mkdtemp(prefix=".results-", dir=parent)
+        try:
+            store = ResultsStore(new)
+            for fname, importer in files:
+                importer(store, fname)
+            with open(os.path.join(new, "sources.json"), "w") as file:
+                file.write(json.dumps(hashes, indent=2))
+
+            old = new + "-old"
+            os.replace(results.path, old)
+            os.replace(new, results.path)
+            shutil.rmtree(old)
+        finally:
+            shutil.rmtree(new, ignore_errors=True)
+    results._load()
+    return True
+
+
+def _result_files(path):
+    # the JSON files of the scripts and the function that imports each
+    files = []
+    fname = os.path.join(path, "empirical_simpliciality.json")
+    if os.path.exists(fname):
+        files.append((fname, import_empirical_simpliciality))
+
+    fname = os.path.join(path, "empirical_simplicial_assortativity.json")
+    if os.path.exists(fname):
+        importer = partial(import_empirical_simpliciality, suffix="-assortativity")
+        files.append((fname, importer))
+
+    fname = os.path.join(path, "cm_convergence.json")
+    if os.path.exists(fname):
+        files.append((fname, import_cm_convergence))
+
+    prefix = "model_simpliciality_"
+    for f in sorted(os.listdir(path)):
+        dataset, ext = os.path.splitext(f[len(prefix) :])
+        # the summaries of the ensembles aren't realizations
+        if (
+            f.startswith(prefix)
+            and ext == ".json"
+            and not f.startswith(prefix + "summary_")
+        ):
+            importer = partial(import_model_simpliciality, dataset=dataset)
+            files.append((os.path.join(path, f), importer))
+    return files
+
+
+def _file_hash(fname):
+    with open(fname, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+
+def _read_json(fname):
+    with open(fname) as file:
+        return json.loads(file.read())
+
+
+def _sources(path):
+    # the hashes of the files the store was built from
+    fname = os.path.join(path, "sources.json")
+    if not os.path.exists(fname):
+        return None
+    return _read_json(fname)
+
+
+@contextmanager
+def _locked(path):
+    # an exclusive lock on a file next to the directory
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.abspath(path) + ".lock", "w") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def _as_values(values):
+    # None, for example, a failed realization, is stored as NaN
+    return np.array(values, dtype=np.float64)
@@ -0,0 +1,296 @@
+"""Run independent tasks on a single process pool.
+
+All the tasks of a run are submitted to one pool, so the workers move on to
+the next stage as soon as they finish the current one instead of idling while
+the slowest tasks of a stage finish. Tasks are dispatched from the most to the
+least expensive, so the run doesn't end with a single worker busy on a large
+dataset. Each worker can be given a memory limit, so a single task that blows
+up fails on its own instead of taking down the machine. If a worker is killed
+instead, for example, by the OOM killer, only the task it was running fails,
+and the other tasks run on a new pool.
+"""
+
+import heapq
+import os
+import re
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+
+
+class Task:
+    """A function call to run in a worker process.
+
+    Parameters
+    ----------
+    key : hashable
+        The identifier of the task, for example, a tuple of the dataset,
+        the metric, and the realization.
+    func : callable
+        The function to call. It must be picklable, so it must be defined at
+        the top level of a module.
+    *args
+        The positional arguments of the function.
+    cost : float, optional
+        An estimate of the running time of the task in arbitrary units,
+        for example, from `edge_costs`. By default, 1.
+    **kwargs
+        The keyword arguments of the function.
+    """
+
+    def __init__(self, key, func, *args, cost=1, **kwargs):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.cost = cost
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return f"Task({self.key!r})"
+
+    def __call__(self):
+        return self.func(*self.args, **self.kwargs)
+
+
+def run_tasks(tasks, num_processes=None, memory_limit=None, raise_errors=True):
+    """Runs tasks in parallel and yields their results as they finish.
+
+    Each worker runs one task at a time. If a worker dies, the tasks that
+    were running on the pool are rerun, each in a pool of its own, so that
+    only the task that killed its worker fails, with a BrokenProcessPool
+    error, and the remaining tasks run on a new pool.
+
+    Parameters
+    ----------
+    tasks : iterable of Task
+        The tasks to run. They are submitted from the highest to the
+        lowest cost, and in order for equal costs.
+    num_processes : int, optional
+        The number of worker processes. If None (default), all the
+        available CPUs are used.
+    memory_limit : int or str, optional
+        The maximum address space of each worker, in bytes or as a string
+        such as "4G". A task that exceeds it raises a MemoryError.
+        By default, None, in which case there is no limit.
+    raise_errors : bool, optional
+        Whether to raise the exception of a failed task. If False, the
+        exception is yielded as its result. By default, True.
+
+    Yields
+    ------
+    task : Task
+        The finished task.
+    result
+        The return value of the task or, if it failed and `raise_errors`
+        is False, its exception.
+
+    Raises
+    ------
+    ValueError
+        If a memory limit is given on a platform without `resource`.
+    """
+    if num_processes is None:
+        num_processes = available_cpus()
+    if memory_limit is not None:
+        memory_limit = parse_memory(memory_limit)
+        if resource is None:
+            raise ValueError("Memory limits are not supported on this platform!")
+
+    queue = deque(sorted(tasks, key=lambda task: task.cost, reverse=True))
+    while queue:
+        broken = []
+        finished = _run_on_pool(queue, num_processes, memory_limit, broken)
+        for task, future in chain(finished, _run_isolated(broken, memory_limit)):
+            error = future.exception()
+            if error is None:
+                yield task, future.result()
+            elif raise_errors:
+                raise error
+            else:
+                yield task, error
+
+
+def edge_costs(arrays, min_size=1):
+    """Estimates the cost of checking the subfaces of each edge.
+
+    The measures of simpliciality look up every subface of an edge,
+    so the cost of an edge of size k is :math:`2^k`.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The incidence arrays, as returned by `incidence_arrays`.
+    min_size : int, optional
+        Edges smaller than this cost nothing, by default 1.
+
+    Returns
+    -------
+    numpy.ndarray
+        The cost of each edge.
+    """
+    sizes = np.diff(arrays["edge_ptr"])
+    return np.where(sizes >= min_size, np.exp2(sizes), 0.0)
+
+
+def node_costs(arrays, min_size=1):
+    """Estimates the cost of the local measures of simpliciality of each node.
+
+    The local measure of a node is computed on the subhypergraph induced
+    by its neighborhood, which is estimated as the edges incident to the
+    node, once for each of their members.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The incidence arrays, as returned by `incidence_arrays`.
+    min_size : int, optional
+        Edges smaller than this cost nothing, by default 1.
+
+    Returns
+    -------
+    numpy.ndarray
+        The cost of each node.
+    """
+    edge_ptr = arrays["edge_ptr"]
+    sizes = np.diff(edge_ptr)
+    costs = edge_costs(arrays, min_size) * sizes
+    return np.bincount(
+        arrays["edge_members"],
+        weights=np.repeat(costs, sizes),
+        minlength=len(arrays["node_ids"]),
+    )
+
+
+def balanced_partition(costs, num_parts):
+    """Splits items into parts of about the same total cost.
+
+    The items are assigned greedily from the most to the least expensive
+    to the part with the lowest total so far.
+
+    Parameters
+    ----------
+    costs : array-like
+        The cost of each item.
+    num_parts : int
+        The number of parts.
+
+    Returns
+    -------
+    list of numpy.ndarray
+        The sorted indices of the items in each part. Empty parts are dropped.
+    """
+    costs = np.asarray(costs)
+    heap = [(0.0, i) for i in range(num_parts)]
+    parts = [[] for _ in range(num_parts)]
+    for idx in np.argsort(-costs, kind="stable").tolist():
+        total, i = heapq.heappop(heap)
+        parts[i].append(idx)
+        heapq.heappush(heap, (total + costs[idx], i))
+    return [np.sort(np.array(p, dtype=np.int64)) for p in parts if p]
+
+
+def available_cpus():
+    """The number of CPUs this process may run on.
+
+    Returns
+    -------
+    int
+        The number of CPUs.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
+def parse_memory(s):
+    """Converts a memory size to bytes.
+
+    Parameters
+    ----------
+    s : int or str
+        The size in bytes or as a number with a unit, such as "512M" or "4G".
+
+    Returns
+    -------
+    int
+        The size in bytes.
+
+    Raises
+    ------
+    ValueError
+        If the size can't be parsed.
+    """
+    if isinstance(s, int):
+        return s
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)B?\s*", s.upper())
+    if match is None:
+        raise ValueError(f"Invalid memory size: {s}")
+    return int(float(match[1]) * _UNITS[match[2]])
+
+
+def _pool(num_processes, memory_limit):
+    return ProcessPoolExecutor(
+        max_workers=num_processes,
+        initializer=_limit_memory,
+        initargs=(memory_limit,),
+    )
+
+
+def _run_on_pool(queue, num_processes, memory_limit, broken):
+    # runs the queued tasks, one per worker at a time, and yields their
+    # futures until the queue is empty or a worker dies, after which the tasks
+    # that were running are added to broken and the rest stay queued
+    with _pool(num_processes, memory_limit) as executor:
+        running = dict()
+        while queue or running:
+            while queue and len(running) < num_processes and not broken:
+                try:
+                    future = executor.submit(queue[0])
+                except BrokenProcessPool:
+                    break
+                running[future] = queue.popleft()
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                if isinstance(future.exception(), BrokenProcessPool):
+                    broken.append(task)
+                else:
+                    yield task, future
+
+
+def _run_isolated(tasks, memory_limit):
+    # reruns each task in a pool of its own, so that a task that kills its
+    # worker doesn't take the others down with it
+    pools = [_pool(1, memory_limit) for _ in tasks]
+    try:
+        futures = {pool.submit(task): task for task, pool in zip(tasks, pools)}
+        for future in as_completed(futures):
+            yield futures[future], future
+    finally:
+        for pool in pools:
+            pool.shutdown()
+
+
+def _limit_memory(limit):
+    if limit is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
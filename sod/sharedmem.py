@@ -0,0 +1,176 @@
+"""Publish read-only arrays to other processes by name.
+
+Arrays are copied once into a shared memory segment or a file, and workers
+attach to them from a small, picklable handle instead of receiving pickled
+copies of the data with every task.
+"""
+
+import os
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+_ALIGNMENT = 64
+
+# segments published or attached by this process, kept alive by name
+_segments = {}
+_published = set()
+
+
+def publish_arrays(arrays, path=None):
+    """Copies arrays into shared memory or a file.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The arrays to publish. They cannot contain Python objects.
+    path : str, optional
+        If not None, the arrays are written to this file and workers memory-map
+        it, which also works across nodes on a shared filesystem. If None
+        (default), the arrays are copied into a `multiprocessing.shared_memory`
+        segment.
+
+    Returns
+    -------
+    dict
+        The handle with which to attach to the arrays.
+
+    Raises
+    ------
+    TypeError
+        If an array holds Python objects.
+
+    See Also
+    --------
+    attach_arrays
+    release_arrays
+    shared_arrays
+    """
+    layout = {}
+    offset = 0
+    for key, a in arrays.items():
+        a = np.asarray(a)
+        if a.dtype.hasobject:
+            raise TypeError(f"Array '{key}' holds Python objects and can't be shared!")
+        layout[key] = (offset, a.shape, a.dtype.str)
+        offset += -(-a.nbytes // _ALIGNMENT) * _ALIGNMENT
+    size = max(offset, 1)
+
+    if path is None:
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        _segments[shm.name] = shm
+        _published.add(shm.name)
+        buffer = shm.buf
+        handle = {"name": shm.name, "size": size, "layout": layout}
+    else:
+        buffer = np.memmap(path, dtype=np.uint8, mode="w+", shape=(size,))
+        handle = {"path": os.fspath(path), "size": size, "layout": layout}
+
+    for key, (offset, shape, dtype) in layout.items():
+        view = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        view[...] = arrays[key]
+        del view
+
+    if path is not None:
+        buffer.flush()
+        del buffer
+    return handle
+
+
+def attach_arrays(handle):
+    """Attaches read-only to published arrays.
+
+    Parameters
+    ----------
+    handle : dict
+        The handle returned by `publish_arrays`.
+
+    Returns
+    -------
+    dict of numpy.ndarray
+        Read-only views of the published arrays.
+    """
+    if "path" in handle:
+        buffer = np.memmap(
+            handle["path"], dtype=np.uint8, mode="r", shape=(handle["size"],)
+        )
+    else:
+        buffer = _attach_segment(handle["name"]).buf
+
+    arrays = {}
+    for key, (offset, shape, dtype) in handle["layout"].items():
+        a = np.ndarray(tuple(shape), dtype=dtype, buffer=buffer, offset=offset)
+        a.flags.writeable = False
+        arrays[key] = a
+    return arrays
+
+
+def release_arrays(handle):
+    """Frees published arrays.
+
+    This should be called once by the publishing process after the workers
+    are done. Arrays attached in this process must not be used afterwards.
+
+    Parameters
+    ----------
+    handle : dict
+        The handle returned by `publish_arrays`.
+    """
+    if "path" in handle:
+        if os.path.exists(handle["path"]):
+            os.remove(handle["path"])
+        return
+
+    name = handle["name"]
+    shm = _segments.get(name)
+    if shm is None:
+        return
+    try:
+        shm.close()
+        del _segments[name]
+    except BufferError:
+        # Views into the segment are still alive in this process, so keep
+        # it mapped. Unlinking below still frees it once they're gone.
+        pass
+    if name in _published:
+        _published.discard(name)
+        shm.unlink()
+
+
+@contextmanager
+def shared_arrays(arrays, path=None):
+    """Publishes arrays for the duration of a `with` block.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The arrays to publish.
+    path : str, optional
+        A file to publish to instead of shared memory, by default None.
+
+    Yields
+    ------
+    dict
+        The handle with which to attach to the arrays.
+
+    Examples
+    --------
+    >>> with shared_arrays(incidence_arrays(H)) as handle:  # doctest: +SKIP
+    ...     Parallel(n_jobs=4)(delayed(task)(handle) for _ in range(10))
+    """
+    handle = publish_arrays(arrays, path=path)
+    try:
+        yield handle
+    finally:
+        release_arrays(handle)
+
+
+def _attach_segment(name):
+    if name not in _segments:
+        shm = shared_memory.SharedMemory(name=name)
+        # Attaching registers the segment with this process's resource
+        # tracker, which would unlink it when the worker exits.
+        resource_tracker.unregister(shm._name, "shared_memory")
+        _segments[name] = shm
+    return _segments[name]
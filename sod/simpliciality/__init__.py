@@ -1,16 +1,24 @@
 from . import (
+    closure,
     edit_simpliciality,
     face_edit_simpliciality,
+    indexed,
     local,
+    mapreduce,
     mean_face_edit_distance,
+    out_of_core,
     simplicial_edit_distance,
     simplicial_fraction,
     utilities,
 )
+from .closure import *
 from .edit_simpliciality import *
 from .face_edit_simpliciality import *
+from .indexed import *
 from .local import *
+from .mapreduce import *
 from .mean_face_edit_distance import *
+from .out_of_core import *
 from .simplicial_edit_distance import *
 from .simplicial_fraction import *
 from .utilities import *
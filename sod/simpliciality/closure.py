@@ -0,0 +1,225 @@
+import os
+import pickle
+import shutil
+import tempfile
+
+from ..instrument import get_instrumentation
+from ..trie import Trie
+from .utilities import powerset
+
+
+def missing_faces(
+    H,
+    min_size=2,
+    exclude_min_size=True,
+    max_faces=1000000,
+    spill_dir=None,
+    num_partitions=64,
+):
+    """Generates the unique faces missing from a hypergraph's simplicial closure.
+
+    These are the sub-edges that must be added to the hypergraph to make it
+    a simplicial complex. Faces are yielded as soon as they are found until
+    more than `max_faces` unique faces are held in memory. From then on, the
+    faces are spilled to hash-partitioned files and deduplicated one
+    partition at a time, so that no more than roughly `max_faces` faces
+    (or one partition) are held in memory at once.
+
+    Parameters
+    ----------
+    H : xgi.Hypergraph
+        The hypergraph of interest
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 2.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+    max_faces : int, optional
+        The maximum number of unique faces to hold in memory before
+        spilling to disk, by default 1000000.
+    spill_dir : str, optional
+        The directory in which to create the spill files. If None (default),
+        the system's temporary directory is used.
+    num_partitions : int, optional
+        The number of spill files, by default 64.
+
+    Yields
+    ------
+    frozenset
+        A missing face. Each face is yielded exactly once.
+
+    See Also
+    --------
+    count_missing_faces
+    write_simplicial_closure
+    edit_simpliciality_full_construction
+    """
+    edges = H.edges.filterby("size", min_size, "geq").members()
+    max_edges = (
+        H.edges.maximal().filterby("size", min_size + exclude_min_size, "geq").members()
+    )
+
+    t = Trie()
+    t.build_trie(edges)
+
+    seen = set()
+    spill = None
+    lookups = 0
+    hits = 0
+    try:
+        for e in max_edges:
+            for f in powerset(e, min_size=min_size, max_size=len(e) - 1):
+                lookups += 1
+                if t.search(f):
+                    hits += 1
+                    continue
+                f = frozenset(f)
+                if f in seen:
+                    continue
+                seen.add(f)
+                # faces found before the first spill can be yielded right away
+                if spill is None:
+                    yield f
+                if len(seen) > max_faces:
+                    if spill is None:
+                        spill = _Spill(spill_dir, num_partitions)
+                        spill.write(seen, yielded=True)
+                    else:
+                        spill.write(seen, yielded=False)
+                    seen = set()
+
+        if spill is None:
+            return
+
+        spill.write(seen, yielded=False)
+        seen = None  # release the last batch before deduplicating
+        yield from spill.unique()
+    finally:
+        if spill is not None:
+            spill.close()
+        rec = get_instrumentation()
+        if rec is not None:
+            rec.count("subsets", lookups)
+            rec.count("trie.lookups", lookups)
+            rec.count("trie.hits", hits)
+
+
+def count_missing_faces(H, min_size=2, exclude_min_size=True, **kwargs):
+    """Counts the unique faces missing from a hypergraph's simplicial closure.
+
+    Parameters
+    ----------
+    H : xgi.Hypergraph
+        The hypergraph of interest
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 2.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+    **kwargs
+        Keyword arguments passed to `missing_faces`.
+
+    Returns
+    -------
+    int
+        The number of missing faces
+    """
+    return sum(1 for _ in missing_faces(H, min_size, exclude_min_size, **kwargs))
+
+
+def write_simplicial_closure(
+    H,
+    path,
+    min_size=2,
+    exclude_min_size=True,
+    include_edges=True,
+    delimiter=" ",
+    **kwargs,
+):
+    """Writes the simplicial closure of a hypergraph as an edge list.
+
+    Each line contains the members of one edge separated by `delimiter`,
+    the same format as `xgi.write_edgelist`. The missing faces are streamed
+    to the file, so the closure is never held in memory.
+
+    Parameters
+    ----------
+    H : xgi.Hypergraph
+        The hypergraph of interest
+    path : str
+        The file to write to.
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 2.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+    include_edges : bool, optional
+        Whether to write the existing edges of `H` before the missing faces.
+        If False, only the missing faces are written. By default, True.
+    delimiter : str, optional
+        The separator between the members of an edge, by default " ".
+    **kwargs
+        Keyword arguments passed to `missing_faces`.
+
+    Returns
+    -------
+    int
+        The number of missing faces written
+    """
+    count = 0
+    with open(path, "w") as file:
+        if include_edges:
+            for e in H.edges.members():
+                file.write(delimiter.join(str(n) for n in e) + "\n")
+        for f in missing_faces(H, min_size, exclude_min_size, **kwargs):
+            file.write(delimiter.join(str(n) for n in f) + "\n")
+            count += 1
+    return count
+
+
+class _Spill:
+    """Hash-partitioned spill files for deduplicating faces on disk."""
+
+    def __init__(self, spill_dir, num_partitions):
+        self.dir = tempfile.mkdtemp(prefix="sod-closure-", dir=spill_dir)
+        self.paths = [os.path.join(self.dir, f"{i}.pkl") for i in range(num_partitions)]
+        self.files = [open(p, "wb") for p in self.paths]
+
+    def write(self, faces, yielded):
+        n = len(self.files)
+        batches = [[] for _ in range(n)]
+        for f in faces:
+            batches[hash(f) % n].append(f)
+        for file, batch in zip(self.files, batches):
+            if batch:
+                pickle.dump((yielded, batch), file)
+
+    def unique(self):
+        for file in self.files:
+            file.close()
+
+        for path in self.paths:
+            yielded = set()
+            pending = set()
+            with open(path, "rb") as file:
+                while True:
+                    try:
+                        flag, batch = pickle.load(file)
+                    except EOFError:
+                        break
+                    if flag:
+                        yielded.update(batch)
+                    else:
+                        pending.update(batch)
+            yield from pending - yielded
+
+    def close(self):
+        for file in self.files:
+            file.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
@@ -1,10 +1,11 @@
 import numpy as np
 
-from ..trie import Trie
+from ..cache import cached
+from .closure import count_missing_faces
 from .simplicial_edit_distance import simplicial_edit_distance
-from .utilities import missing_subfaces
 
 
+@cached
 def edit_simpliciality(H, min_size=2, exclude_min_size=True):
     """Computes the edit simpliciality.
 
@@ -72,6 +73,8 @@ def edit_simpliciality_full_construction(H, min_size=2, exclude_min_size=True):
 
     The number of edges needed to be added
     to a hypergraph to make it a simplicial complex.
+    The missing faces are streamed through `missing_faces`,
+    which spills to disk instead of holding them all in memory.
 
     Parameters
     ----------
@@ -92,16 +95,14 @@ def edit_simpliciality_full_construction(H, min_size=2, exclude_min_size=True):
         H.edges.maximal().filterby("size", min_size + exclude_min_size, "geq").members()
     )
 
-    t = Trie()
-    t.build_trie(edges)
-
-    ms = set()
-    for e in max_edges:
-        ms.update(missing_subfaces(t, e, min_size=min_size))
+    # as in simplicial_edit_distance, there is nothing to measure without
+    # maximal faces
+    if not max_edges:
+        return np.nan
 
     s = len(edges)
     mf = len(max_edges)
-    m = len(ms)
+    m = count_missing_faces(H, min_size=min_size, exclude_min_size=exclude_min_size)
     if m + s - mf > 0:
         return (s - mf) / (m + s - mf)
     else:
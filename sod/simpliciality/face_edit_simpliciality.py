@@ -1,6 +1,8 @@
+from ..cache import cached
 from .mean_face_edit_distance import mean_face_edit_distance
 
 
+@cached(version=2)
 def face_edit_simpliciality(H, min_size=2, exclude_min_size=True):
     """Computes the face edit simpliciality.
 
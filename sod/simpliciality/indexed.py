@@ -0,0 +1,248 @@
+"""Measures of simpliciality on flat incidence arrays and a face index.
+
+The face index of the edges and the maximal faces are built once per
+hypergraph, for example, by the process that publishes its incidence arrays,
+and every worker then looks up the subfaces of its subset of the edges
+without building a Hypergraph or a trie. The subfaces of equal-sized edges
+are looked up in vectorized blocks, as in `out_of_core_simpliciality`.
+"""
+
+import numpy as np
+
+from ..faceindex import FaceIndex, pack_array
+from ..instrument import get_instrumentation, phase
+from .utilities import max_number_of_subfaces
+
+# the maximum number of subface keys looked up at once
+_BLOCK_SIZE = 2**20
+
+
+def maximal_edges(arrays, index, min_size=1):
+    """Finds the edges that are not contained in another edge.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The incidence arrays, as returned by `incidence_arrays`.
+    index : FaceIndex
+        The index of the edges of at least `min_size` nodes, as returned
+        by `face_index`.
+    min_size : int, optional
+        Edges smaller than this are ignored, by default 1.
+
+    Returns
+    -------
+    numpy.ndarray
+        A boolean array which is True for the maximal edges of at least
+        `min_size` nodes. Copies of a maximal edge are all maximal, as with
+        `Hypergraph.edges.maximal()`.
+    """
+    covered = []
+    with phase("maximal"):
+        for _, nodes in _edge_blocks(arrays, None, min_size):
+            for present, keys in index.subfaces(nodes, min_size):
+                covered.append(np.unique(keys[present.ravel()]))
+        if covered:
+            covered = FaceIndex(np.unique(np.concatenate(covered)))
+        else:
+            covered = FaceIndex(np.zeros(0, dtype=index.keys.dtype))
+
+        maximal = np.zeros(len(arrays["edge_ptr"]) - 1, dtype=bool)
+        for idx, nodes in _edge_blocks(arrays, None, min_size):
+            maximal[idx] = ~covered.contains(pack_array(nodes, index.width))
+    return maximal
+
+
+def indexed_simplex_counts(
+    arrays, index, min_size=2, exclude_min_size=True, edges=None
+):
+    """Counts the simplices and the potential simplices of a hypergraph.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The incidence arrays, as returned by `incidence_arrays`.
+    index : FaceIndex
+        The index of the edges of at least `min_size` nodes, as returned
+        by `face_index`.
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 2.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+    edges : array-like of int, optional
+        The indices of the edges to count. If None (default), all
+        the edges are counted.
+
+    Returns
+    -------
+    tuple of int
+        The number of simplices and the number of potential simplices.
+
+    See Also
+    --------
+    simplex_counts
+    """
+    rec = get_instrumentation()
+    ns = 0
+    ps = 0
+    with phase("simplices"):
+        for _, nodes in _edge_blocks(arrays, edges, min_size + exclude_min_size):
+            is_simplex = np.ones(len(nodes), dtype=bool)
+            for present, _ in index.subfaces(nodes, min_size):
+                is_simplex &= present.all(axis=1)
+                if rec is not None:
+                    rec.count("subsets", present.size)
+            ps += len(nodes)
+            ns += int(is_simplex.sum())
+    return ns, ps
+
+
+def indexed_face_edit_distance_sum(
+    arrays,
+    index,
+    maximal,
+    min_size=2,
+    exclude_min_size=True,
+    normalize=True,
+    edges=None,
+):
+    """Sums the face edit distances of the maximal faces of a hypergraph.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The incidence arrays, as returned by `incidence_arrays`.
+    index : FaceIndex
+        The index of the edges of at least `min_size` nodes, as returned
+        by `face_index`.
+    maximal : numpy.ndarray
+        Which edges are maximal, as returned by `maximal_edges`.
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 2.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+    normalize : bool, optional
+        Whether to normalize the face edit distance, by default True
+    edges : array-like of int, optional
+        The indices of the edges to include, of which only the maximal faces
+        count. If None (default), all the edges are included.
+
+    Returns
+    -------
+    total : float
+        The sum of the face edit distances, added in the order of the edges.
+    count : int
+        The number of maximal faces.
+
+    See Also
+    --------
+    face_edit_distance_sum
+    """
+    selected = _maximal_faces(arrays, maximal, min_size + exclude_min_size, edges)
+    d = np.zeros(len(maximal))
+    with phase("subfaces"):
+        for idx, nodes in _edge_blocks(arrays, selected, min_size):
+            k = nodes.shape[1]
+            for present, _ in index.subfaces(nodes, min_size):
+                d[idx] += (~present).sum(axis=1)
+            m = max_number_of_subfaces(min_size, k)
+            if normalize and m != 0:
+                d[idx] *= 1.0 / m
+
+    total = 0
+    for x in d[selected].tolist():
+        total += x
+    return total, len(selected)
+
+
+def indexed_edit_simpliciality(
+    arrays, index, maximal, min_size=2, exclude_min_size=True
+):
+    """Computes the edit simpliciality of a hypergraph.
+
+    The missing subfaces of all the maximal faces are deduplicated at once,
+    rather than by intersecting neighboring maximal faces.
+
+    Parameters
+    ----------
+    arrays : dict of numpy.ndarray
+        The incidence arrays, as returned by `incidence_arrays`.
+    index : FaceIndex
+        The index of the edges of at least `min_size` nodes, as returned
+        by `face_index`.
+    maximal : numpy.ndarray
+        Which edges are maximal, as returned by `maximal_edges`.
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 2.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+
+    Returns
+    -------
+    float
+        The edit simpliciality, or NaN if there are no maximal faces.
+
+    See Also
+    --------
+    edit_simpliciality
+    """
+    selected = _maximal_faces(arrays, maximal, min_size + exclude_min_size, None)
+    rec = get_instrumentation()
+    if rec is not None:
+        rec.count("maximal_faces", len(selected))
+    if len(selected) == 0:
+        return np.nan
+
+    missing = []
+    with phase("subfaces"):
+        for _, nodes in _edge_blocks(arrays, selected, min_size):
+            for present, keys in index.subfaces(nodes, min_size):
+                missing.append(np.unique(keys[~present.ravel()]))
+                if rec is not None:
+                    rec.count("subsets", present.size)
+    ms = len(np.unique(np.concatenate(missing))) if missing else 0
+
+    s = int((np.diff(arrays["edge_ptr"]) >= min_size).sum())
+    mf = len(selected)
+    if s - mf + ms > 0:
+        return 1 - ms / (s - mf + ms)
+    else:
+        return np.nan
+
+
+def _maximal_faces(arrays, maximal, min_size, edges):
+    # the sorted indices of the maximal faces of at least min_size nodes
+    sizes = np.diff(arrays["edge_ptr"])
+    mask = np.asarray(maximal) & (sizes >= min_size)
+    if edges is not None:
+        subset = np.zeros(len(mask), dtype=bool)
+        subset[np.asarray(edges, dtype=np.int64)] = True
+        mask &= subset
+    return np.flatnonzero(mask)
+
+
+def _edge_blocks(arrays, edges, min_size):
+    # the indices and the (n, k) members of blocks of edges of equal size k
+    edge_ptr = arrays["edge_ptr"]
+    edge_members = arrays["edge_members"]
+    sizes = np.diff(edge_ptr)
+    if edges is None:
+        edges = np.arange(len(sizes))
+    edges = np.asarray(edges, dtype=np.int64)
+    for k in np.unique(sizes[edges]).tolist():
+        if k < min_size:
+            continue
+        idx = edges[sizes[edges] == k]
+        step = max(_BLOCK_SIZE >> k, 1)
+        for start in range(0, len(idx), step):
+            block = idx[start : start + step]
+            yield block, edge_members[edge_ptr[block][:, None] + np.arange(k)]
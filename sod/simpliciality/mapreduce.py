@@ -0,0 +1,161 @@
+import glob
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..faceindex import FaceIndex, KeyRuns, face_blocks, hash_keys, pack_faces
+
+
+def edit_simpliciality_mapreduce(
+    H,
+    min_size=2,
+    exclude_min_size=True,
+    num_mappers=None,
+    num_reducers=None,
+    runner=None,
+    work_dir=None,
+    buffer_size=1000000,
+):
+    """Computes the edit simpliciality with a map-reduce over worker processes.
+
+    The maximal faces are split among the mappers, which enumerate the
+    missing subfaces of their share and route the packed keys of these
+    faces to the reducers by hash. Because every copy of a face goes to the
+    same reducer, each reducer can count its unique faces independently, and
+    the total number of missing faces is the sum of these counts.
+    Mappers and reducers only communicate through files in `work_dir`.
+
+    Parameters
+    ----------
+    H : xgi.Hypergraph
+        The hypergraph of interest
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 2.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+    num_mappers : int, optional
+        The number of map tasks. If None (default), the number of CPUs.
+    num_reducers : int, optional
+        The number of reduce tasks. If None (default), `num_mappers`.
+    runner : concurrent.futures.Executor, optional
+        Any object with a `map(fn, *iterables)` method that runs the tasks,
+        for example, an executor spanning several nodes. The `work_dir` must
+        then be on a filesystem shared by all the workers. If None (default),
+        a local process pool is used.
+    work_dir : str, optional
+        The directory for the intermediate files. If None (default),
+        the system's temporary directory is used.
+    buffer_size : int, optional
+        The maximum number of keys each task holds in memory,
+        by default 1000000.
+
+    Returns
+    -------
+    float
+        The edit simpliciality
+
+    See Also
+    --------
+    edit_simpliciality
+    """
+    if num_mappers is None:
+        num_mappers = os.cpu_count()
+    if num_reducers is None:
+        num_reducers = num_mappers
+
+    node_index = {n: i for i, n in enumerate(H.nodes)}
+    edges = [
+        [node_index[n] for n in e]
+        for e in H.edges.filterby("size", min_size, "geq").members()
+    ]
+    max_edges = [
+        [node_index[n] for n in e]
+        for e in H.edges.maximal()
+        .filterby("size", min_size + exclude_min_size, "geq")
+        .members()
+    ]
+    if not max_edges:
+        return np.nan
+
+    s = len(edges)
+    mf = len(max_edges)
+    width = max(map(len, edges))
+
+    work_dir = tempfile.mkdtemp(prefix="sod-mapreduce-", dir=work_dir)
+    try:
+        np.save(
+            os.path.join(work_dir, "index.npy"), FaceIndex.from_faces(edges, width).keys
+        )
+        for i, share in enumerate(
+            np.array_split(pack_faces(max_edges, width), num_mappers)
+        ):
+            np.save(os.path.join(work_dir, f"share{i}.npy"), share)
+
+        map_args = [
+            (work_dir, i, num_reducers, min_size, buffer_size)
+            for i in range(num_mappers)
+        ]
+        reduce_args = [(work_dir, i, buffer_size) for i in range(num_reducers)]
+
+        if runner is None:
+            with ProcessPoolExecutor(max_workers=num_mappers) as pool:
+                list(pool.map(_map_missing_faces, *zip(*map_args)))
+                ms = sum(pool.map(_reduce_missing_faces, *zip(*reduce_args)))
+        else:
+            list(runner.map(_map_missing_faces, *zip(*map_args)))
+            ms = sum(runner.map(_reduce_missing_faces, *zip(*reduce_args)))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if s - mf + ms > 0:
+        return 1 - ms / (s - mf + ms)
+    else:
+        return np.nan
+
+
+def _map_missing_faces(work_dir, mapper, num_reducers, min_size, buffer_size):
+    index = FaceIndex(np.load(os.path.join(work_dir, "index.npy"), mmap_mode="r"))
+    share = np.load(os.path.join(work_dir, f"share{mapper}.npy"), mmap_mode="r")
+
+    routed = [[] for _ in range(num_reducers)]
+    buffered = 0
+    part = 0
+    for nodes in face_blocks(share, min_size, buffer_size):
+        for present, keys in index.subfaces(nodes, min_size):
+            keys = np.unique(keys[~present.ravel()])
+            reducer = hash_keys(keys) % np.uint64(num_reducers)
+            for r in range(num_reducers):
+                routed[r].append(keys[reducer == r])
+            buffered += len(keys)
+
+        if buffered >= buffer_size:
+            _write_routed(work_dir, mapper, part, routed)
+            routed = [[] for _ in range(num_reducers)]
+            buffered = 0
+            part += 1
+    _write_routed(work_dir, mapper, part, routed)
+
+
+def _write_routed(work_dir, mapper, part, routed):
+    for r, keys in enumerate(routed):
+        if keys:
+            keys = np.unique(np.concatenate(keys))
+            np.save(os.path.join(work_dir, f"map{mapper}-{part}-reduce{r}.npy"), keys)
+
+
+def _reduce_missing_faces(work_dir, reducer, buffer_size):
+    paths = glob.glob(os.path.join(work_dir, f"map*-reduce{reducer}.npy"))
+    if not paths:
+        return 0
+
+    width = np.load(paths[0], mmap_mode="r").dtype.itemsize // 8
+    with KeyRuns(width, work_dir, buffer_size) as runs:
+        for path in paths:
+            runs.add(np.load(path))
+        return runs.merge()
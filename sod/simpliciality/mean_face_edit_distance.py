@@ -1,7 +1,10 @@
+from ..cache import cached
+from ..instrument import phase
 from ..trie import Trie
 from .utilities import count_missing_subfaces, max_number_of_subfaces
 
 
+@cached
 def mean_face_edit_distance(H, min_size=1, exclude_min_size=True, normalize=True):
     """Computes the mean face edit distance
 
@@ -62,18 +65,88 @@ def mean_face_edit_distance(H, min_size=1, exclude_min_size=True, normalize=True
     by Nicholas Landry, Jean-Gabriel Young, and Nicole Eikmeier,
     *EPJ Data Science* **13**, 17 (2024).
     """
+    with phase("filterby"):
+        edges = H.edges.filterby("size", min_size, "geq").members()
     t = Trie()
-    t.build_trie(H.edges.filterby("size", min_size, "geq").members())
+    t.build_trie(edges)
 
-    max_faces = (
-        H.edges.maximal().filterby("size", min_size + exclude_min_size, "geq").members()
-    )
+    with phase("maximal"):
+        max_faces = (
+            H.edges.maximal()
+            .filterby("size", min_size + exclude_min_size, "geq")
+            .members()
+        )
     avg_d = 0
-    for e in max_faces:
-        if len(e) >= min_size:
-            d = count_missing_subfaces(t, e, min_size=min_size)  # missing subfaces
+    with phase("subfaces"):
+        for e in max_faces:
+            if len(e) >= min_size:
+                d = count_missing_subfaces(t, e, min_size=min_size)  # missing subfaces
+                m = max_number_of_subfaces(min_size, len(e))
+                if normalize and m != 0:
+                    d *= 1.0 / m
+                avg_d += d / len(max_faces)
+    return avg_d
+
+
+def face_edit_distance_sum(
+    H, min_size=1, exclude_min_size=True, normalize=True, edges=None
+):
+    """Sums the face edit distances of the maximal faces of a hypergraph.
+
+    The sums over disjoint subsets of edges add up, so the mean face edit
+    distance of a large hypergraph can be split into parallel tasks.
+
+    Parameters
+    ----------
+    H : Hypergraph
+        The hypergraph of interest
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 1.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+    normalize : bool, optional
+        Whether to normalize the face edit distance, by default True
+    edges : iterable, optional
+        The IDs of the edges to include, of which only the maximal faces
+        count. If None (default), all the edges are included.
+
+    Returns
+    -------
+    total : float
+        The sum of the face edit distances.
+    count : int
+        The number of maximal faces.
+
+    See Also
+    --------
+    mean_face_edit_distance
+    """
+    with phase("filterby"):
+        members = H.edges.filterby("size", min_size, "geq").members()
+    t = Trie()
+    t.build_trie(members)
+
+    with phase("maximal"):
+        max_faces = H.edges.maximal().filterby(
+            "size", min_size + exclude_min_size, "geq"
+        )
+    if edges is not None:
+        # in the order of the edges, so that the float sum is reproducible
+        edges = set(edges)
+        max_faces = [id for id in max_faces if id in edges]
+
+    total = 0
+    count = 0
+    with phase("subfaces"):
+        for id in max_faces:
+            e = H.edges.members(id)
+            d = count_missing_subfaces(t, e, min_size=min_size)
             m = max_number_of_subfaces(min_size, len(e))
             if normalize and m != 0:
                 d *= 1.0 / m
-            avg_d += d / len(max_faces)
-    return avg_d
+            total += d
+            count += 1
+    return total, count
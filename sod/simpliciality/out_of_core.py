@@ -0,0 +1,190 @@
+import os
+import shutil
+import tempfile
+from functools import partial
+
+import numpy as np
+
+from ..faceindex import FaceIndex, KeyRuns, face_blocks, pack_array
+from .utilities import max_number_of_subfaces
+
+
+def read_edgelist_chunks(
+    path, chunksize=100000, delimiter=None, comments="#", max_order=None
+):
+    """Reads an edge list of integer nodes in chunks.
+
+    Parameters
+    ----------
+    path : str
+        The edge list, with the members of one edge per line.
+    chunksize : int, optional
+        The number of edges per chunk, by default 100000.
+    delimiter : str, optional
+        The separator between members. If None (default), any whitespace.
+    comments : str, optional
+        Lines starting with this string are skipped, by default "#".
+    max_order : int, optional
+        If not None, edges larger than `max_order + 1` are skipped.
+        By default, None.
+
+    Yields
+    ------
+    list of tuples
+        A chunk of edges.
+    """
+    chunk = []
+    with open(path) as file:
+        for line in file:
+            if line.startswith(comments):
+                continue
+            e = tuple(int(n) for n in line.split(delimiter))
+            if not e or (max_order is not None and len(e) > max_order + 1):
+                continue
+            chunk.append(e)
+            if len(chunk) == chunksize:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def out_of_core_simpliciality(
+    path,
+    min_size=2,
+    exclude_min_size=True,
+    max_order=None,
+    buffer_size=1000000,
+    chunksize=100000,
+    delimiter=None,
+    work_dir=None,
+):
+    """Computes the simplicial fraction, edit simpliciality, and face edit
+    simpliciality of an edge list that does not fit in memory.
+
+    The edge list is read in chunks and its edges are stored as packed keys
+    in a face index built from sorted runs that are merged on disk. The
+    maximal faces are then streamed against this index, and the missing
+    subfaces are deduplicated with another set of sorted runs.
+    The peak memory is roughly `buffer_size` keys of `8 * (max_order + 1)`
+    bytes each plus one chunk of edges, no matter the size of the data.
+
+    Parameters
+    ----------
+    path : str
+        An edge list of non-negative integer nodes, one edge per line.
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 2.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+    max_order : int, optional
+        The maximum edge order to read. If None (default), the file
+        is read once beforehand to find the largest edge.
+    buffer_size : int, optional
+        The maximum number of packed keys held in memory, by default 1000000.
+    chunksize : int, optional
+        The number of edges read from the file at a time, by default 100000.
+    delimiter : str, optional
+        The separator between members. If None (default), any whitespace.
+    work_dir : str, optional
+        The directory for the on-disk index and sorted runs. If None (default),
+        the system's temporary directory is used.
+
+    Returns
+    -------
+    dict
+        The keys "sf", "es", and "fes" with the simplicial fraction, the
+        edit simpliciality, and the face edit simpliciality respectively.
+
+    See Also
+    --------
+    simplicial_fraction
+    edit_simpliciality
+    face_edit_simpliciality
+
+    Notes
+    -----
+    Duplicate edges are counted once, so the results agree with the
+    in-memory measures on a hypergraph without multiedges, for example,
+    after `Hypergraph.cleanup()`.
+    """
+    chunks = partial(
+        read_edgelist_chunks,
+        path,
+        chunksize=chunksize,
+        delimiter=delimiter,
+        max_order=max_order,
+    )
+    if max_order is None:
+        width = max((max(map(len, c)) for c in chunks()), default=1)
+    else:
+        width = max_order + 1
+
+    work_dir = tempfile.mkdtemp(prefix="sod-ooc-", dir=work_dir)
+    try:
+        # all edges of size min_size or larger
+        with KeyRuns(width, work_dir, buffer_size) as runs:
+            for chunk in chunks():
+                for k, nodes in _group_by_size(chunk):
+                    if k >= min_size:
+                        runs.add(pack_array(nodes, width))
+            edges = FaceIndex.from_runs(runs, os.path.join(work_dir, "edges.bin"))
+
+        # edges contained in another edge and the number of simplices
+        ns = 0
+        ps = 0
+        with KeyRuns(width, work_dir, buffer_size) as runs:
+            for nodes in face_blocks(edges.keys, min_size, buffer_size):
+                k = nodes.shape[1]
+                is_simplex = np.ones(len(nodes), dtype=bool)
+                for present, keys in edges.subfaces(nodes, min_size):
+                    runs.add(keys[present.ravel()])
+                    is_simplex &= present.all(axis=1)
+                if k >= min_size + exclude_min_size:
+                    ps += len(nodes)
+                    ns += int(is_simplex.sum())
+            covered = FaceIndex.from_runs(runs, os.path.join(work_dir, "covered.bin"))
+
+        # missing subfaces of the maximal faces
+        mf = 0
+        fes_sum = 0.0
+        with KeyRuns(width, work_dir, buffer_size) as runs:
+            for nodes in face_blocks(
+                edges.keys, min_size + exclude_min_size, buffer_size
+            ):
+                nodes = nodes[~covered.contains(pack_array(nodes, width))]
+                if len(nodes) == 0:
+                    continue
+                k = nodes.shape[1]
+                d = np.zeros(len(nodes))
+                for present, keys in edges.subfaces(nodes, min_size):
+                    runs.add(keys[~present.ravel()])
+                    d += (~present).sum(axis=1)
+                m = max_number_of_subfaces(min_size, k)
+                if m != 0:
+                    d *= 1.0 / m
+                mf += len(nodes)
+                fes_sum += d.sum()
+            ms = runs.merge()
+
+        s = len(edges)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    sf = ns / ps if ps > 0 else np.nan
+    fes = 1 - fes_sum / mf if mf > 0 else 1.0
+    if mf > 0 and s - mf + ms > 0:
+        es = 1 - ms / (s - mf + ms)
+    else:
+        es = np.nan
+    return {"sf": sf, "es": es, "fes": fes}
+
+
+def _group_by_size(chunk):
+    sizes = np.fromiter(map(len, chunk), dtype=int, count=len(chunk))
+    for k in np.unique(sizes):
+        idx = np.flatnonzero(sizes == k)
+        yield k, np.array([chunk[i] for i in idx], dtype=np.int64).reshape(len(idx), k)
@@ -1,10 +1,13 @@
 import numpy as np
 import xgi
 
+from ..cache import cached
+from ..instrument import get_instrumentation, phase
 from ..trie import Trie
 from .utilities import count_missing_subfaces, missing_subfaces
 
 
+@cached
 def simplicial_edit_distance(H, min_size=2, exclude_min_size=True, normalize=True):
     """Computes the simplicial edit distance.
 
@@ -66,38 +69,37 @@ def simplicial_edit_distance(H, min_size=2, exclude_min_size=True, normalize=Tru
     by Nicholas Landry, Jean-Gabriel Young, and Nicole Eikmeier,
     *EPJ Data Science* **13**, 17 (2024).
     """
-    edges = H.edges.filterby("size", min_size, "geq").members()
+    with phase("filterby"):
+        edges = H.edges.filterby("size", min_size, "geq").members()
 
     t = Trie()
     t.build_trie(edges)
 
-    maxH = xgi.Hypergraph(
-        H.edges.maximal()
-        .filterby("size", min_size + exclude_min_size, "geq")
-        .members(dtype=dict)
-    )
+    with phase("maximal"):
+        maxH = xgi.Hypergraph(
+            H.edges.maximal()
+            .filterby("size", min_size + exclude_min_size, "geq")
+            .members(dtype=dict)
+        )
     if not maxH.edges:
         return np.nan
 
+    rec = get_instrumentation()
+    if rec is not None:
+        rec.count("maximal_faces", maxH.num_edges)
+
     id_to_num = dict(zip(maxH.edges, range(maxH.num_edges)))
     ms = 0
-    for id1, e in maxH.edges.members(dtype=dict).items():
-        redundant_missing_faces = set()
-        for id2 in maxH.edges.neighbors(id1):
-            if id_to_num[id2] < id_to_num[id1]:
-                c = maxH._edge[id2].intersection(e)
-                if len(c) >= min_size:
-                    redundant_missing_faces.update(missing_subfaces(t, c, min_size))
-
-                    # we don't have to worry about the intersection being a max face
-                    # because a) there are no multiedges and b) these are all maximal
-                    # faces so no inclusions.
-                    if not t.search(c):
-                        redundant_missing_faces.add(frozenset(c))
-
-        mf = count_missing_subfaces(t, e, min_size)
-        rmf = len(redundant_missing_faces)
-        ms += mf - rmf
+    with phase("subfaces"):
+        for id1, e in maxH.edges.members(dtype=dict).items():
+            if rec is None:
+                rmf = _redundant_missing_faces(t, maxH, id1, id_to_num, min_size)
+            else:
+                rmf = _redundant_missing_faces_instrumented(
+                    rec, t, maxH, id1, id_to_num, min_size
+                )
+            mf = count_missing_subfaces(t, e, min_size)
+            ms += mf - len(rmf)
 
     if normalize:
         s = len(edges)
@@ -108,3 +110,45 @@ def simplicial_edit_distance(H, min_size=2, exclude_min_size=True, normalize=Tru
             return np.nan
     else:
         return ms
+
+
+def _redundant_missing_faces(t, maxH, id1, id_to_num, min_size):
+    # the missing subfaces of a maximal face that are also missing from a
+    # maximal face before it, and so are already counted
+    e = maxH._edge[id1]
+    redundant_missing_faces = set()
+    for id2 in maxH.edges.neighbors(id1):
+        if id_to_num[id2] < id_to_num[id1]:
+            c = maxH._edge[id2].intersection(e)
+            if len(c) >= min_size:
+                redundant_missing_faces.update(missing_subfaces(t, c, min_size))
+
+                # we don't have to worry about the intersection being a
+                # max face because a) there are no multiedges and b) these
+                # are all maximal faces so no inclusions.
+                if not t.search(c):
+                    redundant_missing_faces.add(frozenset(c))
+    return redundant_missing_faces
+
+
+def _redundant_missing_faces_instrumented(rec, t, maxH, id1, id_to_num, min_size):
+    e = maxH._edge[id1]
+    redundant_missing_faces = set()
+    intersections = 0
+    lookups = 0
+    hits = 0
+    for id2 in maxH.edges.neighbors(id1):
+        if id_to_num[id2] < id_to_num[id1]:
+            c = maxH._edge[id2].intersection(e)
+            intersections += 1
+            if len(c) >= min_size:
+                redundant_missing_faces.update(missing_subfaces(t, c, min_size))
+                lookups += 1
+                if not t.search(c):
+                    redundant_missing_faces.add(frozenset(c))
+                else:
+                    hits += 1
+    rec.count("neighbor_intersections", intersections)
+    rec.count("trie.lookups", lookups)
+    rec.count("trie.hits", hits)
+    return redundant_missing_faces
@@ -1,9 +1,12 @@
 import numpy as np
 
+from ..cache import cached
+from ..instrument import get_instrumentation, phase
 from ..trie import Trie
 from .utilities import powerset
 
 
+@cached
 def simplicial_fraction(H, min_size=2, exclude_min_size=True):
     """Computing the simplicial fraction for a hypergraph.
 
@@ -58,13 +61,63 @@ def simplicial_fraction(H, min_size=2, exclude_min_size=True):
     *EPJ Data Science* **13**, 17 (2024).
     """
     try:
-        ns = count_simplices(H, min_size, exclude_min_size)
-        ps = potential_simplices(H, min_size, exclude_min_size)
+        ns, ps = simplex_counts(H, min_size, exclude_min_size)
         return ns / ps
     except ZeroDivisionError:
         return np.nan
 
 
+def simplex_counts(H, min_size=2, exclude_min_size=True, edges=None):
+    """Counts the simplices and the potential simplices of a hypergraph.
+
+    The counts over disjoint subsets of edges add up, so the simplicial
+    fraction of a large hypergraph can be split into parallel tasks.
+
+    Parameters
+    ----------
+    H : Hypergraph
+        The hypergraph of interest
+    min_size: int, optional
+        The minimum hyperedge size to include when
+        calculating whether a hyperedge is a simplex
+        by counting subfaces. By default, 2.
+    exclude_min_size : bool, optional
+        Whether to exclude minimal simplices when counting simplices.
+        By default, True.
+    edges : iterable, optional
+        The IDs of the edges to count. If None (default), all
+        the edges are counted.
+
+    Returns
+    -------
+    tuple of int
+        The number of simplices and the number of potential simplices.
+
+    See Also
+    --------
+    simplicial_fraction
+    """
+    if edges is None:
+        return (
+            count_simplices(H, min_size, exclude_min_size),
+            potential_simplices(H, min_size, exclude_min_size),
+        )
+
+    t = Trie()
+    t.build_trie(H.edges.members())
+
+    ns = 0
+    ps = 0
+    with phase("simplices"):
+        for e in edges:
+            e = H.edges.members(e)
+            if len(e) >= min_size + exclude_min_size:
+                ps += 1
+                if is_simplex(t, e, min_size):
+                    ns += 1
+    return ns, ps
+
+
 def potential_simplices(H, min_size=2, exclude_min_size=True):
     # record total number of hyperedges that are potential simplices
     return len(H.edges.filterby("size", min_size + exclude_min_size, "geq"))
@@ -76,19 +129,39 @@ def count_simplices(H, min_size=2, exclude_min_size=True):
     all_edges = H.edges.members()
     t.build_trie(all_edges)
 
-    edges = H.edges.filterby("size", min_size + exclude_min_size, "geq").members()
+    with phase("filterby"):
+        edges = H.edges.filterby("size", min_size + exclude_min_size, "geq").members()
 
     # for each hyperedge, determine if it's a simplex
     count = 0
     # The following loop is embarassingly parallel, so parallelize to increase speed would be good
-    for e in edges:
-        if is_simplex(t, e, min_size):
-            count += 1
+    with phase("simplices"):
+        for e in edges:
+            if is_simplex(t, e, min_size):
+                count += 1
     return count
 
 
 def is_simplex(t, edge, min_size=2):
+    rec = get_instrumentation()
+    if rec is not None:
+        return _is_simplex_instrumented(rec, t, edge, min_size)
+
     for e in powerset(edge, min_size):
         if not t.search(e):
             return False
     return True
+
+
+def _is_simplex_instrumented(rec, t, edge, min_size):
+    lookups = 0
+    found = True
+    for e in powerset(edge, min_size):
+        lookups += 1
+        if not t.search(e):
+            found = False
+            break
+    rec.count("subsets", lookups)
+    rec.count("trie.lookups", lookups)
+    rec.count("trie.hits", lookups - (not found))
+    return found
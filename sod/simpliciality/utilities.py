@@ -4,6 +4,9 @@ import numpy as np
 import xgi
 from scipy.special import binom
 
+from ..cache import cached
+from ..instrument import get_instrumentation
+
 
 # This implements the size-restricted power set
 def powerset(iterable, min_size=1, max_size=None):
@@ -64,6 +67,9 @@ def count_missing_subfaces(t, face, min_size=1):
         if not t.search(e):
             count += 1
 
+    rec = get_instrumentation()
+    if rec is not None:
+        _count_lookups(rec, len(sub_edges), len(sub_edges) - count)
     return count
 
 
@@ -91,9 +97,20 @@ def missing_subfaces(t, face, min_size=1):
     for e in sub_edges:
         if not t.search(e):
             ms.add(frozenset(e))
+
+    rec = get_instrumentation()
+    if rec is not None:
+        _count_lookups(rec, len(sub_edges), len(sub_edges) - len(ms))
     return ms
 
 
+def _count_lookups(rec, lookups, hits):
+    # every enumerated subface is looked up once
+    rec.count("subsets", lookups)
+    rec.count("trie.lookups", lookups)
+    rec.count("trie.hits", hits)
+
+
 def max_number_of_subfaces(min_size, max_size):
     d = 2**max_size - 2  # subtract 2 for the face itself and the empty set
     for i in range(1, min_size):
@@ -101,32 +118,82 @@ def max_number_of_subfaces(min_size, max_size):
     return int(d)
 
 
+@cached
 def simplicial_assortativity(H, metric, weighted=False):
+    s = local_simpliciality(H, metric)
+    return assortativity(H, [s[n] for n in H.nodes], weighted=weighted)
+
+
+def local_simpliciality(H, metric, nodes=None):
+    """Computes a local measure of simpliciality of each node.
+
+    Parameters
+    ----------
+    H : xgi.Hypergraph
+        The hypergraph of interest
+    metric : str
+        "sf", "es", or "fes".
+    nodes : iterable, optional
+        The nodes of interest. If None (default), all the nodes.
+        The nodes can be split into parallel tasks.
+
+    Returns
+    -------
+    dict
+        The local simpliciality of each node.
+
+    Raises
+    ------
+    Exception
+        If the metric is invalid.
+    """
+    from .local import (
+        local_edit_simpliciality,
+        local_face_edit_simpliciality,
+        local_simplicial_fraction,
+    )
+
     match metric:
         case "sf":
-            s = H.nodes.local_simplicial_fraction.asnumpy()
+            f = local_simplicial_fraction
         case "es":
-            s = H.nodes.local_edit_simpliciality.asnumpy()
+            f = local_edit_simpliciality
         case "fes":
-            s = H.nodes.local_face_edit_simpliciality.asnumpy()
+            f = local_face_edit_simpliciality
         case _:
             raise Exception(f"{metric} is an invalid metric!")
+    return f(H, H.nodes if nodes is None else nodes)
+
+
+def assortativity(H, s, weighted=False):
+    """The correlation of a node property across the edges of the projection.
 
+    Parameters
+    ----------
+    H : xgi.Hypergraph
+        The hypergraph of interest
+    s : array-like
+        The property of each node, in the order of `H.nodes`.
+        Nodes with NaN values are ignored.
+    weighted : bool, optional
+        Whether to weight pairs of nodes by the number of edges
+        they share, by default False.
+
+    Returns
+    -------
+    float
+        The Pearson correlation coefficient.
+    """
+    s = np.asarray(s, dtype=float)
     A = xgi.adjacency_matrix(H, sparse=False, weighted=True)
-    n = A.shape[0]
-    x = []
-    y = []
-    for i in range(n):
-        for j in range(i):
-            if A[i, j] and not np.isnan(s[i]) and not np.isnan(s[j]):
-                if weighted:
-                    x.extend([s[i]] * int(A[i, j]))
-                    x.extend([s[j]] * int(A[i, j]))
-                    y.extend([s[j]] * int(A[i, j]))
-                    y.extend([s[i]] * int(A[i, j]))
-                else:
-                    x.append(s[i])
-                    x.append(s[j])
-                    y.append(s[j])
-                    y.append(s[i])
+    i, j = np.nonzero(np.tril(A, -1))
+    keep = ~np.isnan(s[i]) & ~np.isnan(s[j])
+    i = i[keep]
+    j = j[keep]
+    if weighted:
+        w = A[i, j].astype(int)
+        i = np.repeat(i, w)
+        j = np.repeat(j, w)
+    x = np.concatenate([s[i], s[j]])
+    y = np.concatenate([s[j], s[i]])
     return np.corrcoef(x, y)[0, 1]
@@ -0,0 +1,320 @@
+"""Streaming statistics of ensembles of null-model realizations.
+
+The mean and variance are updated with Welford's algorithm and quantiles are
+estimated from a fixed histogram, so the memory footprint doesn't grow with
+the number of realizations. Since the measures of simpliciality lie in
+[0, 1], a histogram over that interval resolves their quantiles to the width
+of a bin.
+"""
+
+import warnings
+
+import numpy as np
+from joblib import Parallel
+from scipy.stats import t as student_t
+
+
+class RunningStats:
+    """The running summary statistics of a stream of numbers.
+
+    NaN values are counted separately and don't enter the statistics.
+
+    Parameters
+    ----------
+    bins : int, optional
+        The number of bins of the histogram, by default 100.
+    range : tuple of float, optional
+        The range of the histogram, by default (0, 1). Values outside
+        of it are counted in the first or last bin.
+    """
+
+    def __init__(self, bins=100, range=(0.0, 1.0)):
+        self.count = 0
+        self.nan_count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.edges = np.linspace(*range, bins + 1)
+        self.histogram = np.zeros(bins, dtype=np.int64)
+
+    def add(self, x):
+        """Adds a value.
+
+        Parameters
+        ----------
+        x : float
+            The value to add.
+        """
+        if x is None or np.isnan(x):
+            self.nan_count += 1
+            return
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        self.histogram[self._bin(x)] += 1
+
+    def update(self, values):
+        """Adds several values.
+
+        Parameters
+        ----------
+        values : iterable of float
+            The values to add.
+        """
+        for x in values:
+            self.add(x)
+
+    def merge(self, other):
+        """Adds the values summarized by other statistics.
+
+        Parameters
+        ----------
+        other : RunningStats
+            The statistics to merge, with the same histogram bins.
+        """
+        n = self.count + other.count
+        if n:
+            delta = other.mean - self.mean
+            self._m2 += other._m2 + delta**2 * self.count * other.count / n
+            self.mean += delta * other.count / n
+        self.count = n
+        self.nan_count += other.nan_count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.histogram += other.histogram
+
+    @property
+    def var(self):
+        """The sample variance."""
+        return self._m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        """The sample standard deviation."""
+        return np.sqrt(self.var)
+
+    @property
+    def sem(self):
+        """The standard error of the mean."""
+        return self.std / np.sqrt(self.count) if self.count > 1 else np.nan
+
+    def quantile(self, q):
+        """Estimates a quantile from the histogram.
+
+        Values are assumed to be uniformly distributed within each bin.
+
+        Parameters
+        ----------
+        q : float
+            The quantile, between 0 and 1.
+
+        Returns
+        -------
+        float
+            The estimate, or NaN if there are no values.
+        """
+        if self.count == 0:
+            return np.nan
+        cdf = np.concatenate([[0], np.cumsum(self.histogram)]) / self.count
+        x = np.interp(q, cdf, self.edges)
+        # the histogram only knows the values up to a bin
+        return float(np.clip(x, self.min, self.max))
+
+    def confidence_interval(self, confidence=0.95):
+        """The confidence interval of the mean.
+
+        Parameters
+        ----------
+        confidence : float, optional
+            The confidence level, by default 0.95.
+
+        Returns
+        -------
+        tuple of float
+            The bounds of the interval from the Student's t-distribution,
+            or NaN if there are fewer than two values.
+        """
+        if self.count < 2:
+            return np.nan, np.nan
+        h = student_t.ppf((1 + confidence) / 2, self.count - 1) * self.sem
+        return self.mean - h, self.mean + h
+
+    def summary(self, confidence=0.95):
+        """The statistics as a JSON-serializable dict.
+
+        Parameters
+        ----------
+        confidence : float, optional
+            The confidence level of the interval, by default 0.95.
+
+        Returns
+        -------
+        dict
+            The summary statistics.
+        """
+        lo, hi = self.confidence_interval(confidence)
+        return {
+            "count": self.count,
+            "nan-count": self.nan_count,
+            "mean": self.mean if self.count else np.nan,
+            "std": self.std,
+            "min": self.min if self.count else np.nan,
+            "max": self.max if self.count else np.nan,
+            "median": self.quantile(0.5),
+            "quantiles": {q: self.quantile(q) for q in [0.025, 0.25, 0.75, 0.975]},
+            "ci": [lo, hi],
+            "histogram": self.histogram.tolist(),
+            "bin-edges": self.edges.tolist(),
+        }
+
+    def _bin(self, x):
+        i = np.searchsorted(self.edges, x, side="right") - 1
+        return min(max(i, 0), len(self.histogram) - 1)
+
+
+class EnsembleRunner:
+    """Runs realizations until the means of all metrics are precise enough.
+
+    Parameters
+    ----------
+    metrics : list of str, optional
+        The names of the metrics each realization returns, in order.
+        By default, ["sf", "es", "fes"].
+    target_width : float, optional
+        The width of the confidence interval of the mean of every metric
+        below which to stop. If None (default), all the realizations run.
+    confidence : float, optional
+        The confidence level of the intervals, by default 0.95.
+    min_realizations : int, optional
+        The minimum number of realizations before stopping, by default 10.
+    bins : int, optional
+        The number of histogram bins of each metric, by default 100.
+
+    Examples
+    --------
+    >>> runner = EnsembleRunner(target_width=0.01)  # doctest: +SKIP
+    >>> runner.run(delayed(realization)(i) for i in range(1000))  # doctest: +SKIP
+    >>> runner.summary()  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        metrics=("sf", "es", "fes"),
+        target_width=None,
+        confidence=0.95,
+        min_realizations=10,
+        bins=100,
+    ):
+        self.metrics = list(metrics)
+        self.target_width = target_width
+        self.confidence = confidence
+        self.min_realizations = min_realizations
+        self.stats = {m: RunningStats(bins) for m in self.metrics}
+        self.realizations = 0
+
+    def add(self, values):
+        """Adds the metrics of a realization.
+
+        Parameters
+        ----------
+        values : sequence of float
+            The value of each metric, in the order of `metrics`.
+        """
+        for m, x in zip(self.metrics, values):
+            self.stats[m].add(x)
+        self.realizations += 1
+
+    def widths(self):
+        """The widths of the confidence intervals of the means.
+
+        Returns
+        -------
+        dict
+            The width for each metric, NaN if it isn't known yet.
+        """
+        widths = dict()
+        for m, s in self.stats.items():
+            lo, hi = s.confidence_interval(self.confidence)
+            widths[m] = hi - lo
+        return widths
+
+    def converged(self):
+        """Whether enough realizations have run.
+
+        Returns
+        -------
+        bool
+            True if there is a target width, there are at least
+            `min_realizations`, and every interval is narrower than the
+            target.
+        """
+        if self.target_width is None or self.realizations < self.min_realizations:
+            return False
+        # NaN widths compare as False, so they never count as converged
+        return all(w <= self.target_width for w in self.widths().values())
+
+    def run(self, tasks, num_processes=None, callback=None):
+        """Runs realizations in parallel until they converge.
+
+        The realizations run in the order they are given and are added in
+        that order, whichever finishes first, so the realizations kept are
+        always the first ones and an early-stopped run is reproducible from
+        the seeds of its realizations. The runner stops submitting them as
+        soon as the statistics converge. At most a few realizations that
+        were already running are discarded.
+
+        Parameters
+        ----------
+        tasks : iterable of joblib.delayed calls
+            The realizations. Each returns a pair of a key identifying it
+            and the values of the metrics.
+        num_processes : int, optional
+            The number of processes, by default None, in which case joblib
+            runs the tasks sequentially.
+        callback : callable, optional
+            A function called with the key and the values of each
+            realization as it finishes, for example, to log it.
+
+        Returns
+        -------
+        int
+            The number of realizations that ran.
+        """
+        if self.converged():
+            return 0
+
+        n = 0
+        # submit realizations one at a time and no earlier than needed
+        results = Parallel(
+            n_jobs=num_processes,
+            return_as="generator",
+            pre_dispatch="n_jobs",
+            batch_size=1,
+        )(tasks)
+        for key, values in results:
+            self.add(values)
+            n += 1
+            if callback is not None:
+                callback(key, values)
+            if self.converged():
+                break
+        # stop the tasks that are still running, whose results aren't needed
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            results.close()
+        return n
+
+    def summary(self):
+        """The statistics of every metric.
+
+        Returns
+        -------
+        dict
+            The summary statistics of each metric, as returned by
+            `RunningStats.summary`.
+        """
+        return {m: s.summary(self.confidence) for m, s in self.stats.items()}
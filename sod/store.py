@@ -0,0 +1,319 @@
+"""A local store of datasets in a compact binary format.
+
+Each dataset is a directory of NumPy arrays holding its incidence structure,
+which can be memory-mapped, and a small JSON file with metadata. Edges are kept
+in their original order, and an index of the edges sorted by size makes
+filtering by `max_order` a slice instead of a scan.
+"""
+
+import json
+import os
+
+import numpy as np
+import xgi
+
+from .incidence import hypergraph_from_arrays, incidence_arrays
+
+_FORMAT_VERSION = 1
+_ARRAYS = ["node_ids", "edge_ids", "edge_ptr", "edge_members", "size_order"]
+
+
+class CompactHypergraph:
+    """The flat incidence arrays of a hypergraph.
+
+    The members of edge i are the node indices
+    `edge_members[edge_ptr[i]:edge_ptr[i + 1]]` and the IDs of the nodes
+    are `node_ids`. The arrays have the same keys as those returned by
+    `incidence_arrays`, so they can be published with `publish_arrays`
+    or indexed with `face_index`.
+
+    Parameters
+    ----------
+    node_ids : numpy.ndarray
+        The node IDs.
+    edge_ids : numpy.ndarray
+        The edge IDs.
+    edge_ptr : numpy.ndarray
+        The offsets of the edges into `edge_members`.
+    edge_members : numpy.ndarray
+        The node indices of the members of each edge.
+    timestamps : numpy.ndarray, optional
+        The timestamp of each edge, by default None.
+    """
+
+    def __init__(self, node_ids, edge_ids, edge_ptr, edge_members, timestamps=None):
+        self.node_ids = node_ids
+        self.edge_ids = edge_ids
+        self.edge_ptr = edge_ptr
+        self.edge_members = edge_members
+        self.timestamps = timestamps
+
+    @property
+    def num_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.edge_ids)
+
+    @property
+    def sizes(self):
+        """The size of each edge."""
+        return np.diff(self.edge_ptr)
+
+    @property
+    def arrays(self):
+        """The incidence arrays as a dict."""
+        arrays = {
+            "node_ids": self.node_ids,
+            "edge_ids": self.edge_ids,
+            "edge_ptr": self.edge_ptr,
+            "edge_members": self.edge_members,
+        }
+        if self.timestamps is not None:
+            arrays["timestamps"] = self.timestamps
+        return arrays
+
+    def members(self):
+        """The members of each edge as lists of node IDs.
+
+        Returns
+        -------
+        list of lists
+            The edge members in edge order.
+        """
+        node_ids = self.node_ids.tolist()
+        ptr = self.edge_ptr
+        members = self.edge_members
+        return [
+            [node_ids[i] for i in members[ptr[j] : ptr[j + 1]]]
+            for j in range(self.num_edges)
+        ]
+
+    def to_hypergraph(self):
+        """Converts to an xgi Hypergraph.
+
+        Returns
+        -------
+        xgi.Hypergraph
+            The hypergraph with a "timestamp" edge attribute if
+            there are timestamps.
+        """
+        H = hypergraph_from_arrays(self.arrays)
+        if self.timestamps is not None:
+            H.set_edge_attributes(
+                {
+                    id: {"timestamp": t}
+                    for id, t in zip(self.edge_ids.tolist(), self.timestamps.tolist())
+                }
+            )
+        return H
+
+    @classmethod
+    def from_hypergraph(cls, H):
+        """Converts an xgi Hypergraph.
+
+        Parameters
+        ----------
+        H : xgi.Hypergraph
+            The hypergraph of interest. If all its edges have a "timestamp"
+            attribute, the timestamps are kept.
+
+        Returns
+        -------
+        CompactHypergraph
+            The compact hypergraph.
+        """
+        arrays = incidence_arrays(H)
+        timestamps = H.edges.attrs("timestamp").asdict()
+        if H.num_edges and all(t is not None for t in timestamps.values()):
+            timestamps = np.array([timestamps[id] for id in H.edges])
+        else:
+            timestamps = None
+        return cls(**arrays, timestamps=timestamps)
+
+
+def save_dataset(H, path, name=None):
+    """Saves a hypergraph to the local store.
+
+    Parameters
+    ----------
+    H : xgi.Hypergraph or CompactHypergraph
+        The hypergraph to save.
+    path : str
+        The directory of the dataset. It is created if it doesn't exist.
+    name : str, optional
+        The name of the dataset, stored in the metadata. By default, None.
+
+    See Also
+    --------
+    load_dataset
+    import_xgi_json
+    """
+    if isinstance(H, xgi.Hypergraph):
+        H = CompactHypergraph.from_hypergraph(H)
+
+    sizes = H.sizes
+    size_order = np.argsort(sizes, kind="stable")
+    # size_index[k] is the number of edges of size k or less
+    size_index = np.cumsum(np.bincount(sizes, minlength=1))
+
+    os.makedirs(path, exist_ok=True)
+    arrays = dict(H.arrays, size_order=size_order)
+    for key, a in arrays.items():
+        np.save(os.path.join(path, f"{key}.npy"), np.asarray(a))
+
+    meta = {
+        "format": _FORMAT_VERSION,
+        "name": name,
+        "num_nodes": H.num_nodes,
+        "num_edges": H.num_edges,
+        "size_index": size_index.tolist(),
+        "timestamps": H.timestamps is not None,
+    }
+    with open(os.path.join(path, "meta.json"), "w") as file:
+        file.write(json.dumps(meta, indent=2))
+
+
+def import_xgi_json(fname, path, nodetype=None, edgetype=None):
+    """Imports a dataset in the xgi-data JSON format into the local store.
+
+    The JSON file is parsed directly, without building a Hypergraph.
+
+    Parameters
+    ----------
+    fname : str
+        The JSON file, for example, downloaded with `xgi.download_xgi_data`.
+    path : str
+        The directory of the dataset in the store.
+    nodetype : type, optional
+        The type to cast the node IDs to, by default None.
+    edgetype : type, optional
+        The type to cast the edge IDs to, by default None.
+
+    Raises
+    ------
+    ValueError
+        If the file is not in the xgi-data JSON format.
+    """
+    with open(fname) as file:
+        data = json.loads(file.read())
+
+    if "edge-dict" not in data:
+        raise ValueError(f"{fname} is not in the xgi-data JSON format!")
+
+    cast_node = (lambda n: n) if nodetype is None else nodetype
+    cast_edge = (lambda e: e) if edgetype is None else edgetype
+
+    node_index = {}
+    for n in data.get("node-data", {}):
+        node_index.setdefault(cast_node(n), len(node_index))
+
+    edge_ids = []
+    sizes = []
+    members = []
+    for id, e in data["edge-dict"].items():
+        e = {cast_node(n) for n in e}
+        for n in e:
+            node_index.setdefault(n, len(node_index))
+        edge_ids.append(cast_edge(id))
+        sizes.append(len(e))
+        members.extend(node_index[n] for n in e)
+
+    edge_ptr = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=edge_ptr[1:])
+
+    edge_data = data.get("edge-data", {})
+    timestamps = [edge_data.get(id, {}).get("timestamp") for id in data["edge-dict"]]
+    if timestamps and all(t is not None for t in timestamps):
+        timestamps = np.array(timestamps)
+    else:
+        timestamps = None
+
+    H = CompactHypergraph(
+        np.array(list(node_index)),
+        np.array(edge_ids),
+        edge_ptr,
+        np.array(members, dtype=np.int64),
+        timestamps,
+    )
+    name = data.get("hypergraph-data", {}).get("name")
+    save_dataset(H, path, name=name)
+
+
+def load_dataset(
+    dataset, max_order=None, store="Data/store", compact=False, download=True
+):
+    """Loads a dataset from the local store.
+
+    The arrays are memory-mapped, so loading takes milliseconds
+    regardless of the size of the dataset.
+
+    Parameters
+    ----------
+    dataset : str
+        The name of the dataset in the store or the path of its directory.
+    max_order : int, optional
+        Maximum order of edges to load, by default None.
+    store : str, optional
+        The directory of the store, by default "Data/store".
+    compact : bool, optional
+        Whether to return the compact representation instead of
+        an xgi Hypergraph, by default False.
+    download : bool, optional
+        If the dataset is not in the store, whether to fetch it once with
+        `xgi.load_xgi_data` and save it to the store. By default, True.
+
+    Returns
+    -------
+    xgi.Hypergraph or CompactHypergraph
+        The dataset.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the dataset is not in the store and `download` is False.
+    """
+    path = dataset if os.path.isdir(dataset) else os.path.join(store, dataset)
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        if not download:
+            raise FileNotFoundError(f"{dataset} is not in the local store!")
+        save_dataset(xgi.load_xgi_data(dataset), path, name=dataset)
+
+    with open(os.path.join(path, "meta.json")) as file:
+        meta = json.loads(file.read())
+
+    keys = list(_ARRAYS)
+    if meta["timestamps"]:
+        keys.append("timestamps")
+    arrays = {key: _load_array(os.path.join(path, f"{key}.npy")) for key in keys}
+    size_order = arrays.pop("size_order")
+    H = CompactHypergraph(**arrays)
+
+    size_index = meta["size_index"]
+    if max_order is not None and max_order + 1 < len(size_index) - 1:
+        n = size_index[max(max_order + 1, 0)]
+        H = _select_edges(H, np.sort(size_order[:n]))
+
+    return H if compact else H.to_hypergraph()
+
+
+def _select_edges(H, idx):
+    ptr = H.edge_ptr
+    sizes = ptr[idx + 1] - ptr[idx]
+    edge_ptr = np.zeros(len(idx) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=edge_ptr[1:])
+    offsets = np.repeat(ptr[idx] - edge_ptr[:-1], sizes)
+    members = H.edge_members[offsets + np.arange(edge_ptr[-1])]
+
+    timestamps = None if H.timestamps is None else H.timestamps[idx]
+    return CompactHypergraph(H.node_ids, H.edge_ids[idx], edge_ptr, members, timestamps)
+
+
+def _load_array(fname):
+    try:
+        return np.load(fname, mmap_mode="r")
+    except ValueError:
+        # IDs of mixed types are stored as Python objects, which can't be
+        # memory-mapped
+        return np.load(fname, allow_pickle=True)
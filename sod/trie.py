@@ -1,5 +1,7 @@
 # This Trie implementation comes from user Ajay Rawat, https://stackoverflow.com/questions/11015320/how-to-create-a-trie-in-python
 
+from .instrument import get_instrumentation
+
 
 class TrieNode:
     def __init__(self):
@@ -13,16 +15,29 @@ class Trie:
         self.root = TrieNode()
 
     def build_trie(self, words):
-        for word in words:
-            self.insert(word)
+        rec = get_instrumentation()
+        if rec is None:
+            for word in words:
+                self.insert(word)
+            return
+
+        with rec.phase("trie.build"):
+            created = 0
+            for word in words:
+                created += self.insert(word)
+        rec.count("trie.nodes", created)
 
     def insert(self, word):
+        # returns the number of nodes created
         node = self.root
+        created = 0
         for char in sorted(word):
             if char not in node.children:
                 node.children[char] = TrieNode()
+                created += 1
             node = node.children[char]
         node.end = True
+        return created
 
     def search(self, word):
         node = self.root
@@ -0,0 +1,254 @@
+"""Synthetic hypergraphs for measuring the performance of the metrics.
+
+The workloads mimic the empirical datasets at any scale without downloading
+them. Maximal edges are drawn as in the Chung-Lu model from target degree and
+size sequences, and a fraction of the subfaces of each maximal edge is added
+as edges, so the simpliciality can be tuned from that of a random hypergraph
+to that of a simplicial complex. The workloads are written to the local store,
+so they are loaded like any dataset.
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from .store import CompactHypergraph, save_dataset
+
+# The statistics of the empirical datasets with edges of at most 11 nodes.
+# The degrees are heterogeneous, and the exponent of the power law of the
+# expected degrees is a rough fit.
+PROFILES = {
+    "email-enron": {
+        "num_nodes": 143,
+        "num_edges": 1442,
+        "mean_edge_size": 2.97,
+        "degree_exponent": 2.5,
+    },
+    "congress-bills": {
+        "num_nodes": 1715,
+        "num_edges": 58788,
+        "mean_edge_size": 4.95,
+        "degree_exponent": 3.0,
+    },
+    "tags-ask-ubuntu": {
+        "num_nodes": 3021,
+        "num_edges": 145053,
+        "mean_edge_size": 3.43,
+        "degree_exponent": 2.2,
+    },
+}
+
+
+def workload(degrees, sizes, nesting=0.0, min_size=2, seed=None):
+    """Generates a hypergraph with planted subfaces.
+
+    Parameters
+    ----------
+    degrees : array-like
+        The expected number of maximal edges each node belongs to. The nodes
+        are labeled 0 to n-1.
+    sizes : array-like of int
+        The size of each maximal edge.
+    nesting : float, optional
+        The probability with which each subface of size at least `min_size`
+        of a maximal edge is added as an edge, from 0 (default), which leaves
+        the maximal edges alone, to 1, which makes a simplicial complex.
+        The number of subfaces grows as :math:`2^k` with the size k of the
+        edges, so use it with small edges.
+    min_size : int, optional
+        The minimum size of the planted subfaces, by default 2.
+    seed : int or numpy.random.SeedSequence, optional
+        The seed, by default None.
+
+    Returns
+    -------
+    CompactHypergraph
+        The hypergraph with the maximal edges first, in the order of `sizes`,
+        and then their planted subfaces. Duplicate edges are dropped.
+
+    Raises
+    ------
+    ValueError
+        If an edge is larger than the number of nodes with a positive
+        expected degree.
+
+    See Also
+    --------
+    workload_like
+    """
+    rng = np.random.default_rng(seed)
+    degrees = np.asarray(degrees, dtype=float)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if sizes.max(initial=0) > np.count_nonzero(degrees):
+        raise ValueError("The edges can't be larger than the number of nodes!")
+
+    edge_ptr = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=edge_ptr[1:])
+    members = _draw_members(rng, degrees / degrees.sum(), sizes, edge_ptr)
+
+    if nesting > 0:
+        sub_sizes, sub_members = _plant_subfaces(
+            rng, members, sizes, edge_ptr, nesting, min_size
+        )
+        sizes = np.concatenate([sizes, sub_sizes])
+        members = np.concatenate([members, sub_members])
+
+    sizes, members = _drop_duplicates(sizes, members)
+    edge_ptr = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=edge_ptr[1:])
+    return CompactHypergraph(
+        np.arange(len(degrees)), np.arange(len(sizes)), edge_ptr, members
+    )
+
+
+def workload_like(dataset, scale=1, nesting=0.0, max_size=11, seed=None):
+    """Generates a hypergraph like an empirical dataset.
+
+    Parameters
+    ----------
+    dataset : str
+        A dataset in `PROFILES`.
+    scale : float, optional
+        The factor by which the numbers of nodes and maximal edges are
+        multiplied, by default 1.
+    nesting : float, optional
+        The fraction of the subfaces that are planted, by default 0.
+        See `workload`.
+    max_size : int, optional
+        The maximum size of the edges, by default 11.
+    seed : int or numpy.random.SeedSequence, optional
+        The seed, by default None.
+
+    Returns
+    -------
+    CompactHypergraph
+        The hypergraph.
+
+    Raises
+    ------
+    KeyError
+        If there is no profile of the dataset.
+    """
+    profile = PROFILES[dataset]
+    rng = np.random.default_rng(seed)
+    n = max(int(round(profile["num_nodes"] * scale)), max_size)
+    m = int(round(profile["num_edges"] * scale))
+
+    # shifted geometric sizes with the mean of the dataset
+    p = 1 / (profile["mean_edge_size"] - 1)
+    sizes = np.minimum(rng.geometric(p, m) + 1, max_size)
+    # expected degrees of a power law
+    degrees = (1 - rng.random(n)) ** (-1 / (profile["degree_exponent"] - 1))
+    return workload(degrees, sizes, nesting=nesting, seed=rng)
+
+
+def write_workload(
+    name, like, scale=1, nesting=0.0, max_size=11, seed=None, store="Data/store"
+):
+    """Generates a hypergraph like an empirical dataset and saves it to the store.
+
+    Parameters
+    ----------
+    name : str
+        The name of the workload in the store.
+    like : str
+        A dataset in `PROFILES`.
+    scale : float, optional
+        The factor by which the dataset is scaled, by default 1.
+    nesting : float, optional
+        The fraction of the subfaces that are planted, by default 0.
+    max_size : int, optional
+        The maximum size of the edges, by default 11.
+    seed : int, optional
+        The seed, by default None.
+    store : str, optional
+        The directory of the store, by default "Data/store".
+
+    Returns
+    -------
+    str
+        The directory of the workload, which `load_dataset` accepts.
+
+    Examples
+    --------
+    >>> write_workload("enron-x10", "email-enron", scale=10, seed=0)  # doctest: +SKIP
+    >>> H = load_dataset("enron-x10")  # doctest: +SKIP
+    """
+    H = workload_like(like, scale, nesting=nesting, max_size=max_size, seed=seed)
+    path = os.path.join(store, name)
+    save_dataset(H, path, name=name)
+    return path
+
+
+def _draw_members(rng, p, sizes, edge_ptr):
+    members = rng.choice(len(p), size=edge_ptr[-1], p=p)
+    # redraw the repeated members of edges until there are none
+    bad = np.arange(len(sizes))
+    for _ in range(100):
+        idx = _positions(edge_ptr, bad)
+        edges = np.repeat(bad, sizes[bad])
+        order = np.lexsort((members[idx], edges))
+        repeated = np.zeros(len(idx), dtype=bool)
+        repeated[order[1:]] = (members[idx][order][1:] == members[idx][order][:-1]) & (
+            edges[order][1:] == edges[order][:-1]
+        )
+        if not repeated.any():
+            return members
+        members[idx[repeated]] = rng.choice(len(p), size=repeated.sum(), p=p)
+        bad = np.unique(edges[repeated])
+
+    # a few nodes have most of the weight, so draw the rest without replacement
+    for j in bad.tolist():
+        members[edge_ptr[j] : edge_ptr[j + 1]] = rng.choice(
+            len(p), size=sizes[j], replace=False, p=p
+        )
+    return members
+
+
+def _positions(edge_ptr, edges):
+    # the indices of the members of the edges
+    sizes = edge_ptr[edges + 1] - edge_ptr[edges]
+    offsets = np.repeat(edge_ptr[edges] - np.cumsum(sizes) + sizes, sizes)
+    return offsets + np.arange(sizes.sum())
+
+
+def _plant_subfaces(rng, members, sizes, edge_ptr, nesting, min_size, chunk=2**22):
+    sub_sizes = []
+    sub_members = []
+    for k in np.unique(sizes[sizes > min_size]).tolist():
+        edges = np.flatnonzero(sizes == k)
+        faces = members[edge_ptr[edges][:, None] + np.arange(k)]
+        bits = _subface_bits(k, min_size)
+        # each subface is planted independently, in chunks of edges
+        step = max(chunk // len(bits), 1)
+        for start in range(0, len(faces), step):
+            f = faces[start : start + step]
+            i, j = np.nonzero(rng.random((len(f), len(bits))) < nesting)
+            b = bits[j]
+            sub_sizes.append(b.sum(axis=1))
+            sub_members.append(f[i][b])
+    if not sub_sizes:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=members.dtype)
+    return np.concatenate(sub_sizes), np.concatenate(sub_members)
+
+
+@lru_cache(maxsize=None)
+def _subface_bits(k, min_size):
+    # the members of each proper subset of k members with at least min_size
+    # of them
+    masks = np.arange(1, 2**k - 1, dtype=np.int64)
+    bits = ((masks[:, None] >> np.arange(k)) & 1).astype(bool)
+    return bits[bits.sum(axis=1) >= min_size]
+
+
+def _drop_duplicates(sizes, members):
+    edge_ptr = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=edge_ptr[1:])
+    keep = np.zeros(len(sizes), dtype=bool)
+    for k in np.unique(sizes).tolist():
+        idx = np.flatnonzero(sizes == k)
+        rows = members[edge_ptr[idx][:, None] + np.arange(k)]
+        _, first = np.unique(np.sort(rows, axis=1), axis=0, return_index=True)
+        keep[idx[first]] = True
+    return sizes[keep], members[np.repeat(keep, sizes)]
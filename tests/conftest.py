@@ -1,6 +1,12 @@
+import os
+import sys
+
 import pytest
 import xgi
 
+# the scripts at the root of the repository, such as draw.py, are importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 
 @pytest.fixture
 def sc1_with_singletons():
@@ -0,0 +1,59 @@
+from sod import *
+
+
+def test_missing_faces(h_links_and_triangles2, h1, sc1_with_singletons):
+    faces = list(missing_faces(sc1_with_singletons))
+    assert faces == []
+
+    faces = list(missing_faces(h_links_and_triangles2))
+    assert len(faces) == 2
+    assert set(faces) == {frozenset({1, 2}), frozenset({3, 4})}
+
+    faces = list(missing_faces(h1))
+    assert len(faces) == 14
+    assert frozenset({2, 3}) in faces
+    assert frozenset({2, 4, 5}) in faces
+    assert frozenset({5, 6}) not in faces
+
+    faces = list(missing_faces(h1, min_size=1))
+    assert len(faces) == 4 + 10 + 7
+
+
+def test_missing_faces_spill(h1, tmp_path):
+    expected = set(missing_faces(h1, min_size=1))
+
+    # force a spill after every new face
+    faces = list(missing_faces(h1, min_size=1, max_faces=1, spill_dir=tmp_path))
+    assert len(faces) == len(expected)
+    assert set(faces) == expected
+
+    faces = list(
+        missing_faces(h1, min_size=1, max_faces=3, spill_dir=tmp_path, num_partitions=2)
+    )
+    assert len(faces) == len(expected)
+    assert set(faces) == expected
+
+    # the spill files are cleaned up
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_count_missing_faces(h_missing_one_link, h1):
+    assert count_missing_faces(h_missing_one_link) == 1
+    assert count_missing_faces(h1) == 14
+    assert count_missing_faces(h1, max_faces=2) == 14
+    assert count_missing_faces(h1, min_size=1) == 21
+
+
+def test_write_simplicial_closure(h_links_and_triangles2, tmp_path):
+    fname = tmp_path / "closure.txt"
+    count = write_simplicial_closure(h_links_and_triangles2, fname)
+    assert count == 2
+
+    H = xgi.read_edgelist(fname, nodetype=int)
+    assert H.num_edges == h_links_and_triangles2.num_edges + 2
+    assert edit_simpliciality(H) == 1.0
+
+    count = write_simplicial_closure(h_links_and_triangles2, fname, include_edges=False)
+    assert count == 2
+    H = xgi.read_edgelist(fname, nodetype=int)
+    assert sorted(map(sorted, H.edges.members())) == [[1, 2], [3, 4]]
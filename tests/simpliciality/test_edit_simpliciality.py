@@ -133,3 +133,8 @@ def test_edit_simpliciality_full_construction(
     m = 4 + 10
     mf = 3
     assert np.allclose(es, (s - mf) / (s - mf + m))
+
+    # no maximal faces, as in edit_simpliciality
+    H = xgi.Hypergraph([[0, 1]])
+    assert np.isnan(edit_simpliciality_full_construction(H))
+    assert np.isnan(edit_simpliciality(H))
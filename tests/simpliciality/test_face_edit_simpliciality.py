@@ -47,3 +47,20 @@ def test_face_edit_simpliciality(
 
     fes = face_edit_simpliciality(h_links_and_triangles2, exclude_min_size=False)
     assert np.allclose(fes, 7 / 9)
+
+
+def test_face_edit_distance_sum(h_links_and_triangles2):
+    H = h_links_and_triangles2
+    edges = list(H.edges)
+    total, count = face_edit_distance_sum(H, min_size=2)
+
+    # the maximal faces are summed in the order of the edges, whatever the
+    # order of the subset
+    assert face_edit_distance_sum(H, min_size=2, edges=edges[::-1]) == (total, count)
+
+    half = len(edges) // 2
+    t1, c1 = face_edit_distance_sum(H, min_size=2, edges=edges[:half])
+    t2, c2 = face_edit_distance_sum(H, min_size=2, edges=edges[half:])
+    assert c1 + c2 == count
+    assert np.allclose(t1 + t2, total)
+    assert np.allclose(1 - total / count, face_edit_simpliciality(H))
@@ -0,0 +1,60 @@
+from sod import *
+
+
+def test_maximal_edges(h1):
+    arrays = incidence_arrays(h1)
+    index = face_index(arrays, min_size=2)
+    # 5-6 is in 5-6-7
+    assert maximal_edges(arrays, index, min_size=2).tolist() == [
+        True,
+        True,
+        True,
+        False,
+    ]
+
+    # copies of a maximal edge are all maximal
+    H = xgi.Hypergraph([[1, 2], [1, 2], [1, 2, 3], [4, 5], [4, 5]])
+    arrays = incidence_arrays(H)
+    maximal = maximal_edges(arrays, face_index(arrays))
+    assert arrays["edge_ids"][maximal].tolist() == list(H.edges.maximal())
+
+
+def test_indexed_measures(h1, h_links_and_triangles2):
+    for H in [h1, h_links_and_triangles2]:
+        arrays = incidence_arrays(H)
+        for min_size in [1, 2]:
+            index = face_index(arrays, min_size)
+            maximal = maximal_edges(arrays, index, min_size)
+            for exclude_min_size in [True, False]:
+                args = (min_size, exclude_min_size)
+                assert indexed_simplex_counts(arrays, index, *args) == simplex_counts(
+                    H, *args
+                )
+                assert np.allclose(
+                    indexed_edit_simpliciality(arrays, index, maximal, *args),
+                    edit_simpliciality(H, *args),
+                    equal_nan=True,
+                )
+                # the same order of summation as face_edit_distance_sum
+                assert indexed_face_edit_distance_sum(
+                    arrays, index, maximal, *args
+                ) == face_edit_distance_sum(H, *args)
+
+
+def test_indexed_subsets(h_links_and_triangles2):
+    H = h_links_and_triangles2
+    arrays = incidence_arrays(H)
+    index = face_index(arrays, min_size=2)
+    maximal = maximal_edges(arrays, index, min_size=2)
+    edges = np.arange(H.num_edges)
+    parts = [edges[::2], edges[1::2]]
+
+    ns, ps = np.sum([indexed_simplex_counts(arrays, index, edges=p) for p in parts], 0)
+    assert (ns, ps) == indexed_simplex_counts(arrays, index)
+
+    sums = [
+        indexed_face_edit_distance_sum(arrays, index, maximal, edges=p) for p in parts
+    ]
+    total, count = indexed_face_edit_distance_sum(arrays, index, maximal)
+    assert sum(c for _, c in sums) == count
+    assert np.allclose(sum(t for t, _ in sums), total)
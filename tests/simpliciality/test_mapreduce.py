@@ -0,0 +1,61 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from sod import *
+
+
+class SerialRunner:
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+
+def test_edit_simpliciality_mapreduce(
+    sc1_with_singletons, h_missing_one_link, h_links_and_triangles2, h1, tmp_path
+):
+    for H in [sc1_with_singletons, h_missing_one_link, h_links_and_triangles2, h1]:
+        for min_size in [1, 2]:
+            for exclude_min_size in [True, False]:
+                es = edit_simpliciality(H, min_size, exclude_min_size)
+                es_mr = edit_simpliciality_mapreduce(
+                    H,
+                    min_size,
+                    exclude_min_size,
+                    num_mappers=3,
+                    num_reducers=2,
+                    runner=SerialRunner(),
+                    work_dir=tmp_path,
+                )
+                assert np.allclose(es, es_mr, equal_nan=True)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_edit_simpliciality_mapreduce_pools(h1):
+    es = edit_simpliciality(h1)
+
+    with ThreadPoolExecutor(2) as pool:
+        assert np.allclose(
+            edit_simpliciality_mapreduce(h1, num_mappers=4, runner=pool), es
+        )
+
+    # default local process pool and tiny buffers force many map outputs
+    es_mr = edit_simpliciality_mapreduce(
+        h1, num_mappers=2, num_reducers=3, buffer_size=2
+    )
+    assert np.allclose(es_mr, es)
+
+
+def test_edit_simpliciality_mapreduce_random():
+    random.seed(1)
+    for _ in range(20):
+        H = xgi.Hypergraph(
+            [
+                random.sample(["a", "b", "c", "d", "e", "f"], random.randint(1, 5))
+                for _ in range(random.randint(1, 10))
+            ]
+        )
+        es = edit_simpliciality(H)
+        es_mr = edit_simpliciality_mapreduce(
+            H, num_mappers=3, runner=SerialRunner(), buffer_size=4
+        )
+        assert np.allclose(es, es_mr, equal_nan=True)
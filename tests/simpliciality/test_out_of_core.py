@@ -0,0 +1,56 @@
+import random
+
+from sod import *
+
+
+def test_read_edgelist_chunks(tmp_path):
+    fname = tmp_path / "edges.txt"
+    fname.write_text("# comment\n1 2\n1 2 3\n2 3 4 5\n\n5 6\n")
+
+    chunks = list(read_edgelist_chunks(fname, chunksize=2))
+    assert chunks == [[(1, 2), (1, 2, 3)], [(2, 3, 4, 5), (5, 6)]]
+
+    chunks = list(read_edgelist_chunks(fname, max_order=2))
+    assert chunks == [[(1, 2), (1, 2, 3), (5, 6)]]
+
+
+def test_out_of_core_simpliciality(h_links_and_triangles2, h1, tmp_path):
+    for H in [h_links_and_triangles2, h1]:
+        fname = tmp_path / "edges.txt"
+        xgi.write_edgelist(H, fname)
+        for min_size in [1, 2]:
+            for exclude_min_size in [True, False]:
+                s = out_of_core_simpliciality(
+                    fname,
+                    min_size=min_size,
+                    exclude_min_size=exclude_min_size,
+                    buffer_size=5,
+                    chunksize=2,
+                    work_dir=tmp_path,
+                )
+                sf = simplicial_fraction(H, min_size, exclude_min_size)
+                es = edit_simpliciality(H, min_size, exclude_min_size)
+                fes = face_edit_simpliciality(H, min_size, exclude_min_size)
+                assert np.allclose(s["sf"], sf, equal_nan=True)
+                assert np.allclose(s["es"], es, equal_nan=True)
+                assert np.allclose(s["fes"], fes, equal_nan=True)
+
+    # the on-disk index is cleaned up
+    assert [p.name for p in tmp_path.iterdir()] == ["edges.txt"]
+
+
+def test_out_of_core_random(tmp_path):
+    random.seed(0)
+    fname = tmp_path / "edges.txt"
+    for _ in range(20):
+        edges = {
+            frozenset(random.sample(range(8), random.randint(2, 5)))
+            for _ in range(random.randint(1, 12))
+        }
+        H = xgi.Hypergraph(list(edges))
+        xgi.write_edgelist(H, fname)
+
+        s = out_of_core_simpliciality(fname, buffer_size=11, max_order=4)
+        assert np.allclose(s["sf"], simplicial_fraction(H), equal_nan=True)
+        assert np.allclose(s["es"], edit_simpliciality(H), equal_nan=True)
+        assert np.allclose(s["fes"], face_edit_simpliciality(H), equal_nan=True)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from sod import *
+from sod.backends import REFERENCE
+
+
+@pytest.fixture
+def broken_backend():
+    # off by one whenever there is an edge of three or more nodes
+    def broken(H, min_size=2, exclude_min_size=True):
+        sf = simplicial_fraction(H, min_size, exclude_min_size)
+        return sf + 1 if any(len(e) >= 3 for e in H.edges.members()) else sf
+
+    register_backend("sf", "broken", broken)
+    yield
+    unregister_backend("sf", "broken")
+
+
+def test_registry():
+    assert set(get_backends("sf")) == {"hashed", "indexed", "out_of_core"}
+    assert set(get_backends("es")) == {
+        "full_construction",
+        "indexed",
+        "mapreduce",
+        "out_of_core",
+    }
+    assert set(get_backends("fes")) == {"hashed", "indexed", "out_of_core"}
+    with pytest.raises(KeyError):
+        get_backends("xyz")
+
+
+def test_random_edges():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        edges = random_edges(rng, max_nodes=6, max_edges=10, max_size=4)
+        assert len(edges) == len(set(edges)) <= 10
+        assert all(1 <= len(e) <= 4 and max(e) < 6 for e in edges)
+
+
+def test_backends_agree():
+    assert differential_test(num_hypergraphs=40, seed=0) == []
+    failures = differential_test(
+        num_hypergraphs=3, max_nodes=20, max_edges=30, max_size=6, seed=0
+    )
+    assert failures == []
+
+
+def test_shrink(broken_backend):
+    failures = differential_test(metrics=["sf"], num_hypergraphs=20, seed=0)
+    assert len(failures) == 4
+    for f in failures:
+        assert f["backend"] == "broken"
+        assert len(f["edges"]) == 1 and len(f["edges"][0]) == 3
+        assert f["actual"] == f["expected"] + 1
+
+    # only the removals that keep the input failing are accepted
+    edges = shrink([(0, 1), (1, 2, 3), (2, 4)], lambda e: (2, 4) in e)
+    assert edges == [(2, 4)]
+
+
+def test_exceptions_agree():
+    def raises(H, min_size=2, exclude_min_size=True):
+        raise ValueError
+
+    REFERENCE["sf"], reference = raises, REFERENCE["sf"]
+    register_backend("sf", "raises", raises)
+    try:
+        failures = differential_test(metrics=["sf"], num_hypergraphs=5, seed=0)
+    finally:
+        REFERENCE["sf"] = reference
+        unregister_backend("sf", "raises")
+    # the other backends don't raise
+    assert {f["backend"] for f in failures} == {"hashed", "indexed", "out_of_core"}
+    assert all(isinstance(f["expected"], ValueError) for f in failures)
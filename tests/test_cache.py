@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pytest
+import xgi
+
+from sod import *
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = enable_cache(tmp_path / "cache")
+    yield cache
+    disable_cache()
+
+
+def test_cache_disabled(h1):
+    assert get_cache() is None
+    assert np.allclose(edit_simpliciality(h1), 1 / 15)
+
+
+def test_cached_metrics(cache, h1, h_links_and_triangles2):
+    es = edit_simpliciality(h1)
+    assert len(cache) == 1  # the nested simplicial_edit_distance isn't cached
+    assert edit_simpliciality(h1) == es
+    assert len(cache) == 1
+
+    # the parameters are part of the key
+    edit_simpliciality(h1, min_size=1)
+    edit_simpliciality(h1, 1)
+    assert len(cache) == 2
+
+    simplicial_fraction(h1)
+    face_edit_simpliciality(h1)
+    simplicial_fraction(h_links_and_triangles2)
+    assert len(cache) == 5
+
+    # an equal edge multiset with other IDs hits the cache
+    H = xgi.Hypergraph({"a": [5, 6], "b": [7, 6, 5], "c": [5, 4, 3, 2], "d": [3, 2, 1]})
+    path = cache._path(
+        cache.key(
+            fingerprint(h1),
+            "sod.simpliciality.edit_simpliciality.edit_simpliciality",
+            {"min_size": 2, "exclude_min_size": True},
+        )
+    )
+    with open(path, "w") as file:
+        file.write(json.dumps({"value": 0.5}))
+    assert edit_simpliciality(H) == 0.5
+
+
+def test_cached_nan(cache):
+    H = xgi.Hypergraph([{1, 2}, {2, 3}])
+    assert np.isnan(edit_simpliciality(H))
+    assert np.isnan(edit_simpliciality(H))
+    assert len(cache) == 1
+
+
+def test_cache_version(cache, h1):
+    def metric(H, min_size=2):
+        return 0.5
+
+    assert cached(metric)(h1) == 0.5
+    assert cached(version=1)(metric)(h1) == 0.5
+    assert len(cache) == 1
+
+    # the results of an older version aren't read
+    def metric(H, min_size=2):
+        return 0.75
+
+    assert cached(version=2)(metric)(h1) == 0.75
+    assert len(cache) == 2
+
+    # the key of a versioned metric is that of its calls
+    key = metric_key(face_edit_simpliciality, fingerprint(h1), min_size=2)
+    assert cache.get(key) is None
+    fes = face_edit_simpliciality(h1)
+    assert cache.get(key) == fes
+
+
+def test_local_measures_bypass_cache(cache, h1):
+    h1.nodes.local_edit_simpliciality.asnumpy()
+    assert len(cache) == 0
+
+
+def test_result_cache_eviction(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=100)
+    for i in range(20):
+        cache.set(cache.key("fp", "metric", {"i": i}), i)
+    assert 0 < len(cache) < 20
+    assert cache.get(cache.key("fp", "metric", {"i": 19})) == 19
+    assert cache.get(cache.key("fp", "metric", {"i": 0})) is None
+
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,56 @@
+import numpy as np
+
+from sod import *
+
+
+def test_checkpoint(tmp_path):
+    path = tmp_path / "log.jsonl"
+    with Checkpoint(path) as checkpoint:
+        assert len(checkpoint) == 0
+        checkpoint.add(("email-enron", "CM", 0), [0.5, 0.25, np.nan])
+        checkpoint.add(["email-enron", "CM", 1], {"sf": 1.0})
+        assert ("email-enron", "CM", 0) in checkpoint
+        assert ("email-enron", "CM", 2) not in checkpoint
+        assert checkpoint["email-enron", "CM", 1] == {"sf": 1.0}
+
+    with Checkpoint(path) as checkpoint:
+        assert len(checkpoint) == 2
+        assert list(checkpoint.items())[0][0] == ("email-enron", "CM", 0)
+        assert np.isnan(checkpoint["email-enron", "CM", 0][2])
+        checkpoint.add(("email-enron", "CL", 0), 1)
+
+    with Checkpoint(path) as checkpoint:
+        assert len(checkpoint) == 3
+
+
+def test_checkpoint_truncated(tmp_path):
+    path = tmp_path / "log.jsonl"
+    with Checkpoint(path) as checkpoint:
+        checkpoint.add(("a", 0), 1)
+        checkpoint.add(("a", 1), 2)
+
+    # a crash in the middle of a write
+    with open(path, "a") as file:
+        file.write('{"key": ["a", 2], "res')
+
+    with Checkpoint(path) as checkpoint:
+        assert len(checkpoint) == 2
+        checkpoint.add(("a", 2), 3)
+
+    with Checkpoint(path) as checkpoint:
+        assert checkpoint["a", 2] == 3
+    with open(path) as file:
+        assert len(file.readlines()) == 3
+
+
+def test_checkpoint_seed(tmp_path):
+    path = tmp_path / "log.jsonl"
+    with Checkpoint(path) as checkpoint:
+        assert checkpoint.seed(("run", "seed"), 42) == 42
+        assert ("run", "seed") not in checkpoint
+        entropy = checkpoint.seed(("run", "seed"))
+
+    # a resumed run reuses the seed
+    with Checkpoint(path) as checkpoint:
+        assert checkpoint.seed(("run", "seed")) == entropy
+        assert checkpoint.seed(("run", "seed"), 1) == 1
@@ -0,0 +1,184 @@
+import json
+
+import numpy as np
+import xgi
+
+import sod.cli
+from sod import *
+from sod.cli import main
+
+
+def test_cli(tmp_path, h1, h_links_and_triangles2):
+    store = tmp_path / "store"
+    save_dataset(h1, store / "h1")
+    save_dataset(h_links_and_triangles2, store / "h2")
+    args = ["-d", "h1", "h2", "-p", "2", "-r", "3", "--store", str(store)]
+    args += ["-o", str(tmp_path), "--no-cache"]
+
+    main(["empirical", "models", "assortativity", *args])
+
+    with open(tmp_path / "empirical_simpliciality.json") as file:
+        data = json.loads(file.read())
+    assert list(data) == ["h1", "h2"]
+    H = load_dataset("h1", store=store)
+    H.cleanup(singletons=True)
+    assert data["h1"] == {
+        "es": edit_simpliciality(H),
+        "fes": face_edit_simpliciality(H),
+        "sf": simplicial_fraction(H),
+    }
+
+    with open(tmp_path / "model_simpliciality_h1.json") as file:
+        data = json.loads(file.read())
+    # there are no DCSBM parameters
+    assert list(data) == ["CM", "CL"]
+    assert all(len(data[m][metric]) == 3 for m in data for metric in data[m])
+
+    with open(tmp_path / "empirical_simplicial_assortativity.json") as file:
+        data = json.loads(file.read())
+    assert set(data["h2"]) == {"sf", "es", "fes"}
+
+    main(["convergence", *args])
+    with open(tmp_path / "cm_convergence.json") as file:
+        data = json.loads(file.read())
+    assert len(data["h1"]["num-swaps"]) == len(data["h1"]["sf"]) == 10
+
+    # the results store follows the JSON files
+    results = ResultsStore(tmp_path / "results")
+    assert results.query(model="empirical", dataset="h1", metric="sf")["value"] == [
+        simplicial_fraction(H)
+    ]
+    assert len(results.query(model="CM", dataset="h1", param=np.nan)["value"]) == 9
+    assert len(results.query(model=CONVERGENCE_MODEL, dataset="h1")["value"]) == 30
+
+
+def test_cli_split(tmp_path, monkeypatch, h_links_and_triangles2):
+    store = tmp_path / "store"
+    H = xgi.Hypergraph([[i, i + 1, i + 2] for i in range(10)] + [[1, 2], [5, 6]])
+    save_dataset(H, store / "h")
+    save_dataset(h_links_and_triangles2, store / "h2")
+    args = ["-d", "h", "h2", "-p", "3", "--store", str(store), "--no-cache"]
+
+    data = dict()
+    for cost in [sod.cli.split_cost, 1]:
+        monkeypatch.setattr(sod.cli, "split_cost", cost)
+        main(["empirical", "assortativity", *args, "-o", str(tmp_path / str(cost))])
+
+        for fname in [
+            "empirical_simpliciality.json",
+            "empirical_simplicial_assortativity.json",
+        ]:
+            with open(tmp_path / str(cost) / fname) as file:
+                data[cost, fname] = json.loads(file.read())
+
+    for fname in [
+        "empirical_simpliciality.json",
+        "empirical_simplicial_assortativity.json",
+    ]:
+        split = data[1, fname]
+        whole = data[sod.cli.split_cost, fname]
+        for d in whole:
+            assert np.allclose(
+                [split[d][m] for m in whole[d]],
+                list(whole[d].values()),
+                equal_nan=True,
+            )
+
+
+def test_cli_resume(tmp_path, h1):
+    store = tmp_path / "store"
+    save_dataset(h1, store / "h1")
+    args = ["models", "-d", "h1", "-p", "2", "--store", str(store)]
+    args += ["-o", str(tmp_path), "--no-cache"]
+
+    main([*args, "-r", "2"])
+    with open(tmp_path / "model_simpliciality_h1.jsonl") as file:
+        # the seed and the realizations
+        assert len(file.readlines()) == 5
+
+    # only the new realizations run, with the same seed
+    main([*args, "-r", "3"])
+    with open(tmp_path / "model_simpliciality_h1.jsonl") as file:
+        assert len(file.readlines()) == 7
+    with open(tmp_path / "model_simpliciality_h1.json") as file:
+        data = json.loads(file.read())
+    assert all(len(data[m][metric]) == 3 for m in data for metric in data[m])
+
+
+def test_cli_seed(tmp_path):
+    store = tmp_path / "store"
+    H = xgi.Hypergraph([[i, i + 1, i + 2] for i in range(10)] + [[1, 2], [5, 6]])
+    save_dataset(H, store / "h")
+    args = ["models", "convergence", "-d", "h", "-r", "2", "-p", "2"]
+    args += ["--store", str(store), "--no-cache"]
+
+    data = []
+    for run, seed in enumerate([1, 1, 2]):
+        main([*args, "-o", str(tmp_path / str(run)), "-s", str(seed)])
+        for fname in ["model_simpliciality_h.json", "cm_convergence.json"]:
+            with open(tmp_path / str(run) / fname) as file:
+                data.append(json.loads(file.read()))
+
+    assert data[0:2] == data[2:4]
+    assert data[0:2] != data[4:6]
+
+
+def test_cli_costs(tmp_path, monkeypatch):
+    store = tmp_path / "store"
+    H = xgi.Hypergraph([[i, i + 1, i + 2] for i in range(10)] + [[1, 2], [5, 6]])
+    save_dataset(H, store / "h")
+    monkeypatch.setattr(sod.cli, "split_cost", 1)
+    args = ["empirical", "-p", "3", "--store", str(store), "--no-cache"]
+    args = sod.cli._parse_args(args)
+
+    datasets = sod.cli._Datasets(str(store))
+    tasks = []
+    try:
+        sod.cli._empirical_stage(datasets, ["h"], args, tasks)
+        sod.cli._assortativity_stage(datasets, ["h"], args, tasks)
+    finally:
+        datasets.release()
+
+    costs = {task.key: task.cost for task in tasks}
+    es = costs["empirical", "h", "es"]
+    # each sub-task costs as much as its part of the edges or nodes
+    for prefix in [("empirical", "h", "sf"), ("assortativity", "h", "sf")]:
+        parts = [c for key, c in costs.items() if key[:3] == prefix]
+        assert len(parts) == 3
+        assert all(0 < c < sum(parts) for c in parts)
+    parts = [c for key, c in costs.items() if key[:3] == ("empirical", "h", "fes")]
+    assert sum(parts) == es
+
+
+def test_cli_cache(tmp_path, capsys, h1):
+    store = tmp_path / "store"
+    save_dataset(h1, store / "h1")
+    args = ["empirical", "assortativity", "-d", "h1", "-p", "2"]
+    args += ["--store", str(store), "-o", str(tmp_path)]
+
+    try:
+        main(args)
+        assert "completed" in capsys.readouterr().out
+        with open(tmp_path / "empirical_simpliciality.json") as file:
+            data = file.read()
+
+        # the results of the split tasks are cached like those of the metrics
+        assert len(get_cache()) == 6
+        H = load_dataset("h1", store=store)
+        H.cleanup(singletons=True)
+        with instrumented() as rec:
+            simplicial_fraction(H)
+        assert rec.counters == {"cache.hits": 1}
+        H = load_dataset("h1", max_order=2, store=store)
+        H.cleanup()
+        with instrumented() as rec:
+            simplicial_assortativity(H, "es")
+        assert rec.counters == {"cache.hits": 1}
+
+        # and a rerun reads them instead of running the tasks
+        main(args)
+        assert "completed" not in capsys.readouterr().out
+        with open(tmp_path / "empirical_simpliciality.json") as file:
+            assert file.read() == data
+    finally:
+        disable_cache()
@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import pytest
+from scipy.sparse import coo_matrix
+
+from sod import *
+
+
+def _params():
+    d = [2, 1, 1, 2]
+    s = [3, 3]
+    g1 = [0, 0, 1, 1]
+    g2 = [0, 1]
+    omega = np.array([[2, 1], [1, 2]])
+    return d, s, g1, g2, omega
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_save_load_dcsbm_parameters(tmp_path, sparse):
+    d, s, g1, g2, omega = _params()
+    fname = tmp_path / "params.npz"
+    save_dcsbm_parameters(fname, d, s, g1, g2, omega, sparse=sparse)
+    with np.load(fname) as file:
+        assert ("omega" in file) != sparse
+
+    d2, s2, g12, g22, omega2 = load_dcsbm_parameters(str(fname))
+    assert d2 == dict(enumerate(d))
+    assert s2 == dict(enumerate(s))
+    assert g12 == dict(enumerate(g1))
+    assert g22 == dict(enumerate(g2))
+    assert np.array_equal(omega2, omega)
+
+
+def test_save_dcsbm_parameters_sparse_matrix(tmp_path):
+    d, s, g1, g2, omega = _params()
+    omega = np.zeros((10, 10), dtype=int)
+    omega[3, 4] = 5
+    fname = tmp_path / "params.npz"
+    # mostly empty, so it is stored sparse by default
+    save_dcsbm_parameters(fname, d, s, g1, g2, coo_matrix(omega))
+    with np.load(fname) as file:
+        assert "omega" not in file
+    assert np.array_equal(load_dcsbm_parameters(str(fname))[4], omega)
+
+
+def test_load_dcsbm_parameters_json(tmp_path):
+    d, s, g1, g2, omega = _params()
+    # the JSON files are keyed by string labels, not necessarily in order
+    data = {
+        "omega": omega.tolist(),
+        "d": {str(i): x for i, x in reversed(list(enumerate(d)))},
+        "s": {str(i): x for i, x in enumerate(s)},
+        "g1": {str(i): x for i, x in enumerate(g1)},
+        "g2": {str(i): x for i, x in enumerate(g2)},
+    }
+    with open(tmp_path / "params.json", "w") as file:
+        json.dump(data, file)
+
+    params = load_dcsbm_parameters(str(tmp_path / "params.npz"))
+    assert params[0] == dict(enumerate(d))
+    assert np.array_equal(params[4], omega)
+    # the import is saved
+    assert (tmp_path / "params.npz").exists()
+    params2 = load_dcsbm_parameters(str(tmp_path / "params.npz"))
+    assert params2[:4] == params[:4]
+
+    convert_dcsbm_parameters(str(tmp_path / "params.json"), str(tmp_path / "c.npz"))
+    assert load_dcsbm_parameters(str(tmp_path / "c.npz"))[:4] == params[:4]
+
+    with pytest.raises(FileNotFoundError):
+        load_dcsbm_parameters(str(tmp_path / "missing.npz"))
+
+
+def test_dcsbm_parameters_bad_labels(tmp_path):
+    d, s, g1, g2, omega = _params()
+    with pytest.raises(ValueError):
+        save_dcsbm_parameters(tmp_path / "p.npz", {0: 1, 5: 2}, s, g1, g2, omega)
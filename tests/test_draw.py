@@ -0,0 +1,29 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+
+from draw import _scalar_arg_to_array, draw_multilayer
+
+
+def test_scalar_arg_to_array(h1):
+    sizes = _scalar_arg_to_array([1, 2, 3, 4], h1.edges, 0, 1)
+    assert np.array_equal(sizes, [1, 2, 3, 4])
+    assert np.array_equal(_scalar_arg_to_array(2, h1.edges, 0, 1), [2.0] * 4)
+
+    # one value per edge
+    with pytest.raises(ValueError):
+        _scalar_arg_to_array([1, 2], h1.edges, 0, 1)
+    with pytest.raises(ValueError):
+        _scalar_arg_to_array(np.ones(5), h1.edges, 0, 1)
+
+
+def test_draw_multilayer_lod(h1):
+    with pytest.raises(ValueError):
+        draw_multilayer(h1, max_edges=1, lod="grid")
+    for lod in ["sample", "bin"]:
+        ax = draw_multilayer(h1, max_edges=1, lod=lod, seed=0)
+        assert ax is not None
+    matplotlib.pyplot.close("all")
@@ -0,0 +1,51 @@
+import numpy as np
+
+from sod import FaceIndex, KeyRuns, pack_faces, unpack_faces
+
+
+def test_pack_faces():
+    keys = pack_faces([(3, 1), (0,), (1, 3), (0, 1, 2)], 3)
+    assert len(keys) == 4
+    assert keys[0] == keys[2]
+    assert keys[0] != keys[1]
+    assert unpack_faces(keys) == [(1, 3), (0,), (1, 3), (0, 1, 2)]
+
+    # keys sort like the sorted faces
+    keys = np.sort(pack_faces([(2, 3), (1, 2, 3), (1,), (1, 2)], 3))
+    assert unpack_faces(keys) == [(1,), (1, 2), (1, 2, 3), (2, 3)]
+
+
+def test_face_index(h_links_and_triangles2):
+    index = FaceIndex.from_faces(h_links_and_triangles2.edges.members(), 3)
+    assert len(index) == 6
+    assert index.search({1, 3})
+    assert index.search((3, 2, 1))
+    assert index.search({2, 4})
+    assert not index.search({1})
+    assert not index.search({1, 2})
+    assert not index.search({1, 2, 3, 4})
+
+    keys = pack_faces([(1, 3), (1, 2), (2, 3, 4), (4, 5)], 3)
+    assert index.contains(keys).tolist() == [True, False, True, False]
+
+
+def test_key_runs(tmp_path):
+    rng = np.random.default_rng(0)
+    faces = [
+        tuple(rng.choice(10, size=rng.integers(1, 4), replace=False))
+        for _ in range(500)
+    ]
+    expected = FaceIndex.from_faces(faces, 3)
+
+    # a tiny buffer forces many runs and a block-wise merge
+    with KeyRuns(3, tmp_path, buffer_size=7) as runs:
+        for i in range(0, len(faces), 5):
+            runs.add(pack_faces(faces[i : i + 5], 3))
+        assert len(runs.paths) > 10
+        index = FaceIndex.from_runs(runs, tmp_path / "index.bin")
+
+        assert len(index) == len(expected)
+        assert np.all(np.asarray(index.keys) == expected.keys)
+        assert runs.merge() == len(expected)
+
+    assert not any(p.name.startswith("sod-runs-") for p in tmp_path.iterdir())
@@ -0,0 +1,51 @@
+import numpy as np
+import xgi
+
+from sod import *
+
+
+def test_fingerprint(h1):
+    f = fingerprint(h1)
+    assert isinstance(f, str) and len(f) == 32
+
+    # edge IDs, edge order, and member order don't matter
+    H = xgi.Hypergraph({"a": [3, 2, 1], "b": [6, 7, 5], "c": [5, 4, 3, 2], "d": [5, 6]})
+    assert fingerprint(H) == f
+
+    # neither do isolated nodes
+    H.add_node(100)
+    assert fingerprint(H) == f
+
+    # the incidence arrays and the compact format give the same fingerprint
+    assert fingerprint(incidence_arrays(h1)) == f
+    assert fingerprint(CompactHypergraph.from_hypergraph(h1)) == f
+
+    # but the edges do
+    H.add_edge([100, 1])
+    assert fingerprint(H) != f
+    H = xgi.Hypergraph([[1, 2, 3], [5, 6], [5, 6, 7], [2, 3, 4, 5], [5, 6]])
+    assert fingerprint(H) != f
+    H = xgi.Hypergraph([[1, 2, 3], [5, 6, 7], [2, 3, 4, 5]])
+    assert fingerprint(H) != f
+
+
+def test_fingerprint_labels(h1):
+    H = xgi.Hypergraph([[f"n{n}" for n in e] for e in h1.edges.members()])
+    assert fingerprint(H) != fingerprint(h1)
+    assert fingerprint(H, labels=False) == fingerprint(h1, labels=False)
+
+    H2 = xgi.Hypergraph([[f"n{n}" for n in e] for e in h1.edges.members()])
+    assert fingerprint(H) == fingerprint(H2)
+
+    # relabeling keeps the label-free fingerprint
+    mapping = {n: 10 - n for n in h1.nodes}
+    H = xgi.Hypergraph([[mapping[n] for n in e] for e in h1.edges.members()])
+    assert fingerprint(H) != fingerprint(h1)
+    assert fingerprint(H, labels=False) == fingerprint(h1, labels=False)
+
+
+def test_fingerprint_empty():
+    H = xgi.Hypergraph()
+    assert fingerprint(H) == fingerprint(xgi.Hypergraph())
+    H.add_edge([])
+    assert fingerprint(H) != fingerprint(xgi.Hypergraph())
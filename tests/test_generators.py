@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import xgi
+
+from sod import *
+
+
+def test_configuration_model(h1):
+    H = configuration_model(h1, seed=0)
+    assert H.nodes.degree.asdict() == h1.nodes.degree.asdict()
+    assert H.edges.size.asdict() == h1.edges.size.asdict()
+
+    # the input isn't modified
+    assert h1.edges.members() == [{1, 2, 3}, {2, 3, 4, 5}, {5, 6, 7}, {5, 6}]
+
+
+def test_configuration_model_seed():
+    rng = np.random.default_rng(1)
+    H = xgi.Hypergraph(
+        [rng.choice(30, rng.integers(2, 5), replace=False).tolist() for _ in range(40)]
+    )
+    members = lambda H: H.edges.members()
+
+    H1 = configuration_model(H, seed=42)
+    H2 = configuration_model(H, seed=42)
+    H3 = configuration_model(H, seed=43)
+    assert members(H1) == members(H2)
+    assert members(H1) != members(H3)
+
+    rng = np.random.default_rng(42)
+    assert members(configuration_model(H, seed=rng)) == members(H1)
+
+    # independent child streams
+    ss = np.random.SeedSequence(42)
+    c1, c2 = ss.spawn(2)
+    H4 = configuration_model(H, seed=c1)
+    assert members(H4) == members(configuration_model(H, seed=c1))
+    assert members(H4) != members(configuration_model(H, seed=c2))
+
+
+def test_configuration_model_from_sequences():
+    k = {i: 2 for i in range(10)}
+    s = {i: 4 for i in range(5)}
+    H1 = configuration_model(k, s, seed=3)
+    H2 = configuration_model(k, s, seed=3)
+    assert H1.edges.members() == H2.edges.members()
+    assert H1.edges.size.asdict() == s
+    assert sum(H1.nodes.degree.asdict().values()) == 20
+
+
+def test_configuration_model_hash_seed():
+    # string IDs are hashed differently by every interpreter
+    code = (
+        "import sod, xgi\n"
+        "edges = [[f'n{(3 * i + j) % 25}' for j in range(2 + i % 3)] for i in range(30)]\n"
+        "H = sod.configuration_model(xgi.Hypergraph(edges), seed=42)\n"
+        "k = {f'n{i}': 1 + i % 3 for i in range(20)}\n"
+        "s = {f'e{i}': 2 + i % 2 for i in range(12)}\n"
+        "H2 = sod.configuration_model(k, s, seed=42)\n"
+        "for G in [H, H2]:\n"
+        "    print({id: sorted(e) for id, e in G.edges.members(dtype=dict).items()})\n"
+    )
+    outputs = set()
+    for hash_seed in ["1", "2", "3"]:
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout
+        outputs.add(out)
+    assert len(outputs) == 1
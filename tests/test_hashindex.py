@@ -0,0 +1,72 @@
+import random
+
+import xgi
+
+from sod import *
+
+
+def test_hash_index(h_links_and_triangles2):
+    index = HashIndex(ZobristHasher(seed=0))
+    index.build_index(h_links_and_triangles2.edges.members())
+    assert len(index) == 6
+
+    assert index.search({1, 3})
+    assert index.search({1, 2, 3})
+    assert index.search((3, 2, 1))
+    assert index.search({2, 3, 4})
+    assert not index.search({1})
+    assert not index.search({1, 2})
+
+
+def test_gray_code_subsets():
+    hasher = ZobristHasher(seed=0)
+    face = ["a", "b", "c", "d"]
+
+    subsets = list(gray_code_subsets(face, hasher, min_size=0))
+    assert len(subsets) == 16
+    masks = [m for m, _ in subsets]
+    assert sorted(masks) == list(range(16))
+    # consecutive subsets differ by one node
+    assert all(bin(a ^ b).count("1") == 1 for a, b in zip(masks, masks[1:]))
+    for mask, h in subsets:
+        members = [n for i, n in enumerate(face) if mask >> i & 1]
+        assert h == hasher.hash(members)
+
+    subsets = {
+        frozenset(n for i, n in enumerate(face) if mask >> i & 1)
+        for mask, _ in gray_code_subsets(face, hasher, min_size=2, max_size=3)
+    }
+    assert subsets == {frozenset(s) for s in powerset(face, 2, 3)}
+
+
+def test_count_missing_subfaces_hashed(h_missing_one_link):
+    index = HashIndex()
+    index.build_index(h_missing_one_link.edges.members())
+    assert count_missing_subfaces_hashed(index, {1}, min_size=2) == 0
+    assert count_missing_subfaces_hashed(index, {2, 3}, min_size=2) == 0
+    assert count_missing_subfaces_hashed(index, {2, 3}) == 0
+    assert count_missing_subfaces_hashed(index, {1, 2, 3}) == 1
+    assert count_missing_subfaces_hashed(index, {1, 2, 3}, min_size=2) == 1
+
+
+def test_hashed_agrees_with_trie():
+    random.seed(0)
+    for _ in range(50):
+        H = xgi.Hypergraph(
+            [
+                random.sample(range(8), random.randint(1, 6))
+                for _ in range(random.randint(1, 15))
+            ]
+        )
+        t = Trie()
+        t.build_trie(H.edges.members())
+        index = HashIndex()
+        index.build_index(H.edges.members())
+        for e in H.edges.members():
+            for min_size in [1, 2, 3]:
+                assert count_missing_subfaces_hashed(
+                    index, e, min_size
+                ) == count_missing_subfaces(t, e, min_size)
+                assert is_simplex_hashed(index, e, min_size) == is_simplex(
+                    t, e, min_size
+                )
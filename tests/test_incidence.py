@@ -0,0 +1,76 @@
+import pytest
+
+from sod import *
+
+
+def test_incidence_arrays(h1):
+    arrays = incidence_arrays(h1)
+    assert arrays["node_ids"].tolist() == [1, 2, 3, 4, 5, 6, 7]
+    assert arrays["edge_ids"].tolist() == [0, 1, 2, 3]
+    assert arrays["edge_ptr"].tolist() == [0, 3, 7, 10, 12]
+    assert len(arrays["edge_members"]) == 12
+
+    H = hypergraph_from_arrays(arrays)
+    assert H.edges.members(dtype=dict) == h1.edges.members(dtype=dict)
+    assert list(H.nodes) == list(h1.nodes)
+
+
+def test_hypergraph_from_arrays():
+    H = xgi.Hypergraph({"a": ["x", "y"], "b": ["y", "z", "w"]})
+    H.add_node("isolated")
+    H2 = hypergraph_from_arrays(incidence_arrays(H))
+    assert H2.edges.members(dtype=dict) == H.edges.members(dtype=dict)
+    assert set(H2.nodes) == set(H.nodes)
+
+
+def test_face_index(h_links_and_triangles2):
+    arrays = incidence_arrays(h_links_and_triangles2)
+    index = face_index(arrays)
+    assert len(index) == 6
+    # faces are stored by node index
+    idx = {n: i for i, n in enumerate(arrays["node_ids"].tolist())}
+    assert index.search([idx[1], idx[2], idx[3]])
+    assert not index.search([idx[1], idx[2]])
+
+    index = face_index(arrays, min_size=3)
+    assert len(index) == 2
+
+
+def test_to_bipartite_edgelist(h1):
+    H = h1.copy()
+    H.cleanup(relabel=True)
+    n = H.num_nodes
+    expected = [[i, j + n] for i, members in H._node.items() for j in members]
+
+    edgelist = to_bipartite_edgelist(H)
+    assert edgelist.dtype == np.int_
+    assert sorted(edgelist.tolist()) == sorted(expected)
+    assert edgelist[:, 0].tolist() == sorted(edgelist[:, 0].tolist())
+    assert np.array_equal(edgelist, to_bipartite_edgelist(incidence_arrays(H)))
+
+
+def test_mixed_ids():
+    H = xgi.Hypergraph([[1, "a", 2.5], ["a", 3]])
+    arrays = incidence_arrays(H)
+    # the IDs aren't cast to strings
+    assert arrays["node_ids"].dtype == object
+    assert arrays["node_ids"].tolist() == [1, "a", 2.5, 3]
+    H2 = hypergraph_from_arrays(arrays)
+    assert H2.edges.members(dtype=dict) == H.edges.members(dtype=dict)
+
+    with pytest.raises(TypeError):
+        publish_arrays(arrays)
+    unlabeled = unlabeled_arrays(arrays)
+    assert unlabeled["node_ids"].tolist() == [0, 1, 2, 3]
+    assert unlabeled["edge_ids"].tolist() == [0, 1]
+    with shared_arrays(unlabeled) as handle:
+        assert attach_arrays(handle)["edge_ptr"].tolist() == [0, 3, 5]
+
+
+def test_attach_hypergraph(h1):
+    with shared_arrays(unlabeled_arrays(incidence_arrays(h1))) as handle:
+        H = attach_hypergraph(handle)
+        assert H.num_edges == h1.num_edges
+        assert list(H.nodes) == list(range(h1.num_nodes))
+        # the hypergraph is built once per handle
+        assert attach_hypergraph(handle) is H
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+
+import pytest
+
+import sod
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+
+def test_lazy_import():
+    code = (
+        "import sys, sod; sod.Trie; "
+        "print(any(m in sys.modules for m in ['xgi', 'scipy', 'numpy', 'sod.cache']))"
+    )
+    assert _run(code).strip() == "False"
+
+
+def test_star_import():
+    names = {}
+    exec("from sod import *", names)
+
+    # the names of the submodules, as they were imported eagerly
+    reference = {}
+    for m in sod._SUBMODULES:
+        if m == "trie":
+            exec("from sod.trie import Trie", reference)
+        else:
+            exec(f"from sod.{m} import *", reference)
+    for name, value in reference.items():
+        if not name.startswith("_") and name not in sod._SUBMODULES:
+            assert names[name] is value, name
+
+    assert names["np"] is reference["np"]
+    assert names["simplicial_fraction"] is sod.simpliciality.simplicial_fraction
+    for m in sod._SUBMODULES:
+        assert m in names
+    assert set(dir(sod)) >= set(sod._ATTRS)
+
+
+def test_function_named_as_module():
+    code = "import sod.cache, sod; print(callable(sod.fingerprint))"
+    assert _run(code).strip() == "True"
+    assert callable(sod.fingerprint)
+    assert sod.cache.__name__ == "sod.cache"
+
+
+def test_missing_attribute():
+    with pytest.raises(AttributeError):
+        sod.missing
+
+    code = (
+        "import sys, sod; print(hasattr(sod, 'missing'), hasattr(sod, 'np'), "
+        "any(m in sys.modules for m in ['xgi', 'scipy', 'numpy', 'sod.cache']))"
+    )
+    assert _run(code).split() == ["False", "False", "False"]
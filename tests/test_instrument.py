@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+
+from sod import *
+from sod.cli import main
+
+
+def test_disabled(h1):
+    assert get_instrumentation() is None
+    with phase("filterby"):
+        pass
+    assert np.allclose(edit_simpliciality(h1), 1 / 15)
+
+
+def test_counters(h1):
+    with instrumented() as rec:
+        es = edit_simpliciality(h1)
+    assert get_instrumentation() is None
+    assert np.allclose(es, 1 / 15)
+
+    # 1-2-3, 2-3-4-5, and 5-6-7, which 5-6 shares
+    assert rec.counters["trie.nodes"] == 10
+    assert rec.counters["maximal_faces"] == 3
+    assert rec.counters["neighbor_intersections"] == 2
+    assert 0 < rec.counters["trie.hits"] < rec.counters["trie.lookups"]
+    assert set(rec.timers) == {"filterby", "maximal", "subfaces", "trie.build"}
+    assert all(calls == 1 for _, calls in rec.timers.values())
+
+    with instrumented() as rec:
+        assert simplicial_fraction(h1) == 0
+    # none of the three potential simplices is one, and the search stops at
+    # the first missing subface
+    assert rec.counters["trie.lookups"] - rec.counters["trie.hits"] == 3
+    assert rec.counters["subsets"] == rec.counters["trie.lookups"]
+
+
+def test_nested():
+    outer = enable_instrumentation()
+    with instrumented() as rec:
+        rec.count("x", 2)
+    assert get_instrumentation() is outer
+    assert outer.counters == {}
+    disable_instrumentation()
+    assert get_instrumentation() is None
+
+
+def test_run_instrumented(tmp_path, h1):
+    fname = tmp_path / "task.json"
+    fes = run_instrumented(fname, face_edit_simpliciality, h1)
+    assert fes == face_edit_simpliciality(h1)
+    with open(fname) as file:
+        data = json.loads(file.read())
+    assert data["function"] == "face_edit_simpliciality"
+    assert data["counters"]["trie.nodes"] == 10
+    assert data["timers"]["subfaces"]["calls"] == 1
+
+
+def test_cli_instrument(tmp_path, h1):
+    store = tmp_path / "store"
+    save_dataset(h1, store / "h1")
+    args = ["-d", "h1", "-p", "2", "--store", str(store), "-o", str(tmp_path)]
+    main(["empirical", *args, "--no-cache", "--instrument", str(tmp_path / "inst")])
+
+    fnames = sorted(f.name for f in (tmp_path / "inst").iterdir())
+    assert fnames == [
+        "empirical_h1_es.json",
+        "empirical_h1_fes_0.json",
+        "empirical_h1_sf_0.json",
+    ]
+    with open(tmp_path / "inst" / "empirical_h1_es.json") as file:
+        data = json.loads(file.read())
+    assert data["counters"]["maximal_faces"] == 3
+
+
+def test_missing_faces_counters(h1):
+    with instrumented() as rec:
+        count_missing_faces(h1)
+    # the subfaces of 1-2-3, 2-3-4-5, and 5-6-7 of at least two nodes
+    assert rec.counters["subsets"] == 3 + 10 + 3
+    # only 5-6 is an edge
+    assert rec.counters["trie.hits"] == 1
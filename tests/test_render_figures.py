@@ -0,0 +1,77 @@
+import json
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import render_figures
+from render_figures import (
+    FIGURES,
+    _select,
+    _values,
+    figure_hash,
+    plot_model_fitting,
+    render_figure,
+)
+from sod import *
+
+
+def test_model_fitting_query(tmp_path):
+    data = tmp_path / "Data"
+    data.mkdir()
+    with open(data / "empirical_simpliciality.json", "w") as file:
+        json.dump({"email-enron": {"sf": 0.5, "es": 0.6, "fes": 0.7}}, file)
+    realizations = {m: [0.1, 0.2, 0.3, 0.4] for m in ["sf", "es", "fes"]}
+    with open(data / "model_simpliciality_email-enron.json", "w") as file:
+        json.dump({"CM": realizations, "CL": realizations}, file)
+    with open(data / "cm_convergence.json", "w") as file:
+        sweep = {m: [0.8, 0.9] for m in ["sf", "es", "fes"]}
+        json.dump({"email-enron": dict(sweep, **{"num-swaps": [10, 100]})}, file)
+
+    results = ResultsStore(tmp_path / "results")
+    sync_results(results, data)
+    rows = results.query(**FIGURES["model_fitting"]["query"])
+
+    # the convergence sweep isn't drawn as realizations of the CM
+    for m in ["sf", "es", "fes"]:
+        values = _values(_select(rows, model="empirical", metric=m), "email-enron")
+        assert len(values) == 1
+        for model in ["CM", "CL"]:
+            values = _values(_select(rows, model=model, metric=m), "email-enron")
+            assert values.tolist() == [0.1, 0.2, 0.3, 0.4]
+    assert len(rows["value"]) == 3 * (1 + 4 + 4)
+
+    spec = dict(FIGURES["model_fitting"], datasets=["email-enron"])
+    fig = plot_model_fitting(rows, spec)
+    assert len(fig.axes) == 3
+    plt.close(fig)
+
+
+def test_render_figure_styles(tmp_path):
+    results = ResultsStore(tmp_path / "results")
+    for d in ["a", "b"]:
+        results.append(d, "empirical", ["sf", "es", "fes"], [0.1, 0.2, 0.3])
+    font_size = plt.rcParams["font.size"]
+
+    spec = dict(
+        FIGURES["empirical_simpliciality"],
+        query={"model": "empirical"},
+        datasets=["a", "b"],
+        output=[str(tmp_path / "empirical_simpliciality.png")],
+        dpi=10,
+    )
+    render_figure(spec, tmp_path / "results")
+    assert (tmp_path / "empirical_simpliciality.png").exists()
+    # the fonts of the plot don't leak into the next one
+    assert plt.rcParams["font.size"] == font_size
+
+
+def test_figure_hash(monkeypatch):
+    spec = FIGURES["empirical_simpliciality"]
+    data = {"value": np.array([0.1, 0.2])}
+    h = figure_hash(spec, data)
+    assert figure_hash(spec, data) == h
+    assert figure_hash(spec, {"value": np.array([0.1, 0.3])}) != h
+
+    # the constants shared by the plots are part of the hash
+    monkeypatch.setattr(render_figures, "COLOR_PALETTE", ["#000000"] * 3)
+    assert figure_hash(spec, data) != h
@@ -0,0 +1,122 @@
+import json
+import os
+
+import numpy as np
+
+from sod import *
+
+
+def test_results_store(tmp_path):
+    results = ResultsStore(tmp_path / "results")
+    assert len(results) == 0
+    assert len(results.query()["value"]) == 0
+
+    results.append("a", "CM", "sf", [0.1, 0.2, None])
+    results.append("b", "CL", ["sf", "es"], [0.3, 0.4], realization=5, param=2)
+    assert len(results) == 5
+
+    r = results.query(dataset="a")
+    assert r["model"].tolist() == ["CM"] * 3
+    assert r["realization"].tolist() == [0, 1, 2]
+    assert np.isnan(r["value"][2])
+    assert np.isnan(r["param"]).all()
+
+    r = results.query(metric=["es"], columns=["dataset", "value"])
+    assert list(r) == ["dataset", "value"]
+    assert r["dataset"].tolist() == ["b"]
+    assert r["value"].tolist() == [0.4]
+
+    assert results.query(param=2)["value"].tolist() == [0.3, 0.4]
+    # NaN selects the rows without a parameter
+    assert results.query(param=np.nan)["dataset"].tolist() == ["a"] * 3
+    assert len(results.query(param=[np.nan, 2])["value"]) == 5
+    assert len(results.query(model="missing")["value"]) == 0
+
+    # reopen with a partial row left by a crash
+    with open(tmp_path / "results" / "value.bin", "ab") as file:
+        file.write(b"\x00" * 3)
+    results = ResultsStore(tmp_path / "results")
+    assert len(results) == 5
+    assert results.categories["metric"] == ["sf", "es"]
+    results.append("c", "CM", "fes", 0.5, realization=0)
+    assert results.query(dataset="c")["value"].tolist() == [0.5]
+
+
+def test_import_results(tmp_path):
+    data = tmp_path / "Data"
+    data.mkdir()
+    with open(data / "empirical_simpliciality.json", "w") as file:
+        json.dump({"a": {"sf": 0.5, "es": 0.25}}, file)
+    with open(data / "cm_convergence.json", "w") as file:
+        json.dump({"a": {"num-swaps": [10, 100], "sf": [0.5, 0.1]}}, file)
+    with open(data / "model_simpliciality_a.json", "w") as file:
+        json.dump({"CM": {"sf": [0.1, None]}, "CL": {"sf": [0.2]}}, file)
+    with open(data / "model_simpliciality_summary_a.json", "w") as file:
+        json.dump({"CM": {"sf": {"mean": 0.1}}}, file)
+
+    results = ResultsStore(tmp_path / "results")
+    import_results(results, data)
+    assert len(results) == 7
+
+    r = results.query(model="empirical")
+    assert dict(zip(r["metric"].tolist(), r["value"].tolist())) == {
+        "sf": 0.5,
+        "es": 0.25,
+    }
+    # the convergence sweep is apart from the realizations of the CM
+    r = results.query(model=CONVERGENCE_MODEL)
+    assert r["param"].tolist() == [10, 100]
+    assert r["value"].tolist() == [0.5, 0.1]
+    r = results.query(dataset="a", model="CM", metric="sf")
+    assert r["realization"].tolist() == [0, 1]
+    assert r["value"][0] == 0.1 and np.isnan(r["value"][1])
+    assert results.query(model="CL")["value"].tolist() == [0.2]
+
+
+def test_sync_results(tmp_path):
+    data = tmp_path / "Data"
+    data.mkdir()
+    with open(data / "empirical_simpliciality.json", "w") as file:
+        json.dump({"a": {"sf": 0.5}}, file)
+
+    results = ResultsStore(tmp_path / "results")
+    assert sync_results(results, data)
+    assert not sync_results(results, data)
+    assert results.query()["value"].tolist() == [0.5]
+
+    # a changed or new file rebuilds the store instead of duplicating rows
+    with open(data / "empirical_simpliciality.json", "w") as file:
+        json.dump({"a": {"sf": 0.75}}, file)
+    with open(data / "model_simpliciality_a.json", "w") as file:
+        json.dump({"CL": {"sf": [0.2]}}, file)
+    assert sync_results(results, data)
+    assert len(results) == 2
+    assert results.query(model="empirical")["value"].tolist() == [0.75]
+
+    results = ResultsStore(tmp_path / "results")
+    assert len(results) == 2
+    assert not sync_results(results, data)
+
+    (data / "model_simpliciality_a.json").unlink()
+    assert sync_results(results, data)
+    assert len(results) == 1
+    assert results.categories["model"] == ["empirical"]
+
+
+def test_sync_results_concurrent(tmp_path):
+    data = tmp_path / "Data"
+    data.mkdir()
+    for d in range(8):
+        with open(data / f"model_simpliciality_{d}.json", "w") as file:
+            json.dump({"CM": {"sf": list(range(100))}}, file)
+
+    # one sync per dataset, as when the model fitting runs in parallel
+    path = tmp_path / "results"
+    tasks = [Task(i, sync_results, ResultsStore(path), data) for i in range(8)]
+    rebuilt = [result for _, result in run_tasks(tasks, num_processes=4)]
+    assert sum(rebuilt) == 1
+
+    results = ResultsStore(path)
+    assert len(results) == 800
+    assert not sync_results(results, data)
+    assert sorted(os.listdir(tmp_path)) == ["Data", "results", "results.lock"]
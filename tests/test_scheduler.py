@@ -0,0 +1,105 @@
+import os
+import signal
+import time
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import Manager
+
+import numpy as np
+import pytest
+
+from sod import *
+
+
+def test_run_tasks():
+    tasks = [Task(i, pow, i, 2) for i in range(10)]
+    results = dict(run_tasks(tasks, num_processes=2))
+    assert {t.key: r for t, r in results.items()} == {i: i**2 for i in range(10)}
+
+    tasks = [Task("sum", sum, [1, 2], start=3)]
+    assert [r for _, r in run_tasks(tasks, num_processes=1)] == [6]
+
+
+def _record(log, key):
+    log.append(key)
+
+
+def test_run_tasks_cost():
+    # the order in which the results arrive isn't guaranteed, so the single
+    # worker records the order in which it starts the tasks
+    with Manager() as manager:
+        log = manager.list()
+        tasks = [Task(i, _record, log, i, cost=c) for i, c in enumerate([1, 5, 3, 5])]
+        keys = {t.key for t, _ in run_tasks(tasks, num_processes=1)}
+        assert keys == {0, 1, 2, 3}
+        assert list(log) == [1, 3, 2, 0]
+
+
+def test_run_tasks_errors():
+    tasks = [Task("ok", int, "1"), Task("fail", int, "a")]
+    with pytest.raises(ValueError):
+        list(run_tasks(tasks, num_processes=1))
+
+    results = {t.key: r for t, r in run_tasks(tasks, 1, raise_errors=False)}
+    assert results["ok"] == 1
+    assert isinstance(results["fail"], ValueError)
+
+
+@pytest.mark.skipif(scheduler.resource is None, reason="requires resource")
+def test_run_tasks_memory_limit():
+    tasks = [Task("big", np.ones, 2**31), Task("small", np.ones, 10)]
+    results = {
+        t.key: r for t, r in run_tasks(tasks, 1, memory_limit="4G", raise_errors=False)
+    }
+    assert isinstance(results["big"], MemoryError)
+    assert results["small"].sum() == 10
+
+
+def test_parse_memory():
+    assert parse_memory(100) == 100
+    assert parse_memory("100") == 100
+    assert parse_memory("4G") == 4 * 2**30
+    assert parse_memory("1.5gb") == 3 * 2**29
+    assert parse_memory("512M") == 2**29
+    with pytest.raises(ValueError):
+        parse_memory("lots")
+
+
+def test_costs(h1):
+    arrays = incidence_arrays(h1)
+    assert edge_costs(arrays).tolist() == [8, 16, 8, 4]
+    assert edge_costs(arrays, min_size=3).tolist() == [8, 16, 8, 0]
+
+    costs = node_costs(arrays)
+    assert len(costs) == h1.num_nodes
+    assert costs.sum() == (edge_costs(arrays) * np.array([3, 4, 3, 2]) ** 2).sum()
+
+
+def test_balanced_partition():
+    parts = balanced_partition([5, 1, 4, 2, 3, 3], 2)
+    assert [p.tolist() for p in parts] == [[0, 1, 5], [2, 3, 4]]
+
+    parts = balanced_partition([1, 2], 4)
+    assert [p.tolist() for p in parts] == [[1], [0]]
+    assert balanced_partition([], 3) == []
+
+
+def _kill():
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def _slow_square(i):
+    time.sleep(0.1)
+    return i**2
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="requires SIGKILL")
+def test_run_tasks_killed_worker():
+    # the worker running "kill" dies first, which breaks the pool while the
+    # other tasks are running or queued
+    tasks = [Task(i, _slow_square, i) for i in range(6)] + [Task("kill", _kill, cost=2)]
+    results = {t.key: r for t, r in run_tasks(tasks, 2, raise_errors=False)}
+    assert isinstance(results.pop("kill"), BrokenProcessPool)
+    assert results == {i: i**2 for i in range(6)}
+
+    with pytest.raises(BrokenProcessPool):
+        list(run_tasks(tasks, num_processes=2))
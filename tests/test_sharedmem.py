@@ -0,0 +1,48 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from sod import *
+
+
+def _count_simplices(handle):
+    arrays = attach_arrays(handle)
+    H = hypergraph_from_arrays(arrays)
+    index = FaceIndex(arrays["faces"])
+    return count_simplices(H), len(index), arrays["faces"].flags.writeable
+
+
+def test_shared_arrays(h1):
+    arrays = incidence_arrays(h1)
+    arrays["faces"] = face_index(arrays).keys
+
+    with shared_arrays(arrays) as handle:
+        attached = attach_arrays(handle)
+        for key, a in arrays.items():
+            assert np.all(attached[key] == a)
+            assert attached[key].dtype == a.dtype
+        with pytest.raises(ValueError):
+            attached["edge_members"][0] = 10
+        del attached
+
+        with ProcessPoolExecutor(2) as pool:
+            results = list(pool.map(_count_simplices, [handle] * 4))
+    assert results == [(count_simplices(h1), 4, False)] * 4
+
+
+def test_shared_arrays_file(h1, tmp_path):
+    arrays = incidence_arrays(h1)
+    arrays["faces"] = face_index(arrays).keys
+    path = tmp_path / "h1.bin"
+    with shared_arrays(arrays, path=path) as handle:
+        with ProcessPoolExecutor(2) as pool:
+            results = list(pool.map(_count_simplices, [handle] * 2))
+        assert path.exists()
+    assert results == [(count_simplices(h1), 4, False)] * 2
+    assert not path.exists()
+
+
+def test_publish_objects():
+    with pytest.raises(TypeError):
+        publish_arrays({"ids": np.array([1, "a", None], dtype=object)})
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from joblib import delayed
+
+from sod import *
+
+
+def test_running_stats():
+    rng = np.random.default_rng(0)
+    x = rng.beta(2, 5, size=1000)
+
+    s = RunningStats()
+    s.update(x)
+    s.add(np.nan)
+    s.add(None)
+    assert s.count == 1000
+    assert s.nan_count == 2
+    assert np.isclose(s.mean, x.mean())
+    assert np.isclose(s.var, x.var(ddof=1))
+    assert np.isclose(s.sem, x.std(ddof=1) / np.sqrt(1000))
+    assert (s.min, s.max) == (x.min(), x.max())
+    assert s.histogram.sum() == 1000
+
+    # the quantiles are accurate up to the width of a bin
+    for q in [0.025, 0.5, 0.975]:
+        assert abs(s.quantile(q) - np.quantile(x, q)) < 0.01
+    assert s.quantile(0) == x.min()
+    assert s.quantile(1) == x.max()
+
+    lo, hi = s.confidence_interval()
+    assert lo < x.mean() < hi
+    assert np.isclose(hi - lo, 2 * 1.9623 * s.sem, rtol=1e-3)
+
+    summary = s.summary()
+    assert summary["count"] == 1000
+    assert len(summary["histogram"]) == 100
+
+
+def test_running_stats_edge_cases():
+    s = RunningStats(bins=10)
+    assert np.isnan(s.var)
+    assert np.isnan(s.quantile(0.5))
+    assert np.isnan(s.confidence_interval()[0])
+
+    s.update([1.0, 0.0, -0.5, 1.5])
+    assert s.histogram[0] == 2 and s.histogram[-1] == 2
+
+
+def test_running_stats_merge():
+    rng = np.random.default_rng(1)
+    x = rng.random(100)
+    y = rng.random(50)
+
+    s1 = RunningStats()
+    s1.update(x)
+    s2 = RunningStats()
+    s2.update(y)
+    s2.add(np.nan)
+    s1.merge(s2)
+
+    z = np.concatenate([x, y])
+    assert s1.count == 150
+    assert s1.nan_count == 1
+    assert np.isclose(s1.mean, z.mean())
+    assert np.isclose(s1.var, z.var(ddof=1))
+    assert s1.histogram.sum() == 150
+
+
+def realization(i):
+    rng = np.random.default_rng(i)
+    return i, (rng.normal(0.5, 0.01), rng.normal(0.5, 0.1))
+
+
+def test_ensemble_runner():
+    runner = EnsembleRunner(metrics=["a", "b"])
+    keys = []
+    n = runner.run(
+        (delayed(realization)(i) for i in range(20)),
+        callback=lambda key, values: keys.append(key),
+    )
+    assert n == runner.realizations == 20
+    assert sorted(keys) == list(range(20))
+    assert not runner.converged()
+    assert set(runner.summary()) == {"a", "b"}
+
+    # the tighter metric converges first, but all of them must converge
+    runner = EnsembleRunner(metrics=["a", "b"], target_width=0.05)
+    keys = []
+    n = runner.run(
+        (delayed(realization)(i) for i in range(1000)),
+        num_processes=2,
+        callback=lambda key, values: keys.append(key),
+    )
+    assert 10 <= n < 1000
+    assert runner.converged()
+    assert all(w <= 0.05 for w in runner.widths().values())
+    # the first realizations are kept, so an early stop is reproducible
+    assert keys == list(range(n))
+    again = EnsembleRunner(metrics=["a", "b"], target_width=0.05)
+    assert again.run((delayed(realization)(i) for i in range(1000))) == n
+    assert again.summary() == runner.summary()
+
+    # there is nothing left to run
+    assert runner.run(delayed(realization)(i) for i in range(1000)) == 0
+
+
+def test_ensemble_runner_nan():
+    runner = EnsembleRunner(metrics=["a"], target_width=1, min_realizations=2)
+    for _ in range(5):
+        runner.add([np.nan])
+    assert runner.realizations == 5
+    assert not runner.converged()
@@ -0,0 +1,85 @@
+import json
+
+import numpy as np
+import pytest
+import xgi
+
+from sod import CompactHypergraph, import_xgi_json, load_dataset, save_dataset
+
+
+@pytest.fixture
+def xgi_json(tmp_path):
+    data = {
+        "hypergraph-data": {"name": "toy"},
+        "node-data": {"1": {}, "2": {}, "3": {}, "4": {}, "5": {}, "6": {}},
+        "edge-dict": {
+            "0": ["1", "2", "3"],
+            "1": ["2", "3"],
+            "2": ["3", "4", "5", "6"],
+            "3": ["5", "6"],
+            "4": ["1", "7"],
+        },
+        "edge-data": {str(i): {"timestamp": 10 * i} for i in range(5)},
+    }
+    fname = tmp_path / "toy.json"
+    fname.write_text(json.dumps(data))
+    return fname
+
+
+def test_import_xgi_json(xgi_json, tmp_path):
+    path = tmp_path / "store" / "toy"
+    import_xgi_json(xgi_json, path)
+
+    H = load_dataset(str(path))
+    assert H.num_nodes == 7
+    assert H.edges.members(dtype=dict) == {
+        "0": {"1", "2", "3"},
+        "1": {"2", "3"},
+        "2": {"3", "4", "5", "6"},
+        "3": {"5", "6"},
+        "4": {"1", "7"},
+    }
+    assert H.edges.attrs("timestamp").asdict() == {str(i): 10 * i for i in range(5)}
+
+    # agrees with xgi's reader
+    with pytest.warns(UserWarning):
+        H_xgi = xgi.load_xgi_data("toy", read=True, path=str(xgi_json.parent))
+    assert H.edges.members(dtype=dict) == H_xgi.edges.members(dtype=dict)
+
+    import_xgi_json(xgi_json, path, nodetype=int, edgetype=int)
+    H = load_dataset(str(path))
+    assert H.edges.members(0) == {1, 2, 3}
+
+
+def test_load_dataset_max_order(xgi_json, tmp_path):
+    import_xgi_json(xgi_json, tmp_path / "toy", nodetype=int, edgetype=int)
+
+    H = load_dataset("toy", max_order=1, store=str(tmp_path))
+    assert H.edges.members(dtype=dict) == {1: {2, 3}, 3: {5, 6}, 4: {1, 7}}
+    assert H.num_nodes == 7
+
+    H = load_dataset("toy", max_order=2, store=str(tmp_path), compact=True)
+    assert isinstance(H, CompactHypergraph)
+    assert H.edge_ids.tolist() == [0, 1, 3, 4]
+    assert H.members() == [[1, 2, 3], [2, 3], [5, 6], [1, 7]]
+    assert H.timestamps.tolist() == [0, 10, 30, 40]
+
+    H = load_dataset("toy", max_order=10, store=str(tmp_path), compact=True)
+    assert H.num_edges == 5
+    assert isinstance(H.edge_members, np.memmap)
+
+
+def test_save_dataset(h1, tmp_path):
+    save_dataset(h1, tmp_path / "h1")
+    H = load_dataset("h1", store=str(tmp_path), download=False)
+    assert H.edges.members(dtype=dict) == h1.edges.members(dtype=dict)
+
+    with pytest.raises(FileNotFoundError):
+        load_dataset("missing", store=str(tmp_path), download=False)
+
+    # IDs of mixed types are kept
+    H = xgi.Hypergraph([[1, "a", 2.5], ["a", 3]])
+    save_dataset(H, tmp_path / "mixed")
+    H2 = load_dataset("mixed", store=str(tmp_path), download=False)
+    assert list(H2.nodes) == [1, "a", 2.5, 3]
+    assert H2.edges.members(dtype=dict) == H.edges.members(dtype=dict)
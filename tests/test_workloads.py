@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from sod import *
+
+
+def test_workload():
+    degrees = np.ones(20)
+    sizes = [2, 3, 4, 3]
+    H = workload(degrees, sizes, seed=0)
+    assert H.num_nodes == 20
+    assert H.num_edges <= 4
+    for e in H.members():
+        assert len(set(e)) == len(e)
+
+    H2 = workload(degrees, sizes, seed=0)
+    assert np.array_equal(H.edge_members, H2.edge_members)
+
+    with pytest.raises(ValueError):
+        workload([1, 1, 0], [3])
+
+
+def test_workload_nesting():
+    H = workload(np.ones(8), [3, 4], nesting=1, seed=1).to_hypergraph()
+    # all the subfaces are planted, so it's a simplicial complex
+    assert edit_simpliciality(H) == 1
+    assert face_edit_simpliciality(H) == 1
+    assert simplicial_fraction(H) == 1
+
+    H = workload(np.ones(8), [3, 4], nesting=0, seed=1).to_hypergraph()
+    assert H.num_edges == 2
+
+
+def test_workload_like(tmp_path):
+    H = workload_like("email-enron", scale=2, nesting=0.1, seed=0)
+    assert H.num_nodes == 286
+    assert H.num_edges > 2 * 1442 * 0.9
+    assert H.sizes.max() <= 11
+
+    path = write_workload("enron", "email-enron", scale=0.5, seed=0, store=tmp_path)
+    H = load_dataset(path, compact=True)
+    assert H.num_edges > 0